@@ -1,42 +1,137 @@
+#!/usr/bin/env python3
+"""
+Keyword autograder for the practice questions in questions.json
+Grades one answers file ({question_id: answer}) into graded_assignment.docx.
+With --cohort, grades a whole class at once ({student: {question_id: answer}}):
+each question is scored for every student with NumPy (see
+CompiledQuestion.grade_cohort), keyword hit rates are printed and the scores
+and matched keywords are written to a CSV.
+
+    python autograde_keywords.py [answers.json]
+    python autograde_keywords.py --cohort class_answers.json [--output keyword_scores.csv]
+"""
+
+import argparse
+import csv
 import json
-from docx import Document
-
-# Load questions and keywords
-with open('questions.json', 'r') as f:
-    questions = json.load(f)
-
-# Load student answers (example: answers.json)
-with open('answers.json', 'r') as f:
-    answers = json.load(f)
-
-results = []
-doc = Document()
-doc.add_heading('Assignment Results', 0)
-
-for q in questions:
-    qid = str(q['id'])
-    question = q['question']
-    keywords = q['keywords']
-    answer = answers.get(qid, "")
-    matched = [kw for kw in keywords if kw.lower() in answer.lower()]
-    score = len(matched) / len(keywords) if keywords else 0
-    results.append({
-        'question': question,
-        'answer': answer,
-        'matched_keywords': matched,
-        'score': score
-    })
-    doc.add_heading(f"Q{qid}: {question}", level=1)
-    doc.add_paragraph(f"Answer: {answer}")
-    doc.add_paragraph(f"Matched keywords: {', '.join(matched)}")
-    doc.add_paragraph(f"Score: {score:.2f}")
-
-doc.save('graded_assignment.docx')
-
-# Print results for manual review
-for r in results:
-    print(f"Question: {r['question']}")
-    print(f"Answer: {r['answer']}")
-    print(f"Matched keywords: {r['matched_keywords']}")
-    print(f"Score: {r['score']:.2f}")
-    print()
+import os
+import time
+
+from rubric import load_rubric
+from docx_render import render_document
+
+DEFAULT_COHORT_OUTPUT = "keyword_scores.csv"
+
+def grade_answers(questions, answers):
+    """Grade one student's answers; returns a result per question"""
+    results = []
+    for qid, q in questions.questions.items():
+        answer = answers.get(qid, "")
+        graded = q.grade(answer)
+        results.append({
+            'question_id': qid,
+            'question': q.title,
+            'answer': answer,
+            'matched_keywords': graded['found'],
+            'score': graded['points'] / q.max_points if q.max_points else 0
+        })
+    return results
+
+def grade_single(questions, answers_file):
+    """Grade one answers file into graded_assignment.docx and print it for manual review"""
+    with open(answers_file, 'r') as f:
+        answers = json.load(f)
+
+    results = grade_answers(questions, answers)
+
+    # Results document from templates/keyword_results.json
+    render_document('keyword_results', {
+        'results': [
+            {
+                'question_id': r['question_id'],
+                'question': r['question'],
+                'answer': r['answer'],
+                'matched_keywords': ', '.join(r['matched_keywords']),
+                'score': f"{r['score']:.2f}"
+            }
+            for r in results
+        ]
+    }, 'graded_assignment.docx')
+
+    for r in results:
+        print(f"Question: {r['question']}")
+        print(f"Answer: {r['answer']}")
+        print(f"Matched keywords: {r['matched_keywords']}")
+        print(f"Score: {r['score']:.2f}")
+        print()
+
+def grade_cohort(questions, cohort):
+    """Score every question for a whole class; returns (students, {question_id: summary}) in student order"""
+    import numpy as np  # Only cohort mode needs numpy
+
+    students = list(cohort)
+    summaries = {}
+    for qid, q in questions.questions.items():
+        started = time.perf_counter()
+        graded = q.grade_cohort([cohort[student].get(qid, "") for student in students])
+
+        # Matched group names per student, split out of one nonzero() over the found matrix
+        rows, columns = np.nonzero(graded['found'])
+        names = np.array([group['name'] for group in q.groups], dtype=object)
+        matched = np.split(names[columns], np.searchsorted(rows, np.arange(1, len(students))))
+
+        summaries[qid] = {
+            'question': q.title,
+            'scores': graded['points'] / q.max_points if q.max_points else np.zeros(len(students)),
+            'matched': [', '.join(groups) for groups in matched],
+            'keyword_rates': dict(zip(graded['keywords'], graded['keyword_hits'].mean(axis=0))) if students else {},
+            'seconds': time.perf_counter() - started
+        }
+    return students, summaries
+
+def write_cohort_csv(students, summaries, path):
+    """One row per student: score and matched keywords for each question"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Student'] + [f"{column} {qid}" for qid in summaries for column in ('Score', 'Matched')])
+        for row, student in enumerate(students):
+            cells = [student]
+            for summary in summaries.values():
+                cells += [f"{summary['scores'][row]:.2f}", summary['matched'][row]]
+            writer.writerow(cells)
+    os.replace(temp_path, path)
+
+def main():
+    parser = argparse.ArgumentParser(description='Keyword autograder for questions.json')
+    parser.add_argument('answers', nargs='?', default='answers.json',
+                        help='Answers file: {question_id: answer}, or {student: {question_id: answer}} with --cohort')
+    parser.add_argument('--cohort', action='store_true',
+                        help='Grade a whole class at once with NumPy and write a CSV instead of a Word document')
+    parser.add_argument('--output', default=DEFAULT_COHORT_OUTPUT,
+                        help=f'CSV written in cohort mode (default: {DEFAULT_COHORT_OUTPUT})')
+    args = parser.parse_args()
+
+    # Load questions and keywords (compiled rubric, see rubric.py for the format)
+    questions = load_rubric('questions.json')
+
+    if not args.cohort:
+        grade_single(questions, args.answers)
+        return
+
+    with open(args.answers, 'r') as f:
+        cohort = json.load(f)
+    students, summaries = grade_cohort(questions, cohort)
+
+    print(f"📊 {len(students)} student(s) graded from {args.answers}")
+    for qid, summary in summaries.items():
+        average = summary['scores'].mean() if students else 0
+        print(f"Question {qid}: {summary['question']} - average {average:.2f} "
+              f"({summary['seconds'] * 1000:.1f} ms)")
+        for keyword, rate in summary['keyword_rates'].items():
+            print(f"   {keyword}: {rate:.0%}")
+    write_cohort_csv(students, summaries, args.output)
+    print(f"💾 Scores written to: {args.output}")
+
+if __name__ == "__main__":
+    main()
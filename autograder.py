@@ -5,228 +5,154 @@ Runs in GitHub Classroom to automatically grade student submissions
 """
 
 import json
-import re
 import sys
 import os
 import glob
-from typing import Dict, List, Tuple
+import hashlib
+import functools
+import tempfile
+from typing import Dict, List, Optional, Tuple
+from rubric import COMPILER_VERSION, load_rubric
+from grade_cache import grade_answers
+from normalized_answer import normalize
+
+def default_results_file() -> str:
+    """Where the shared results artifact lives for this checkout.
+    
+    On Actions, the job's own RUNNER_TEMP. Elsewhere the system temp directory is
+    shared, so the file name carries a hash of the checkout's path.
+    """
+    runner_temp = os.getenv('RUNNER_TEMP')
+    if runner_temp:
+        return os.path.join(runner_temp, "csci1436_autograding_results.json")
+    checkout = hashlib.sha256(os.path.abspath(os.getcwd()).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"csci1436_autograding_results_{checkout}.json")
+
+# Shared artifact written by "grade all" and read by the per-question tests. It
+# lives in a temp directory, never in the student's checkout, where a committed
+# copy could claim any score for a matching submission hash.
+RESULTS_FILE = default_results_file()
+
+# Compiled rubric (keyword groups, patterns and point weights) from rubrics/autograder.json
+RUBRIC = load_rubric('autograder')
+
+def find_submission_file() -> str:
+    """Locate the student submission JSON file"""
+    json_files = glob.glob("submission_*.json")
+    if not json_files:
+        print("❌ No submission file found")
+        sys.exit(1)
+    return json_files[0]
 
 class AutoGrader:
-    def __init__(self):
+    def __init__(self, submission_file: Optional[str] = None, raw: Optional[bytes] = None):
         self.submission_data = None
-        self.load_submission_data()
+        self.answers = {}
+        self.submission_file = submission_file
+        self.submission_hash = None
+        self.load_submission_data(raw)
     
-    def load_submission_data(self):
+    def load_submission_data(self, raw: Optional[bytes] = None):
         """Load student submission JSON data"""
         # Find submission JSON file
-        json_files = glob.glob("submission_*.json")
-        if not json_files:
-            print("❌ No submission file found")
-            sys.exit(1)
+        if self.submission_file is None:
+            self.submission_file = find_submission_file()
+        
+        if raw is None:
+            with open(self.submission_file, 'rb') as f:
+                raw = f.read()
         
-        with open(json_files[0], 'r') as f:
-            self.submission_data = json.load(f)
+        self.submission_hash = hashlib.sha256(raw).hexdigest()
+        self.submission_data = json.loads(raw)
         
         # Convert to expected format for compatibility
         if 'responses' in self.submission_data:
+            point_map = RUBRIC.max_points()
             for question_id, response_data in self.submission_data['responses'].items():
-                if 'points' not in response_data:
+                if isinstance(response_data, dict) and 'points' not in response_data:
                     # Add point values based on question ID
-                    point_map = {
-                        'q1_definitions': 40,
-                        'q2_high_level': 12, 
-                        'q3_declarations': 12,
-                        'q4_modulo': 12,
-                        'q5_sphere_volume': 12,
-                        'q6_debugging': 12
-                    }
                     response_data['points'] = point_map.get(question_id, 0)
+        
+        # Normalized once here; every grade_q* call reads these views (malformed entries grade as blank)
+        self.answers = {
+            question_id: normalize(response_data.get('response') if isinstance(response_data, dict) else None)
+            for question_id, response_data in self.submission_data.get('responses', {}).items()
+        }
+    
+    def grade_rubric_question(self, question_id: str) -> Tuple[int, str]:
+        """Grade one question against the compiled rubric"""
+        # No grade cache here: this runs in the student's checkout, which could supply one
+        result = grade_answers(RUBRIC, {question_id: self.answers[question_id]})[question_id]
+        return result['points'], result['feedback']
     
     def grade_q1_definitions(self) -> Tuple[int, str]:
         """Grade Question 1 - Definitions (40 points)"""
-        response = self.submission_data['responses']['q1_definitions']['response'].lower()
-        
-        # Define key terms and their expected concepts
-        terms = {
-            'repl': ['read', 'eval', 'print', 'loop', 'interactive'],
-            'java api': ['application', 'programming', 'interface', 'library', 'classes'],
-            'jdk': ['development', 'kit', 'tools', 'compiler', 'runtime'],
-            'variable': ['storage', 'container', 'value', 'memory', 'data'],
-            'data type': ['type', 'kind', 'category', 'int', 'string', 'boolean'],
-            'variable declaration': ['create', 'define', 'specify', 'type', 'name'],
-            'assignment statement': ['assign', 'value', 'variable', '=', 'store'],
-            'expression': ['combination', 'evaluate', 'value', 'operation', 'calculate'],
-            'constant': ['unchanging', 'fixed', 'final', 'immutable', 'same'],
-            'literal': ['value', 'directly', 'written', 'code', 'constant']
-        }
-        
-        points = 0
-        feedback = []
-        
-        for term, keywords in terms.items():
-            term_found = False
-            keyword_count = 0
-            
-            # Check if term is mentioned
-            if term.replace(' ', '') in response.replace(' ', ''):
-                term_found = True
-                
-                # Check for relevant keywords
-                for keyword in keywords:
-                    if keyword in response:
-                        keyword_count += 1
-                
-                # Award points based on keyword coverage
-                if keyword_count >= 2:
-                    points += 4  # Full points for well-defined term
-                    feedback.append(f"✅ {term.upper()}: Well defined")
-                elif keyword_count >= 1:
-                    points += 2  # Partial points
-                    feedback.append(f"⚠️ {term.upper()}: Partially defined")
-                else:
-                    points += 1  # Minimal points for mentioning term
-                    feedback.append(f"❌ {term.upper()}: Needs better definition")
-            else:
-                feedback.append(f"❌ {term.upper()}: Not found or poorly defined")
-        
-        feedback_text = "\n".join(feedback)
-        return min(points, 40), feedback_text
+        return self.grade_rubric_question('q1_definitions')
     
     def grade_q2_high_level(self) -> Tuple[int, str]:
         """Grade Question 2 - High Level Languages (12 points)"""
-        response = self.submission_data['responses']['q2_high_level']['response'].lower()
-        
-        key_concepts = {
-            'abstraction': ['abstract', 'hide', 'complexity', 'simple'],
-            'portability': ['portable', 'platform', 'independent', 'cross'],
-            'readability': ['readable', 'understand', 'clear', 'human'],
-            'productivity': ['faster', 'efficient', 'quick', 'productive'],
-            'maintenance': ['maintain', 'modify', 'update', 'change'],
-            'syntax': ['syntax', 'english', 'natural', 'easier']
-        }
-        
-        points = 0
-        found_concepts = []
-        
-        for concept, keywords in key_concepts.items():
-            for keyword in keywords:
-                if keyword in response:
-                    if concept not in found_concepts:
-                        found_concepts.append(concept)
-                        points += 2
-                    break
-        
-        # Bonus points for well-structured answer
-        if len(response.split()) >= 20:  # Substantial answer
-            points += 2
-        
-        feedback = f"Found concepts: {', '.join(found_concepts)}"
-        return min(points, 12), feedback
+        return self.grade_rubric_question('q2_high_level')
     
     def grade_q3_declarations(self) -> Tuple[int, str]:
         """Grade Question 3 - Variable Declarations (12 points)"""
-        response = self.submission_data['responses']['q3_declarations']['response']
-        
-        patterns = [
-            (r'double\s+length\s*=\s*23\.6', "double length = 23.6"),
-            (r'float\s+width\s*=\s*14\.7[fF]?', "float width = 14.7f"),
-            (r'long\s+distance\s*=\s*3172900000[lL]?', "long distance = 3172900000L"),
-            (r'final\s+int\s+speedOfSound\s*=\s*343', "final int speedOfSound = 343")
-        ]
-        
-        points = 0
-        feedback = []
-        
-        for pattern, description in patterns:
-            if re.search(pattern, response, re.IGNORECASE):
-                points += 3
-                feedback.append(f"✅ {description}")
-            else:
-                feedback.append(f"❌ Missing or incorrect: {description}")
-        
-        feedback_text = "\n".join(feedback)
-        return points, feedback_text
+        return self.grade_rubric_question('q3_declarations')
     
     def grade_q4_modulo(self) -> Tuple[int, str]:
         """Grade Question 4 - Modulo Operations (12 points)"""
-        response = self.submission_data['responses']['q4_modulo']['response']
-        
-        expected_answers = ["6", "0", "23", "6"]
-        expressions = ["40 % 17", "120 % 60", "(65 + 8) % 25", "(97 * 3 + 6) % 25"]
-        
-        points = 0
-        feedback = []
-        
-        for i, (expr, expected) in enumerate(zip(expressions, expected_answers)):
-            if expected in response:
-                points += 3
-                feedback.append(f"✅ {expr} = {expected}")
-            else:
-                feedback.append(f"❌ {expr} ≠ {expected}")
-        
-        feedback_text = "\n".join(feedback)
-        return points, feedback_text
+        return self.grade_rubric_question('q4_modulo')
     
     def grade_q5_sphere_volume(self) -> Tuple[int, str]:
         """Grade Question 5 - Sphere Volume Program (12 points)"""
-        response = self.submission_data['responses']['q5_sphere_volume']['response'].lower()
-        
-        required_elements = {
-            'input': ['input', 'scanner', 'readline', 'nextdouble'],
-            'radius': ['radius', 'r'],
-            'volume': ['volume', 'vol'],
-            'formula': ['4/3', '4.0/3', 'math.pi', 'pi'],
-            'power': ['math.pow', 'pow', 'r*r*r', '^3', '**3'],
-            'output': ['print', 'system.out', 'println']
-        }
-        
-        points = 0
-        found_elements = []
-        
-        for element, keywords in required_elements.items():
-            for keyword in keywords:
-                if keyword in response:
-                    if element not in found_elements:
-                        found_elements.append(element)
-                        points += 2
-                    break
-        
-        feedback = f"Program elements found: {', '.join(found_elements)}"
-        return min(points, 12), feedback
+        return self.grade_rubric_question('q5_sphere_volume')
     
     def grade_q6_debugging(self) -> Tuple[int, str]:
         """Grade Question 6 - Debugging (12 points)"""
-        response = self.submission_data['responses']['q6_debugging']['response'].lower()
-        
-        issues = {
-            'division by zero': ['division', 'zero', 'divide', '/'],
-            'integer overflow': ['overflow', 'exceed', 'limit', 'max'],
-            'type mismatch': ['type', 'mismatch', 'long', 'int', 'conversion']
+        return self.grade_rubric_question('q6_debugging')
+    
+    def grading_methods(self) -> Dict:
+        """Map question IDs to their grading methods (one per rubric question)"""
+        return {
+            question_id: functools.partial(self.grade_rubric_question, question_id)
+            for question_id in RUBRIC.questions
         }
-        
-        points = 0
-        found_issues = []
-        
-        for issue, keywords in issues.items():
-            keyword_count = sum(1 for keyword in keywords if keyword in response)
-            if keyword_count >= 2:
-                if issue not in found_issues:
-                    found_issues.append(issue)
-                    points += 4
-        
-        feedback = f"Issues identified: {', '.join(found_issues)}"
-        return min(points, 12), feedback
+    
+    def grade_all(self) -> Dict:
+        """Grade every question once and return a machine-readable result set"""
+        responses = self.submission_data['responses']
+        answers = {question_id: self.answers[question_id] for question_id in RUBRIC.questions if question_id in responses}
+        
+        questions = {}
+        for question_id, result in grade_answers(RUBRIC, answers).items():
+            questions[question_id] = {
+                'points': result['points'],
+                'max_points': responses[question_id]['points'],
+                'feedback': result['feedback']
+            }
+        
+        return {
+            'submission_file': os.path.basename(self.submission_file),
+            'submission_sha256': self.submission_hash,
+            # Scores are only reusable while the rubric and matching rules are unchanged
+            'rubric_version': RUBRIC.version,
+            'compiler_version': COMPILER_VERSION,
+            'total_points': sum(q['points'] for q in questions.values()),
+            'max_points': sum(q['max_points'] for q in questions.values()),
+            'questions': questions
+        }
+    
+    def write_results(self, path: Optional[str] = None) -> Dict:
+        """Grade all questions and write the shared results artifact (RESULTS_FILE by default)"""
+        path = path or RESULTS_FILE
+        results = self.grade_all()
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        os.replace(temp_path, path)
+        return results
     
     def grade_question(self, question_id: str) -> None:
         """Grade a specific question and output results"""
-        grading_methods = {
-            'q1_definitions': self.grade_q1_definitions,
-            'q2_high_level': self.grade_q2_high_level,
-            'q3_declarations': self.grade_q3_declarations,
-            'q4_modulo': self.grade_q4_modulo,
-            'q5_sphere_volume': self.grade_q5_sphere_volume,
-            'q6_debugging': self.grade_q6_debugging
-        }
+        grading_methods = self.grading_methods()
         
         if question_id not in grading_methods:
             print(f"❌ Unknown question ID: {question_id}")
@@ -234,25 +160,77 @@ class AutoGrader:
         
         points, feedback = grading_methods[question_id]()
         max_points = self.submission_data['responses'][question_id]['points']
-        
-        # Output for GitHub Classroom
-        print(f"Score: {points}/{max_points}")
-        print(f"Feedback: {feedback}")
-        
-        # Exit with score for GitHub Classroom
-        if points == max_points:
-            sys.exit(0)  # Perfect score
-        else:
-            sys.exit(1)  # Partial credit (GitHub Classroom will still award points based on output)
+        report_score(points, max_points, feedback)
+
+def report_score(points: int, max_points: int, feedback: str) -> None:
+    """Print a question score for GitHub Classroom and exit"""
+    # Output for GitHub Classroom
+    print(f"Score: {points}/{max_points}")
+    print(f"Feedback: {feedback}")
+    
+    # Exit with score for GitHub Classroom
+    if points == max_points:
+        sys.exit(0)  # Perfect score
+    else:
+        sys.exit(1)  # Partial credit (GitHub Classroom will still award points based on output)
+
+def load_cached_results(submission_hash: str, path: Optional[str] = None) -> Optional[Dict]:
+    """Return the results artifact if it was graded from this exact submission with the current rubric"""
+    path = path or RESULTS_FILE
+    try:
+        with open(path, 'r') as f:
+            results = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if (results.get('submission_sha256') != submission_hash
+            or results.get('rubric_version') != RUBRIC.version
+            or results.get('compiler_version') != COMPILER_VERSION):
+        return None
+    return results
+
+def grade_all_command() -> None:
+    """Grade everything in one pass and write the results artifact"""
+    grader = AutoGrader()
+    results = grader.write_results()
+    
+    print(f"📊 Graded {len(results['questions'])} questions from {results['submission_file']}")
+    for question_id, result in results['questions'].items():
+        print(f"{question_id}: {result['points']}/{result['max_points']}")
+    print(f"Total: {results['total_points']}/{results['max_points']}")
+    print(f"💾 Results written to: {RESULTS_FILE}")
+
+def grade_question_command(question_id: str) -> None:
+    """Report one question, reusing the results artifact when it is current"""
+    submission_file = find_submission_file()
+    with open(submission_file, 'rb') as f:
+        raw = f.read()
+    
+    results = load_cached_results(hashlib.sha256(raw).hexdigest())
+    if results is None:
+        # First test on this runner (or a stale artifact): grade everything once
+        grader = AutoGrader(submission_file, raw)
+        if question_id not in grader.grading_methods():
+            print(f"❌ Unknown question ID: {question_id}")
+            sys.exit(1)
+        results = grader.write_results()
+    
+    if question_id not in results['questions']:
+        print(f"❌ Unknown question ID: {question_id}")
+        sys.exit(1)
+    
+    result = results['questions'][question_id]
+    report_score(result['points'], result['max_points'], result['feedback'])
 
 def main():
     if len(sys.argv) != 2:
-        print("Usage: python autograder.py <question_id>")
+        print("Usage: python autograder.py <question_id|all>")
         sys.exit(1)
     
-    question_id = sys.argv[1]
-    grader = AutoGrader()
-    grader.grade_question(question_id)
+    if sys.argv[1] == 'all':
+        grade_all_command()
+    else:
+        grade_question_command(sys.argv[1])
 
 if __name__ == "__main__":
     main()
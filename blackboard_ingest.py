@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Blackboard bulk-download ingestion for CSCI 1436 Assignment #1
+Reads the zip that Blackboard's "Assignment File Download" produces member by
+member, without unpacking it. Each Assignment1_<first>_<last>.docx, whether
+bare or behind Blackboard's <assignment>_<username>_attempt_<timestamp>_
+prefix, is matched to a student and sent to a worker pool. The workers verify
+the document and extract its text. Every worker opens the archive itself and
+spools one member at a time (to disk above MEMBER_SPOOL_BYTES), so memory use
+stays fixed however large the archive is.
+
+The result is an upload manifest (blackboard_uploads.json). It has one record per
+upload: the student, Blackboard username and attempt time, size, SHA-256,
+whether the document holds answers or is only a submission proof, and any
+problems found. With --extract, verified documents that hold answers are also
+written as assignment1_<first>_<last>.json (latest attempt per student) for the
+graders.
+
+Usage: python blackboard_ingest.py <archive.zip> [--workers N] [--manifest FILE] [--extract DIR]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from docx_extract import FILENAME, json_counterpart, read_document, submission_from_document
+from gradebook import normalize_name
+
+DEFAULT_MANIFEST_FILE = "blackboard_uploads.json"
+
+# Members larger than this are spooled to a temporary file instead of memory
+MEMBER_SPOOL_BYTES = 8 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+
+# <assignment>_<username>_attempt_<YYYY-MM-DD-HH-MM-SS>[_<original file name>]
+BLACKBOARD_NAME = re.compile(
+    r'^(?P<assignment>.+?)_(?P<username>[^_]+)_attempt_(?P<attempt>\d{4}(?:-\d{2}){5})(?:_(?P<original>.+))?$'
+)
+ATTEMPT_FORMAT = '%Y-%m-%d-%H-%M-%S'
+
+def match_member(member_name: str) -> Optional[Dict]:
+    """The student an archive member belongs to, or None if it is not a submission"""
+    filename = posixpath.basename(member_name)
+    blackboard = BLACKBOARD_NAME.match(filename)
+    if blackboard:
+        filename = blackboard.group('original') or ''
+
+    match = FILENAME.match(filename)
+    if not match:
+        return None
+    return {
+        'member': member_name,
+        'filename': filename,
+        'student_name': f"{match.group('first')} {match.group('last')}",
+        'username': blackboard.group('username') if blackboard else None,
+        'attempt': (datetime.strptime(blackboard.group('attempt'), ATTEMPT_FORMAT).isoformat()
+                    if blackboard else None)
+    }
+
+def document_problems(student_name: str, fields: Dict[str, str]) -> List[str]:
+    """Why a readable document might not be the named student's own upload"""
+    document_name = fields.get('Student')
+    if not document_name:
+        return ["no 'Student:' line in the document"]
+    if normalize_name(document_name) != normalize_name(student_name):
+        return [f"document names {document_name!r}, file names {student_name!r}"]
+    return []
+
+_archive = None
+
+def _open_archive(archive_path: str) -> None:
+    """Worker initializer: each process reads the archive through its own handle"""
+    global _archive
+    _archive = zipfile.ZipFile(archive_path)
+
+def inspect_upload(upload: Dict, extract: bool = False) -> Dict:
+    """Hash, verify and (optionally) extract one archive member.
+
+    Any failure on the member (corrupt or encrypted data, a bad document) is
+    recorded in the record's problems, so one bad member never stops the run.
+    """
+    info = _archive.getinfo(upload['member'])
+    record = dict(upload, size=info.file_size, problems=[])
+    digest = hashlib.sha256()
+
+    try:
+        with _archive.open(info) as member, tempfile.SpooledTemporaryFile(max_size=MEMBER_SPOOL_BYTES) as spool:
+            for chunk in iter(lambda: member.read(READ_CHUNK_BYTES), b''):
+                digest.update(chunk)
+                spool.write(chunk)
+            spool.seek(0)
+            fields, sections = read_document(spool)
+            kind = 'answers' if sections else 'proof'
+    except ValueError as e:
+        fields, sections, kind = {}, {}, 'unreadable'
+        record['problems'].append(str(e))
+    except Exception as e:  # Corrupt, truncated or encrypted member data
+        fields, sections, kind = {}, {}, 'unreadable'
+        record['problems'].append("archive member is encrypted" if info.flag_bits & 0x1
+                                  else f"could not read archive member ({type(e).__name__}: {e})")
+        digest = None
+
+    record['sha256'] = digest.hexdigest() if digest else None
+    record['kind'] = kind
+    record['document_name'] = fields.get('Student')
+    record['document_id'] = fields.get('Student ID')
+
+    if not record['problems']:
+        record['problems'] += document_problems(record['student_name'], fields)
+
+    # Only verified documents are trusted to speak for the student
+    if extract and sections and not record['problems']:
+        modified = (datetime.fromisoformat(upload['attempt']) if upload['attempt']
+                    else datetime(*info.date_time)).timestamp()
+        record['submission'] = submission_from_document(fields, sections, upload['filename'], modified)
+    return record
+
+def inspect_uploads(archive_path: str, uploads: Iterable[Dict], workers=None,
+                    extract: bool = False) -> Iterator[Dict]:
+    """Inspect uploads across a process pool; yields records in completion order.
+
+    A bounded number of members is in flight at once, so neither the queue of
+    pending work nor the finished records pile up.
+    """
+    uploads = iter(uploads)
+    if workers == 1:
+        _open_archive(archive_path)
+        for upload in uploads:
+            yield inspect_upload(upload, extract)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_archive,
+                             initargs=(archive_path,)) as executor:
+        pending = {executor.submit(inspect_upload, upload, extract) for upload in islice(uploads, workers * 2)}
+        while pending:
+            done = next(as_completed(pending))
+            pending.remove(done)
+            upload = next(uploads, None)
+            if upload is not None:
+                pending.add(executor.submit(inspect_upload, upload, extract))
+            yield done.result()
+
+def write_submission(submission: Dict, directory: str, filename: str) -> str:
+    """Save an extracted submission as assignment1_<first>_<last>.json"""
+    path = json_counterpart(os.path.join(directory, filename))
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(submission, f, indent=2)
+    os.replace(temp_path, path)
+    return path
+
+def ingest_archive(archive_path: str, manifest_path: str = DEFAULT_MANIFEST_FILE, workers=None,
+                   extract_dir: Optional[str] = None) -> Dict:
+    """Inspect every submission in a Blackboard archive and write the upload manifest"""
+    # Only the central directory is read here; member data stays in the archive
+    with zipfile.ZipFile(archive_path) as archive:
+        members = [info.filename for info in archive.infolist() if not info.is_dir()]
+
+    uploads = []
+    unmatched = []
+    for member in members:
+        upload = match_member(member)
+        if upload:
+            uploads.append(upload)
+        elif not member.endswith('.txt'):  # Blackboard's per-attempt receipts
+            unmatched.append(member)
+
+    if extract_dir:
+        os.makedirs(extract_dir, exist_ok=True)
+    extracted = {}  # Student -> attempt whose answers were written
+
+    records = []
+    for record in inspect_uploads(archive_path, uploads, workers, extract=bool(extract_dir)):
+        submission = record.pop('submission', None)
+        status = "⚠️" if record['problems'] else "✅"
+        print(f"{status} {record['student_name']}: {record['kind']} ({record['filename']})")
+        for problem in record['problems']:
+            print(f"   - {problem}")
+
+        if submission is not None:
+            key = normalize_name(record['student_name'])
+            attempt = record['attempt'] or ''
+            if key not in extracted or attempt > extracted[key]:
+                extracted[key] = attempt
+                write_submission(submission, extract_dir, record['filename'])
+        records.append(record)
+
+    records.sort(key=lambda record: (normalize_name(record['student_name']), record['attempt'] or ''))
+    manifest = {
+        'archive': os.path.abspath(archive_path),
+        'ingested_at': datetime.now().isoformat(),
+        'uploads': records,
+        'unmatched': unmatched
+    }
+    temp_path = f"{manifest_path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, manifest_path)
+
+    students = {normalize_name(record['student_name']) for record in records}
+    print("=" * 60)
+    print(f"📦 {len(records)} upload(s) from {len(students)} student(s) "
+          f"({sum(record['kind'] == 'answers' for record in records)} with answers)")
+    problems = sum(bool(record['problems']) for record in records)
+    if problems:
+        print(f"⚠️ {problems} upload(s) need a look")
+    if unmatched:
+        print(f"❓ {len(unmatched)} file(s) not named Assignment1_<first>_<last>.docx: "
+              f"{', '.join(posixpath.basename(name) for name in unmatched[:5])}"
+              f"{' ...' if len(unmatched) > 5 else ''}")
+    if extracted:
+        print(f"📝 Answers extracted for {len(extracted)} student(s) into {extract_dir}")
+    print(f"🧾 Upload manifest: {manifest_path}")
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest a Blackboard bulk-download archive without unpacking it')
+    parser.add_argument('archive', help='Zip downloaded from Blackboard (Assignment File Download)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: one per CPU core)')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST_FILE,
+                        help=f'Upload manifest to write (default: {DEFAULT_MANIFEST_FILE})')
+    parser.add_argument('--extract', metavar='DIR', default=None,
+                        help='Also write Word answers as assignment1_*.json files in DIR for grading')
+    args = parser.parse_args()
+    if args.workers is not None and args.workers < 1:
+        parser.print_usage()
+        print(f"❌ workers must be a positive number, not '{args.workers}'")
+        sys.exit(1)
+
+    print(f"🎓 CSCI 1436 Assignment #1 - Blackboard ingestion: {args.archive}")
+    print("=" * 60)
+    ingest_archive(args.archive, args.manifest, args.workers, args.extract)
+
+if __name__ == "__main__":
+    main()
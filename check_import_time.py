@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the CSCI 1436 scripts
+Imports each entry-point module in a fresh interpreter with `python -X importtime`
+and fails if it takes longer than its budget or pulls in a heavy dependency
+(pandas, requests, python-docx, ...) that should only load on the code path
+that needs it.
+
+Usage: python check_import_time.py [module ...] [--runs N]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# Cumulative import time allowed per module, in milliseconds. Generous on purpose:
+# the point is to catch a heavy dependency creeping back in, not scheduler noise.
+IMPORT_BUDGETS_MS = {
+    'instructor_dashboard': 150,
+    'simple_dashboard': 100,
+    'simple_autograder': 150,
+    'autograder': 150,
+    'autograde_keywords': 150,
+    'student_submission': 50,
+    'simple_submission': 50,
+    'student_assignment': 50,
+}
+
+# Never imported just by loading one of the modules above
+HEAVY_MODULES = ('pandas', 'numpy', 'requests', 'docx', 'lxml', 'openpyxl')
+
+# "import time: self [us] | cumulative | imported package" (nesting shown by indentation)
+IMPORTTIME_LINE = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|( *)(\S+)\s*$')
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Cumulative microseconds for every module in -X importtime output"""
+    cumulative = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+def measure(module: str, directory: Optional[str] = None) -> Dict[str, int]:
+    """Import one module in a fresh interpreter and return its -X importtime table"""
+    directory = directory or os.path.dirname(os.path.abspath(__file__))
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=directory, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr.strip()}")
+    return parse_importtime(completed.stderr)
+
+def heavy_imports(timing: Dict[str, int]) -> List[str]:
+    """HEAVY_MODULES packages that appear anywhere in an -X importtime table"""
+    return sorted({name.split('.')[0] for name in timing} & set(HEAVY_MODULES))
+
+def check_module(module: str, budget_ms: float, runs: int = 3) -> List[str]:
+    """Return the budget violations for one module (empty when it passes)"""
+    # Best of several runs; the first one may also be compiling bytecode
+    timings = [measure(module) for _ in range(runs)]
+    best = min(timings, key=lambda timing: timing.get(module, 0))
+    elapsed_ms = best.get(module, 0) / 1000
+
+    problems = []
+    heavy = heavy_imports(best)
+    if heavy:
+        problems.append(f"imports {', '.join(heavy)} at load time")
+    if elapsed_ms > budget_ms:
+        problems.append(f"took {elapsed_ms:.1f} ms (budget {budget_ms:g} ms)")
+
+    status = "❌" if problems else "✅"
+    print(f"{status} {module}: {elapsed_ms:.1f} ms / {budget_ms:g} ms")
+    for problem in problems:
+        print(f"   - {problem}")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description='Check import-time budgets with python -X importtime')
+    parser.add_argument('modules', nargs='*', default=list(IMPORT_BUDGETS_MS),
+                        help='Modules to check (default: every module with a budget)')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Imports per module; the fastest one is compared to the budget (default: 3)')
+    args = parser.parse_args()
+
+    print("⏱️ Import-time budgets")
+    print("=" * 60)
+    failures = 0
+    for module in args.modules:
+        if module not in IMPORT_BUDGETS_MS:
+            print(f"❌ No import budget for {module}")
+            failures += 1
+            continue
+        if check_module(module, IMPORT_BUDGETS_MS[module], args.runs):
+            failures += 1
+
+    print("=" * 60)
+    if failures:
+        print(f"❌ {failures} module(s) over budget")
+        sys.exit(1)
+    print("✅ All modules within budget")
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,9 @@ import os
 INSTRUCTOR_FILES = [
     'simple_autograder.py',
     'simple_dashboard.py',
+    'rubrics/simple_autograder.json',
+    # rubrics/autograder.json stays: autograder.py loads it for the Classroom tests
+    'templates/feedback.json',
     'setup_template.py',
     'SAFETY_REMINDER.md',
     # Add any other files you want hidden from students
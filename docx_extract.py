@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Answer extraction from Word submissions for the CSCI 1436 autograders
+Reads Assignment1_<first>_<last>.docx files (as written by student_assignment.py
+and student_submission.py, or the copies downloaded from Blackboard) straight
+from the zip: word/document.xml is stream-parsed paragraph by paragraph with
+iterparse, without building a python-docx tree, and the "Question N:" sections
+are mapped back to rubric question IDs.
+
+The result has the same shape as an assignment1_*.json submission, so
+SimpleGrader and grade_many() grade it unchanged.
+"""
+
+import os
+import re
+import sys
+import zipfile
+import zlib
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+from rubric import load_rubric
+
+DOCUMENT_PART = 'word/document.xml'
+DOCX_PATTERN = 'Assignment1_*.docx'
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+PARAGRAPH, TEXT, BREAK, CARRIAGE_RETURN, TAB, STYLE = (
+    W + 'p', W + 't', W + 'br', W + 'cr', W + 'tab', W + 'pStyle')
+VAL = W + 'val'
+
+QUESTION_HEADING = re.compile(r'^Question\s+(\d+)\s*:?\s*$')
+QUESTION_TEXT = re.compile(r'^\d+\.\s*\(\d+\s*points?\)')
+ANSWER_PREFIX = re.compile(r'^Answer:\s*')
+FIELD_LINE = re.compile(r'^(Student|Student ID|Submission Date|Submitted):\s*(.*)$')
+FILENAME = re.compile(r'^Assignment1_(?P<first>[^_]+)_(?P<last>.+)\.docx$', re.IGNORECASE)
+DATE_FORMAT = '%B %d, %Y at %I:%M %p'
+
+def iter_paragraphs(source) -> Iterator[Tuple[Optional[str], str]]:
+    """Yield (style, text) for each paragraph of a .docx (path or file), streaming the XML"""
+    with zipfile.ZipFile(source) as archive, archive.open(DOCUMENT_PART) as document:
+        pieces = []
+        style = None
+        for _, element in iterparse(document, events=('end',)):
+            tag = element.tag
+            if tag == TEXT:
+                pieces.append(element.text or '')
+            elif tag == BREAK or tag == CARRIAGE_RETURN:
+                pieces.append('\n')
+            elif tag == TAB and VAL not in element.attrib:
+                pieces.append('\t')  # Tab stops in paragraph properties carry w:val
+            elif tag == STYLE:
+                style = element.get(VAL)
+            elif tag == PARAGRAPH:
+                yield style, ''.join(pieces)
+                pieces = []
+                style = None
+                element.clear()  # Keep memory flat on long documents
+
+def split_sections(paragraphs) -> Tuple[Dict[str, str], Dict[int, List[str]]]:
+    """Header fields before the first question, and each question's paragraphs by number"""
+    fields = {}
+    sections = {}
+    current = None
+    for _, text in paragraphs:
+        heading = QUESTION_HEADING.match(text.strip())
+        if heading:
+            current = sections.setdefault(int(heading.group(1)), [])
+        elif current is not None:
+            current.append(text)
+        else:
+            field = FIELD_LINE.match(text.strip())
+            if field:
+                fields.setdefault(field.group(1), field.group(2).strip())
+    return fields, sections
+
+def section_answer(paragraphs: List[str]) -> str:
+    """The student's answer from one question section"""
+    for index, text in enumerate(paragraphs):
+        if ANSWER_PREFIX.match(text):
+            answer = [ANSWER_PREFIX.sub('', text, count=1)] + paragraphs[index + 1:]
+            break
+    else:
+        # Hand-edited document without an "Answer:" label: skip the printed question
+        answer = paragraphs[1:] if paragraphs and QUESTION_TEXT.match(paragraphs[0]) else paragraphs
+    return '\n'.join(answer).strip()
+
+def submitted_at(value: Optional[str], modified: float) -> str:
+    """ISO submission time from the document, else the given modification time"""
+    if value:
+        try:
+            return datetime.strptime(value, DATE_FORMAT).isoformat()
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(modified).isoformat()
+
+def read_document(source) -> Tuple[Dict[str, str], Dict[int, List[str]]]:
+    """Header fields and question sections of a .docx (a path or a seekable binary file).
+
+    Raises ValueError for anything that is not a readable .docx: not a zip, no
+    document part, bad XML, corrupt or truncated compressed data, an unsupported
+    compression method or an encrypted member.
+    """
+    try:
+        return split_sections(iter_paragraphs(source))
+    except (zipfile.BadZipFile, KeyError, SyntaxError, zlib.error, EOFError,
+            NotImplementedError, RuntimeError) as e:
+        raise ValueError(f"not a readable .docx file ({e})") from None
+
+def submission_from_document(fields: Dict[str, str], sections: Dict[int, List[str]], filename: str,
+                             modified: float, rubric=None) -> Dict:
+    """The assignment1_*.json structure for a parsed Word submission.
+
+    Question N maps to the Nth question of the rubric (simple_autograder's by
+    default); questions missing from the document get an empty answer.
+    """
+    rubric = rubric or load_rubric('simple_autograder')
+
+    name = fields.get('Student', '')
+    match = FILENAME.match(os.path.basename(filename))
+    if match:
+        first_name, last_name = match.group('first'), match.group('last')
+    else:
+        first_name, _, last_name = name.partition(' ')
+    name = name or f"{first_name} {last_name}".strip()
+
+    max_points = rubric.max_points()
+    answers = {
+        question_id: {
+            'question_number': number,
+            'answer': section_answer(sections.get(number, [])),
+            'max_points': max_points[question_id]
+        }
+        for number, question_id in enumerate(rubric.questions, 1)
+    }
+
+    return {
+        'student': {'name': name, 'first_name': first_name, 'last_name': last_name,
+                    'id': fields.get('Student ID', '')},
+        'assignment': {
+            'course': 'CSCI 1436',
+            'name': 'Assignment #1',
+            'total_points': sum(max_points.values()),
+            'submitted_at': submitted_at(fields.get('Submission Date') or fields.get('Submitted'), modified)
+        },
+        'answers': answers
+    }
+
+def extract_submission(path: str, rubric=None) -> Dict:
+    """Parse a Word submission file into the assignment1_*.json structure.
+
+    Raises ValueError if the document holds no answers (e.g. a submission proof).
+    """
+    try:
+        fields, sections = read_document(path)
+    except ValueError as e:
+        raise ValueError(f"{path} is {e}") from None
+    if not sections:
+        raise ValueError(f"{path} has no 'Question N:' answers")
+    return submission_from_document(fields, sections, path, os.path.getmtime(path), rubric)
+
+def json_counterpart(docx_file: str) -> str:
+    """assignment1_<first>_<last>.json that would sit beside a Word submission"""
+    directory, filename = os.path.split(docx_file)
+    return os.path.join(directory, 'a' + os.path.splitext(filename)[0][1:] + '.json')
+
+def word_only(docx_files) -> List[str]:
+    """Word submissions with no JSON beside them (JSON stays authoritative when both exist)"""
+    return [docx_file for docx_file in docx_files if not os.path.exists(json_counterpart(docx_file))]
+
+def main():
+    """Print what was extracted: docx_extract.py <file.docx> [...]"""
+    import json
+
+    if len(sys.argv) < 2:
+        print("Usage: python docx_extract.py <Assignment1_First_Last.docx> [...]")
+        sys.exit(1)
+
+    for path in sys.argv[1:]:
+        try:
+            print(json.dumps(extract_submission(path), indent=2))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {e}")
+
+if __name__ == "__main__":
+    main()
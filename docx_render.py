@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Template-based Word documents for the CSCI 1436 scripts
+A .docx template is loaded once and compiled into literal XML chunks and
+{{placeholders}}; rendering a document is string joins plus one zip write, with
+no python-docx object model. Everything but word/document.xml is compressed once
+per template and copied verbatim into each output file.
+
+Templates are either a .docx path (e.g. one edited in Word) or the name of a
+JSON spec in templates/, which python-docx builds into a .docx once and caches
+in templates/.cache/, keyed by the spec's content hash.
+
+Placeholder syntax inside document text:
+
+    {{student_name}}        replaced by the escaped value; newlines and tabs
+                            become line breaks and tabs
+    {{#questions}}          on a paragraph of its own: the paragraphs up to
+    ...                     {{/questions}} repeat once per item of the list,
+    {{/questions}}          with the item's keys added to the context
+
+Spec format (JSON):
+
+    {
+      "name": "...",
+      "body": [
+        {"heading": "Assignment #1 - {{student_name}}", "level": 1},
+        {"paragraph": "Student ID: {{student_id}}", "style": "Heading 3"},
+        {"paragraph": "Answer:", "runs": [{"text": "\\n{{answer}}", "size": 11}]},
+        {"repeat": "questions", "body": [...]}
+      ]
+    }
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import zipfile
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+CACHE_DIR = os.path.join(TEMPLATE_DIR, '.cache')
+
+# Bump when the spec builder changes its output so cached .docx files are rebuilt
+BUILDER_VERSION = 1
+
+# Documents handed to each worker process per task
+RENDER_CHUNK_SIZE = 50
+
+DOCUMENT_PART = 'word/document.xml'
+PLACEHOLDER = re.compile(r'\{\{\s*([#/]?)(\w+)\s*\}\}')
+TEXT_ELEMENT = re.compile(r'<w:t(?:\s[^>]*)?>([^<]*)</w:t>')
+# Characters XML 1.0 cannot carry (Word refuses documents that contain them)
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+class TemplateError(ValueError):
+    """Raised when a template or its rendering context is malformed"""
+
+def escape_text(value) -> str:
+    """A context value as the inside of a preserved <w:t> element"""
+    text = INVALID_XML_CHARS.sub('', str(value))
+    text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return (text.replace('\n', '</w:t><w:br/><w:t xml:space="preserve">')
+                .replace('\t', '</w:t><w:tab/><w:t xml:space="preserve">'))
+
+def _preserve_spaces(match) -> str:
+    # Filled values keep their leading and trailing spaces
+    if PLACEHOLDER.search(match.group(1)):
+        return f'<w:t xml:space="preserve">{match.group(1)}</w:t>'
+    return match.group(0)
+
+def _paragraph_bounds(xml: str, start: int, end: int) -> Tuple[int, int]:
+    """Start and end offsets of the <w:p> element enclosing xml[start:end]"""
+    paragraph_start = max(xml.rfind('<w:p>', 0, start), xml.rfind('<w:p ', 0, start))
+    paragraph_end = xml.find('</w:p>', end)
+    if paragraph_start < 0 or paragraph_end < 0:
+        raise TemplateError(f"Block marker {xml[start:end]} must sit in a paragraph of its own")
+    return paragraph_start, paragraph_end + len('</w:p>')
+
+def compile_xml(xml: str) -> List:
+    """Split document XML into literal strings, ('field', name) and ('block', name, parts)"""
+    xml = TEXT_ELEMENT.sub(_preserve_spaces, xml)
+
+    # Text Word split across runs cannot be filled
+    stray = set(PLACEHOLDER.findall(''.join(TEXT_ELEMENT.findall(xml)))) - set(PLACEHOLDER.findall(xml))
+    if stray:
+        names = ', '.join(sorted(prefix + name for prefix, name in stray))
+        raise TemplateError(f"Placeholders split across runs (retype them in one go): {names}")
+
+    parts = []
+    position = 0
+    for match in PLACEHOLDER.finditer(xml):
+        if match.start() < position:
+            continue  # Inside a block already compiled below
+        marker, name = match.groups()
+        if marker == '/':
+            raise TemplateError(f"{{{{/{name}}}}} without a matching {{{{#{name}}}}}")
+        if not marker:
+            parts += [xml[position:match.start()], ('field', name)]
+            position = match.end()
+            continue
+
+        closing = re.compile(r'\{\{\s*/' + name + r'\s*\}\}').search(xml, match.end())
+        if closing is None:
+            raise TemplateError(f"{{{{#{name}}}}} is never closed")
+        open_start, open_end = _paragraph_bounds(xml, match.start(), match.end())
+        close_start, close_end = _paragraph_bounds(xml, closing.start(), closing.end())
+        parts += [xml[position:open_start], ('block', name, compile_xml(xml[open_end:close_start]))]
+        position = close_end
+
+    parts.append(xml[position:])
+    return [part for part in parts if part != '']
+
+def render_parts(parts: List, context: Mapping, out: List[str]) -> None:
+    """Append the rendered XML for compiled parts to out"""
+    for part in parts:
+        if isinstance(part, str):
+            out.append(part)
+            continue
+        try:
+            value = context[part[1]]
+        except KeyError:
+            raise TemplateError(f"No value for {{{{{part[1]}}}}}") from None
+        if part[0] == 'field':
+            out.append(escape_text(value))
+        else:
+            for item in value:
+                render_parts(part[2], ChainMap(item, context), out)
+
+class DocxTemplate:
+    """A compiled .docx template; render() writes one filled-in document"""
+
+    def __init__(self, path: str):
+        self.path = path
+        static = io.BytesIO()
+        with zipfile.ZipFile(path) as source, zipfile.ZipFile(static, 'w') as target:
+            for info in source.infolist():
+                if info.filename == DOCUMENT_PART:
+                    self.parts = compile_xml(source.read(info).decode('utf-8'))
+                else:
+                    target.writestr(info, source.read(info), compress_type=zipfile.ZIP_DEFLATED)
+        if not hasattr(self, 'parts'):
+            raise TemplateError(f"{path} has no {DOCUMENT_PART}")
+        self.static_zip = static.getvalue()
+
+    def render_xml(self, context: Mapping) -> str:
+        out = []
+        render_parts(self.parts, context, out)
+        return ''.join(out)
+
+    def render(self, context: Mapping, filename: str) -> str:
+        """Write the document for one context; returns the filename"""
+        xml = self.render_xml(context)
+        temp_filename = f"{filename}.{os.getpid()}.tmp"
+        try:
+            with open(temp_filename, 'wb') as f:
+                f.write(self.static_zip)
+            # Appending to the pre-built zip only compresses the one part that changed
+            with zipfile.ZipFile(temp_filename, 'a', compression=zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr(DOCUMENT_PART, xml)
+            os.replace(temp_filename, filename)
+        except BaseException:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+        return filename
+
+def _add_body(doc, body: List[Dict]) -> None:
+    """Build spec items into a python-docx document"""
+    from docx.shared import Pt
+
+    for item in body:
+        if 'repeat' in item:
+            doc.add_paragraph(f"{{{{#{item['repeat']}}}}}")
+            _add_body(doc, item['body'])
+            doc.add_paragraph(f"{{{{/{item['repeat']}}}}}")
+        elif 'heading' in item:
+            doc.add_heading(item['heading'], level=item.get('level', 1))
+        elif 'paragraph' in item:
+            paragraph = doc.add_paragraph(item['paragraph'], style=item.get('style'))
+            for run_spec in item.get('runs', []):
+                run = paragraph.add_run(run_spec['text'])
+                if 'size' in run_spec:
+                    run.font.size = Pt(run_spec['size'])
+        else:
+            raise TemplateError(f"Unknown template item: {sorted(item)}")
+
+def build_template(spec: Dict, filename: str) -> str:
+    """Lay out a JSON spec with python-docx and save it as a .docx template"""
+    from docx import Document  # Only needed when a spec changes
+
+    doc = Document()
+    _add_body(doc, spec['body'])
+    doc.save(filename)
+    return filename
+
+def template_path(name: str) -> str:
+    """A .docx template, building (or reusing) the one for templates/<name>.json"""
+    if name.endswith('.docx'):
+        return name
+
+    spec_file = name if name.endswith('.json') else os.path.join(TEMPLATE_DIR, f"{name}.json")
+    with open(spec_file, 'rb') as f:
+        raw = f.read()
+    version = hashlib.sha256(raw).hexdigest()
+    cached = os.path.join(CACHE_DIR, f"{version}.v{BUILDER_VERSION}.docx")
+    if not os.path.exists(cached):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp_file = f"{cached}.{os.getpid()}.tmp.docx"
+        build_template(json.loads(raw), temp_file)
+        os.replace(temp_file, cached)
+    return cached
+
+_templates = {}
+
+def load_template(name: str) -> DocxTemplate:
+    """Compiled template by spec name or .docx path (compiled once per process)"""
+    if name not in _templates:
+        _templates[name] = DocxTemplate(template_path(name))
+    return _templates[name]
+
+def render_document(name: str, context: Mapping, filename: str) -> str:
+    """Render one document from a template; returns the filename"""
+    return load_template(name).render(context, filename)
+
+def _render_chunk(name, chunk):
+    """Worker task: render a list of (filename, context) pairs"""
+    template = load_template(name)
+    return [template.render(context, filename) for filename, context in chunk]
+
+def render_many(name: str, jobs: Iterable[Tuple[str, Mapping]], workers=None,
+                chunk_size: int = RENDER_CHUNK_SIZE) -> Iterator[str]:
+    """Render (filename, context) pairs across a process pool.
+
+    Yields filenames as each chunk finishes (completion order). Each worker
+    compiles the template once and reuses it for every document it writes.
+    """
+    load_template(name)  # Build the template up front so workers only read it
+    items = iter(jobs)
+    chunks = iter(lambda: list(islice(items, chunk_size)), [])
+
+    first = next(chunks, None)
+    if first is None:
+        return
+
+    if workers == 1:
+        yield from _render_chunk(name, first)
+        for chunk in chunks:
+            yield from _render_chunk(name, chunk)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Bounded number of chunks in flight, as in simple_autograder.grade_many
+        pending = {executor.submit(_render_chunk, name, first)}
+        for chunk in islice(chunks, workers * 2 - 1):
+            pending.add(executor.submit(_render_chunk, name, chunk))
+
+        while pending:
+            done = next(as_completed(pending))
+            pending.remove(done)
+            next_chunk = next(chunks, None)
+            if next_chunk is not None:
+                pending.add(executor.submit(_render_chunk, name, next_chunk))
+            yield from done.result()
+
+def main():
+    """Render one document: docx_render.py <template> <context.json> <output.docx>"""
+    if len(sys.argv) != 4:
+        print("Usage: python docx_render.py <template name or .docx> <context.json> <output.docx>")
+        sys.exit(1)
+
+    with open(sys.argv[2], 'r') as f:
+        context = json.load(f)
+    print(f"📄 Wrote {render_document(sys.argv[1], context, sys.argv[3])}")
+
+if __name__ == "__main__":
+    main()
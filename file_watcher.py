@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Directory watching for the CSCI 1436 dashboards
+Reports files created, modified, moved or deleted in one directory. Uses
+inotify on Linux (through ctypes, no extra dependency) and falls back to
+polling file sizes and mtimes everywhere else. A watcher takes one glob
+pattern or several.
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+from typing import Iterable, Iterator, Optional, Set, Tuple, Union
+
+POLL_INTERVAL = 0.5
+DEBOUNCE_SECONDS = 0.2
+MAX_BATCH_DELAY = 1.0  # Flush a batch even if files keep changing
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+EVENT_HEADER = struct.Struct('iIII')
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+GONE_MASK = IN_MOVED_FROM | IN_DELETE
+
+def as_patterns(pattern: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+    """One glob pattern or several, as a tuple"""
+    return (pattern,) if isinstance(pattern, str) else tuple(pattern)
+
+def matches(name: str, patterns: Tuple[str, ...]) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+def matching_paths(directory: str, patterns: Tuple[str, ...]) -> Set[str]:
+    """Paths of the files in directory that match any of the patterns"""
+    with os.scandir(directory) as entries:
+        return {entry.path for entry in entries if matches(entry.name, patterns)}
+
+class InotifyWatcher:
+    """Linux inotify watch on one directory"""
+
+    def __init__(self, directory: str, pattern: Union[str, Iterable[str]] = '*'):
+        self.directory = directory
+        self.patterns = as_patterns(pattern)
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        # Matching files known to exist, so a rescan after a queue overflow can report deletions
+        self.paths = matching_paths(directory, self.patterns)
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block up to timeout seconds (forever if None) and return changed paths"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self.fd], [], [], remaining)
+            if not readable:
+                return set()
+
+            changed = self._read_events()
+            # Events for other files (e.g. our own exports) do not end the wait
+            if changed:
+                return changed
+
+    def _read_events(self) -> Set[str]:
+        """Drain queued events and return the matching paths"""
+        changed = set()
+        overflowed = False
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(buffer):
+                _, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(buffer[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    overflowed = True
+                elif name and matches(name, self.patterns):
+                    path = os.path.join(self.directory, name)
+                    changed.add(path)
+                    if mask & GONE_MASK:
+                        self.paths.discard(path)
+                    else:
+                        self.paths.add(path)
+
+        if overflowed:
+            # The kernel dropped events: report every matching file, and every one that has gone
+            current = matching_paths(self.directory, self.patterns)
+            changed |= current | self.paths
+            self.paths = current
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Portable fallback that compares size and mtime snapshots"""
+
+    def __init__(self, directory: str, pattern: Union[str, Iterable[str]] = '*', interval: float = POLL_INTERVAL):
+        self.directory = directory
+        self.patterns = as_patterns(pattern)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if matches(entry.name, self.patterns):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block up to timeout seconds (forever if None) and return changed paths"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {
+                path for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = snapshot
+            if changed:
+                return changed
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self.interval, remaining))
+            else:
+                time.sleep(self.interval)
+
+    def close(self) -> None:
+        pass
+
+def open_watcher(directory: str, pattern: Union[str, Iterable[str]] = '*'):
+    """Best available watcher for this platform"""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory, pattern)
+        except (OSError, AttributeError):
+            pass  # inotify unavailable (e.g. exhausted watches): poll instead
+    return PollingWatcher(directory, pattern)
+
+def watch_batches(watcher, debounce: float = DEBOUNCE_SECONDS,
+                  max_delay: float = MAX_BATCH_DELAY) -> Iterator[Set[str]]:
+    """Yield sets of changed paths once changes go quiet for `debounce` seconds.
+
+    A burst of writes (e.g. an editor save, or a whole folder copied in) becomes
+    one batch; a batch is never held back longer than max_delay.
+    """
+    while True:
+        changed = watcher.wait()
+        flush_at = time.monotonic() + max_delay
+        while True:
+            remaining = flush_at - time.monotonic()
+            if remaining <= 0:
+                break
+            more = watcher.wait(min(debounce, remaining))
+            if not more:
+                break
+            changed |= more
+        yield changed
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+GitHub REST client for the CSCI 1436 instructor dashboard
+One keep-alive connection pool shared by a bounded pool of worker threads.
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_API_URL = "https://api.github.com"
+DEFAULT_CONCURRENCY = 8
+PER_PAGE = 100  # GitHub's maximum page size
+DEFAULT_CACHE_DIR = ".github_cache"
+
+# GitHub's secondary limit allows roughly 900 REST points (GETs) per minute
+DEFAULT_MAX_RATE = 15.0
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Below this many remaining requests, pacing stretches the budget to the reset
+LOW_BUDGET = 100
+LOW_BUDGET_FRACTION = 0.1
+
+def retry_after_seconds(value: str) -> Optional[float]:
+    """Seconds a Retry-After header asks for, given as seconds or an HTTP date (None if unreadable)"""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, when.timestamp() - time.time())
+
+def header_int(headers, name: str) -> Optional[int]:
+    """An integer header such as X-RateLimit-Remaining (None if absent or malformed)"""
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+class RateLimiter:
+    """Thread-safe token bucket paced by GitHub's rate-limit headers.
+
+    Requests are released at up to max_rate per second. Once a response's
+    X-RateLimit-* headers show the budget running low, the refill rate drops
+    so the remainder lasts until the window resets, and an exhausted budget
+    blocks every caller until the reset time.
+    """
+
+    def __init__(self, max_rate: float = DEFAULT_MAX_RATE, burst: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.capacity = burst or max(1, int(max_rate))
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.updated = clock()
+        self.blocked_until = 0.0
+
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None  # Epoch seconds, as sent by GitHub
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> None:
+        """Block until the caller may send one request"""
+        with self.lock:
+            now = self.clock()
+            self._refill(now)
+            # Reserve a token now, even if that leaves the bucket in debt
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            wait = max(wait, self.blocked_until - now)
+
+        if wait > 0:
+            self.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for the given time (e.g. Retry-After)"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, self.clock() + seconds)
+
+    def update(self, headers) -> None:
+        """Re-tune pacing from a response's X-RateLimit-* headers (malformed values are ignored)"""
+        remaining = header_int(headers, 'X-RateLimit-Remaining')
+        reset = header_int(headers, 'X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+
+        with self.lock:
+            self.remaining = remaining
+            self.reset_at = reset
+            limit = header_int(headers, 'X-RateLimit-Limit')
+            if limit is not None:
+                self.limit = limit
+
+            seconds_left = max(1.0, self.reset_at - time.time())
+            low_water = max(LOW_BUDGET, (self.limit or 0) * LOW_BUDGET_FRACTION)
+            self._refill(self.clock())
+            if self.remaining <= 0:
+                self.blocked_until = max(self.blocked_until, self.clock() + seconds_left + 1)
+            elif self.remaining <= low_water:
+                # Running low: spread what is left of the budget over the rest of the window
+                self.rate = max(0.01, min(self.max_rate, self.remaining / seconds_left))
+            else:
+                self.rate = self.max_rate
+
+    def budget(self) -> Dict:
+        """Most recently reported primary rate-limit budget"""
+        return {'limit': self.limit, 'remaining': self.remaining, 'reset_at': self.reset_at}
+
+class ResponseCache:
+    """On-disk store of response bodies keyed by URL, with their validators.
+
+    Entries hold the ETag / Last-Modified values GitHub sent so later runs can
+    make conditional requests; a 304 reuses the stored body and does not count
+    against the rate limit.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for a URL, if any"""
+        try:
+            with open(self._path(url), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, response: 'requests.Response') -> None:
+        """Store a 200 response that carries a validator"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'link': response.headers.get('Link'),
+            'body': response.text
+        }
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{id(entry)}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(temp_path, path)
+
+class GitHubClient:
+    def __init__(self, token: Optional[str], base_url: Optional[str] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, timeout: float = 30,
+                 cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None):
+        # GITHUB_API_URL is set on Actions runners and GHES; tests point it at a local server
+        self.base_url = (base_url or os.getenv('GITHUB_API_URL') or DEFAULT_API_URL).rstrip('/')
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+        # requests is loaded with the first client, so importing this module stays cheap
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Accept': 'application/vnd.github.v3+json'})
+        if token:
+            self.session.headers['Authorization'] = f'token {token}'
+
+    def url(self, path: str) -> str:
+        """Build an absolute API URL from a path such as /orgs/x/repos"""
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(self, path: str, params: Optional[Dict] = None) -> 'requests.Response':
+        """GET a path over the shared connection pool, revalidating cached copies"""
+        import requests
+
+        url = requests.Request('GET', self.url(path), params=params).prepare().url
+        entry = self.cache.get(url) if self.cache else None
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._send(url, headers)
+
+        if response.status_code == 304 and entry:
+            # Unchanged since last run: serve the stored body as a normal 200
+            response.status_code = 200
+            response._content = entry['body'].encode('utf-8')
+            response.encoding = 'utf-8'
+            if entry.get('link'):
+                response.headers['Link'] = entry['link']
+            response.from_cache = True
+        elif response.status_code == 200 and self.cache:
+            self.cache.put(url, response)
+
+        return response
+
+    def _retry_delay(self, response: Optional['requests.Response'], attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the response is final"""
+        if response is not None:
+            status = response.status_code
+            rate_limited = status == 429 or (
+                status == 403 and (response.headers.get('X-RateLimit-Remaining') == '0'
+                                   or 'Retry-After' in response.headers
+                                   or 'rate limit' in response.text.lower())
+            )
+            if not rate_limited and status not in RETRY_STATUSES:
+                return None
+
+            retry_after = retry_after_seconds(response.headers.get('Retry-After', ''))
+            if retry_after is not None:
+                return retry_after
+            reset = header_int(response.headers, 'X-RateLimit-Reset')
+            if response.headers.get('X-RateLimit-Remaining') == '0' and reset is not None:
+                return max(1.0, reset - time.time() + 1)
+
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    def _send(self, url: str, headers: Dict, stream: bool = False) -> 'requests.Response':
+        """Send a paced GET, retrying rate limits, 5xx, connection errors and timeouts"""
+        import requests
+
+        for attempt in range(MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == MAX_RETRIES:
+                    raise
+                response = None
+            else:
+                self.rate_limiter.update(response.headers)
+
+            delay = self._retry_delay(response, attempt)
+            if delay is None or attempt == MAX_RETRIES:
+                return response
+            if response is not None:
+                response.close()
+            # Secondary limits apply to the whole client, so every thread backs off
+            self.rate_limiter.pause(delay)
+
+        return response
+
+    def stream(self, path: str, params: Optional[Dict] = None) -> 'requests.Response':
+        """GET a large body (e.g. logs) without caching or reading it into memory.
+
+        The caller iterates the response (iter_lines / iter_content) and closes it.
+        """
+        import requests
+
+        url = requests.Request('GET', self.url(path), params=params).prepare().url
+        return self._send(url, {}, stream=True)
+
+    def rate_limit(self) -> Dict:
+        """Remaining GitHub API budget as last reported by the server"""
+        return self.rate_limiter.budget()
+
+    def get_json(self, path: str, params: Optional[Dict] = None):
+        """GET a path and return the decoded body, or None on a non-200 response"""
+        response = self.get(path, params)
+        if response.status_code != 200:
+            return None
+        return response.json()
+
+    def paginate(self, path: str, params: Optional[Dict] = None, items_key: Optional[str] = None) -> Iterator:
+        """Yield items from every page of a list endpoint, following Link: rel="next".
+
+        Items are yielded as each page arrives. For endpoints that wrap their list
+        (e.g. search results under "items"), pass items_key.
+        """
+        params = dict(params or {})
+        params.setdefault('per_page', PER_PAGE)
+        url = self.url(path)
+
+        while url:
+            response = self.get(url, params)
+            response.raise_for_status()
+
+            body = response.json()
+            yield from (body[items_key] if items_key else body)
+
+            # The next link already carries the query string
+            url = response.links.get('next', {}).get('url')
+            params = None
+
+    def imap(self, func: Callable, items: Iterable) -> Iterator:
+        """Run func over a (possibly streaming) iterable with bounded concurrency.
+
+        Work starts as soon as items arrive; results are yielded in input order.
+        """
+        if self.concurrency == 1:
+            yield from (func(item) for item in items)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            window = deque()
+            for item in items:
+                window.append(executor.submit(func, item))
+                if len(window) >= self.concurrency * 2:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+
+    def map(self, func: Callable, items: Iterable) -> List:
+        """Run func over items with bounded concurrency; results keep input order"""
+        return list(self.imap(func, items))
+
+    def close(self) -> None:
+        """Release pooled connections"""
+        self.session.close()
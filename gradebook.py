@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Durable gradebook for the CSCI 1436 dashboards
+One SQLite database (WAL mode, so TAs can read it while a grader writes)
+holding students, their latest submission, per-question scores and the
+grading runs that produced them. Dashboards upsert graded rows in batched
+transactions, and LMS exports are queries over it.
+
+Every upsert refreshes a submission's name, submission time, run and feedback,
+but its 'changed' time only moves when its scores actually change, so "who
+changed since yesterday" is an indexed lookup:
+
+    python gradebook.py --since 2025-09-01T17:00
+
+Exports remember, per target (e.g. "simple_dashboard.csv"), the score digest
+each student last went out with, so a delta export only contains students whose
+scores differ from what the LMS already has.
+
+Each dashboard keeps its own gradebook (they number questions differently), and
+a gradebook remembers the dashboard that owns it, so pointing two dashboards at
+the same file fails instead of mixing their rows. Reports and exports can be
+limited to a roster of student keys (the students graded in the current run).
+
+Set GRADEBOOK to a file path to move the database.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from itertools import groupby, islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_GRADEBOOK_FILE = "gradebook.sqlite3"
+BATCH_SIZE = 500  # Rows per write transaction
+MANIFEST_STUDENTS = 1000  # Students listed by name in a delta manifest
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS gradebook_owner (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    student_key TEXT NOT NULL UNIQUE,
+    student_id TEXT,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS grading_runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    rubric_version TEXT,
+    started REAL NOT NULL,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    student INTEGER NOT NULL UNIQUE REFERENCES students(id),
+    submitted_at TEXT,
+    content_sha256 TEXT,
+    total_earned NUMERIC NOT NULL,
+    total_possible NUMERIC NOT NULL,
+    turnitin_submitted INTEGER,
+    score_digest TEXT NOT NULL,
+    run INTEGER REFERENCES grading_runs(id),
+    changed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS submissions_changed ON submissions(changed);
+CREATE INDEX IF NOT EXISTS submissions_run ON submissions(run);
+CREATE TABLE IF NOT EXISTS scores (
+    submission INTEGER NOT NULL REFERENCES submissions(id),
+    position INTEGER NOT NULL,
+    question_id TEXT NOT NULL,
+    points NUMERIC NOT NULL,
+    max_points NUMERIC NOT NULL,
+    feedback TEXT,
+    PRIMARY KEY (submission, question_id)
+);
+CREATE TABLE IF NOT EXISTS exports (
+    id INTEGER PRIMARY KEY,
+    target TEXT NOT NULL,
+    file TEXT,
+    delta INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exported (
+    target TEXT NOT NULL,
+    submission INTEGER NOT NULL REFERENCES submissions(id),
+    score_digest TEXT NOT NULL,
+    export INTEGER NOT NULL REFERENCES exports(id),
+    PRIMARY KEY (target, submission)
+);
+"""
+
+def normalize_name(name: str) -> str:
+    """Student name compared case- and whitespace-insensitively"""
+    return " ".join(name.lower().split())
+
+def student_key(student_id: Optional[str], name: str) -> str:
+    """Stable identity for a student: their ID, else their normalized name"""
+    if student_id and student_id != 'N/A':
+        return f"id:{student_id}"
+    return "name:" + normalize_name(name)
+
+def row_key(row: Dict) -> str:
+    """student_key() of a gradebook row"""
+    return student_key(row.get('student_id'), row['student_name'])
+
+def score_digest(row: Dict) -> str:
+    """Fingerprint of everything an LMS import would show for a row"""
+    scores = [(q['question_id'], q['points'], q['max_points']) for q in row['questions']]
+    payload = [row['total_earned'], row['total_possible'], row.get('turnitin_submitted'), scores]
+    return hashlib.sha256(json.dumps(payload).encode('utf-8')).hexdigest()
+
+class GradebookError(ValueError):
+    """Raised when a gradebook belongs to a different dashboard"""
+
+class Gradebook:
+    def __init__(self, path: Optional[str] = None, owner: Optional[str] = None,
+                 default_path: str = DEFAULT_GRADEBOOK_FILE):
+        """Open (creating if needed) a gradebook; with owner, claim it or check it is ours"""
+        self.path = path or os.getenv('GRADEBOOK') or default_path
+        self.connection = sqlite3.connect(self.path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS roster (student_key TEXT PRIMARY KEY)")
+
+        if owner:
+            with self.connection:
+                self.connection.execute("INSERT OR IGNORE INTO gradebook_owner (id, source) VALUES (1, ?)", (owner,))
+            (current,) = self.connection.execute("SELECT source FROM gradebook_owner").fetchone()
+            if current != owner:
+                self.connection.close()
+                raise GradebookError(f"{self.path} is the {current} gradebook; "
+                                     f"use a separate file for {owner} (--gradebook or $GRADEBOOK)")
+
+    def start_run(self, source: str, rubric_version: Optional[str] = None) -> int:
+        """Open a grading run and return its ID"""
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO grading_runs (source, rubric_version, started) VALUES (?, ?, ?)",
+                (source, rubric_version, time.time())
+            )
+        return cursor.lastrowid
+
+    def finish_run(self, run: int) -> None:
+        with self.connection:
+            self.connection.execute("UPDATE grading_runs SET finished = ? WHERE id = ?", (time.time(), run))
+
+    def record(self, run: int, rows: Iterable[Dict], batch_size: int = BATCH_SIZE) -> int:
+        """Upsert graded rows, one transaction per batch; returns how many changed.
+
+        A row is {student_id, student_name, submitted_at, total_earned,
+        total_possible, questions: [{question_id, points, max_points, feedback}]}
+        plus optional content_sha256 and turnitin_submitted.
+        """
+        rows = iter(rows)
+        changed = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return changed
+            with self.connection:
+                changed += self._record_batch(run, batch)
+
+    def _record_batch(self, run: int, batch) -> int:
+        now = time.time()
+        # A student graded twice in one batch keeps their last row
+        latest = {row_key(row): row for row in batch}
+        keys, batch = list(latest), list(latest.values())
+
+        self.connection.executemany(
+            "INSERT INTO students (student_key, student_id, name) VALUES (?, ?, ?) "
+            "ON CONFLICT(student_key) DO UPDATE SET student_id = excluded.student_id, name = excluded.name",
+            [(key, row.get('student_id'), row['student_name']) for key, row in zip(keys, batch)]
+        )
+        student_ids = self._ids("SELECT student_key, id FROM students WHERE student_key IN ({})", keys)
+
+        digests = {key: score_digest(row) for key, row in zip(keys, batch)}
+        previous = self._ids(
+            "SELECT students.student_key, submissions.score_digest FROM submissions "
+            "JOIN students ON students.id = submissions.student WHERE students.student_key IN ({})",
+            keys
+        )
+        self.connection.executemany(
+            "INSERT INTO submissions (student, submitted_at, content_sha256, total_earned, total_possible, "
+            "turnitin_submitted, score_digest, run, changed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(student) DO UPDATE SET submitted_at = excluded.submitted_at, "
+            "content_sha256 = excluded.content_sha256, total_earned = excluded.total_earned, "
+            "total_possible = excluded.total_possible, turnitin_submitted = excluded.turnitin_submitted, "
+            "score_digest = excluded.score_digest, run = excluded.run, "
+            # Only a score change moves 'changed' (and so delta exports); everything else is refreshed
+            "changed = CASE WHEN submissions.score_digest IS excluded.score_digest "
+            "THEN submissions.changed ELSE excluded.changed END",
+            [
+                (student_ids[key], row.get('submitted_at'), row.get('content_sha256'),
+                 row['total_earned'], row['total_possible'], row.get('turnitin_submitted'),
+                 digests[key], run, now)
+                for key, row in zip(keys, batch)
+            ]
+        )
+
+        # Scores are rewritten for every row so feedback stays current
+        changed_keys = [key for key in digests if previous.get(key) != digests[key]]
+        submission_ids = self._ids(
+            "SELECT students.student_key, submissions.id FROM submissions "
+            "JOIN students ON students.id = submissions.student WHERE students.student_key IN ({})",
+            keys
+        )
+        if submission_ids:
+            ids = list(submission_ids.values())
+            self.connection.execute(
+                f"DELETE FROM scores WHERE submission IN ({','.join('?' * len(ids))})", ids
+            )
+            self.connection.executemany(
+                "INSERT INTO scores (submission, position, question_id, points, max_points, feedback) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (submission_ids[key], position, question['question_id'], question['points'],
+                     question['max_points'], question.get('feedback'))
+                    for key, row in zip(keys, batch) if key in submission_ids
+                    for position, question in enumerate(row['questions'])
+                ]
+            )
+        return len(changed_keys)
+
+    def _ids(self, query: str, keys) -> Dict:
+        """Run a two-column lookup query over an IN (...) list of student keys"""
+        placeholders = ','.join('?' * len(keys))
+        return dict(self.connection.execute(query.format(placeholders), list(keys)))
+
+    def rows(self, since: Optional[float] = None, unexported: Optional[str] = None,
+             roster: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """Stream gradebook rows (in the record() shape) ordered by student name.
+
+        With since (epoch seconds), only submissions whose scores changed after it.
+        With unexported (an export target), only those whose scores differ from
+        what that target last exported. With roster (student keys, see
+        row_key()), only those students.
+        """
+        conditions, params = [], [unexported]
+        if roster is not None:
+            with self.connection:
+                self.connection.execute("DELETE FROM temp.roster")
+                self.connection.executemany("INSERT OR IGNORE INTO temp.roster (student_key) VALUES (?)",
+                                            ((key,) for key in roster))
+            conditions.append("students.student_key IN (SELECT student_key FROM temp.roster)")
+        if since is not None:
+            conditions.append("submissions.changed > ?")
+            params.append(since)
+        if unexported is not None:
+            conditions.append("exported.score_digest IS NOT submissions.score_digest")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        cursor = self.connection.execute(
+            "SELECT submissions.id, students.student_id, students.name, submissions.submitted_at, "
+            "submissions.content_sha256, submissions.total_earned, submissions.total_possible, "
+            "submissions.turnitin_submitted, submissions.changed, submissions.score_digest, "
+            "exported.score_digest, "
+            "scores.question_id, scores.points, scores.max_points, scores.feedback "
+            "FROM submissions JOIN students ON students.id = submissions.student "
+            "LEFT JOIN exported ON exported.submission = submissions.id AND exported.target = ? "
+            f"LEFT JOIN scores ON scores.submission = submissions.id {where} "
+            "ORDER BY students.name, submissions.id, scores.position",
+            params
+        )
+
+        for submission_id, records in groupby(cursor, key=lambda record: record[0]):
+            records = list(records)
+            first = records[0]
+            yield {
+                'submission_id': submission_id,
+                'student_id': first[1],
+                'student_name': first[2],
+                'submitted_at': first[3],
+                'content_sha256': first[4],
+                'total_earned': first[5],
+                'total_possible': first[6],
+                'turnitin_submitted': None if first[7] is None else bool(first[7]),
+                'changed': first[8],
+                'score_digest': first[9],
+                'previously_exported': first[10] is not None,
+                'questions': [
+                    {'question_id': record[11], 'points': record[12], 'max_points': record[13],
+                     'feedback': record[14]}
+                    for record in records if record[11] is not None
+                ]
+            }
+
+    def start_export(self, target: str, delta: bool = False,
+                     roster: Optional[Iterable[str]] = None) -> 'GradebookExport':
+        """Begin an export to target (of the roster's students, if given); iterate its rows(), then finish() or abort() it"""
+        return GradebookExport(self, target, delta, roster)
+
+    def close(self) -> None:
+        self.connection.close()
+
+class GradebookExport:
+    """One export in progress, recording each row it streams as exported.
+
+    The snapshot is written through a second connection inside one transaction,
+    so rows stream from a consistent read and an export that fails part-way
+    leaves the target's snapshot as it was.
+    """
+
+    def __init__(self, gradebook: Gradebook, target: str, delta: bool, roster: Optional[Iterable[str]] = None):
+        self.gradebook = gradebook
+        self.target = target
+        self.delta = delta
+        self.roster = roster
+        self.count = 0
+        self.new = 0
+        self.students = []
+        self.pending = []
+        self.previous = gradebook.connection.execute(
+            "SELECT id, file, created FROM exports WHERE target = ? ORDER BY id DESC LIMIT 1", (target,)
+        ).fetchone()
+
+        self.created = time.time()
+        self.writer = sqlite3.connect(gradebook.path, timeout=30, isolation_level=None)
+        self.writer.execute("BEGIN IMMEDIATE")
+        self.export_id = self.writer.execute(
+            "INSERT INTO exports (target, delta, row_count, created) VALUES (?, ?, 0, ?)",
+            (target, int(delta), self.created)
+        ).lastrowid
+
+    def rows(self) -> Iterator[Dict]:
+        """Stream the rows to export (only unexported changes for a delta)"""
+        for row in self.gradebook.rows(unexported=self.target if self.delta else None, roster=self.roster):
+            self.count += 1
+            if not row['previously_exported']:
+                self.new += 1
+            if self.delta and len(self.students) < MANIFEST_STUDENTS:
+                self.students.append({
+                    'student_id': row['student_id'],
+                    'student_name': row['student_name'],
+                    'status': 'changed' if row['previously_exported'] else 'new',
+                    'total_earned': row['total_earned'],
+                    'total_possible': row['total_possible']
+                })
+
+            self.pending.append((self.target, row['submission_id'], row['score_digest'], self.export_id))
+            if len(self.pending) >= BATCH_SIZE:
+                self._flush()
+            yield row
+
+    def _flush(self) -> None:
+        self.writer.executemany(
+            "INSERT OR REPLACE INTO exported (target, submission, score_digest, export) VALUES (?, ?, ?, ?)",
+            self.pending
+        )
+        self.pending = []
+
+    def finish(self, files: List[str]) -> Dict:
+        """Commit the snapshot and return a manifest describing the export"""
+        self._flush()
+        self.writer.execute(
+            "UPDATE exports SET file = ?, row_count = ? WHERE id = ?",
+            (json.dumps(files), self.count, self.export_id)
+        )
+        self.writer.execute("COMMIT")
+        self.writer.close()
+
+        manifest = {
+            'export_id': self.export_id,
+            'target': self.target,
+            'files': files,
+            'delta': self.delta,
+            'created': datetime.fromtimestamp(self.created).isoformat(timespec='seconds'),
+            'previous_export': self.previous and {
+                'export_id': self.previous[0],
+                'files': json.loads(self.previous[1] or '[]'),
+                'created': datetime.fromtimestamp(self.previous[2]).isoformat(timespec='seconds')
+            },
+            'rows': self.count,
+            'new_students': self.new,
+            'changed_students': self.count - self.new
+        }
+        if self.delta:
+            manifest['students'] = self.students
+            manifest['students_truncated'] = self.count > len(self.students)
+        return manifest
+
+    def abort(self) -> None:
+        """Discard the export, leaving the target's snapshot unchanged"""
+        self.writer.execute("ROLLBACK")
+        self.writer.close()
+
+def write_export_manifest(manifest: Dict, path: str) -> str:
+    """Write an export manifest as JSON beside its export file"""
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the CSCI 1436 gradebook')
+    parser.add_argument('--since', default=None,
+                        help='Only students whose scores changed after this ISO date/time')
+    parser.add_argument('--file', default=None,
+                        help=f'Gradebook database (default: $GRADEBOOK or {DEFAULT_GRADEBOOK_FILE}; '
+                             f'simple_dashboard.py keeps simple_gradebook.sqlite3)')
+    args = parser.parse_args()
+
+    since = datetime.fromisoformat(args.since).timestamp() if args.since else None
+    gradebook = Gradebook(args.file)
+
+    count = 0
+    for row in gradebook.rows(since):
+        count += 1
+        changed = datetime.fromtimestamp(row['changed']).strftime('%m/%d/%Y %I:%M %p')
+        print(f"📚 {row['student_name']} (ID: {row['student_id'] or 'N/A'}): "
+              f"{row['total_earned']:g}/{row['total_possible']:g} - changed {changed}")
+    print(f"📊 {count} student(s)" + (f" changed since {args.since}" if args.since else ""))
+    gradebook.close()
+
+if __name__ == "__main__":
+    main()
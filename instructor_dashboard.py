@@ -4,75 +4,412 @@ Instructor Dashboard for CSCI 1436 Assignment #1
 View autograded results from GitHub Classroom and track Turnitin submissions
 """
 
+import io
 import json
 import os
 import glob
-import pandas as pd
+import re
+import queue
+import sys
+import tempfile
+import threading
+import time
+import zipfile
 from datetime import datetime
-import requests
-from typing import Dict, List
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
 import argparse
+from rubric import load_rubric
+from gradebook import Gradebook, GradebookError, DEFAULT_GRADEBOOK_FILE, row_key
+from lms_export import export_gradebook, percent
+from blackboard_ingest import DEFAULT_MANIFEST_FILE as DEFAULT_UPLOADS_FILE
+from submission_index import DEFAULT_ROSTER_FILE, SubmissionIndex, load_roster, print_report
+from github_client import (GitHubClient, RateLimiter, ResponseCache,
+                           DEFAULT_CACHE_DIR, DEFAULT_CONCURRENCY, DEFAULT_MAX_RATE)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Lines printed by autograder.py and by the Classroom test runner
+SCORE_LINE = re.compile(r'Score:\s*(\d+)\s*/\s*(\d+)')
+QUESTION_LINE = re.compile(r'\bQuestion\s+(\d+)\b')
+FEEDBACK_LINE = re.compile(r'Feedback:\s?(.*)')
+LOG_TIMESTAMP = re.compile(r'^\d{4}-\d{2}-\d{2}T[\d:.]+Z ?')
+RUN_ID = re.compile(r'/actions/runs/(\d+)')
+
+# Spool downloaded log archives to disk beyond this size
+LOG_SPOOL_BYTES = 8 * 1024 * 1024
+
+# Results waiting between pipeline stages, and rows per gradebook commit
+PIPELINE_DEPTH = 32
+PIPELINE_RECORD_BATCH = 25
+# How often a blocked pipeline stage checks whether its consumer has stopped
+PIPELINE_STOP_POLL_SECONDS = 0.1
+
+# Gradebook export target whose last-exported scores --delta compares against
+EXPORT_TARGET = "instructor_dashboard"
+# csv and excel keep the dashboard's original report layout; blackboard/xlsx are the LMS import layout
+EXPORT_FORMAT_ALIASES = {'csv': 'report', 'excel': 'report_xlsx'}
+
+class _StageFailure:
+    """Carries an exception from a pipeline stage's thread to its consumer"""
+    
+    def __init__(self, error: BaseException):
+        self.error = error
+
+_STAGE_DONE = object()
+
+def buffered(items: Iterable, depth: int) -> Iterator:
+    """Produce items on a background thread, handing them over through a bounded queue.
+    
+    The producer blocks once depth items are waiting, so a slow consumer applies
+    backpressure all the way up the pipeline. Exceptions are re-raised here. If
+    the consumer stops early (an error, close(), or dropping the iterator), the
+    producer stops at its next hand-off and closes items, so upstream stages stop too.
+    """
+    handoff = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+    
+    def put(item) -> bool:
+        """Hand item over; False once the consumer has stopped"""
+        while not stopped.is_set():
+            try:
+                handoff.put(item, timeout=PIPELINE_STOP_POLL_SECONDS)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def produce():
+        source = iter(items)
+        try:
+            for item in source:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_StageFailure(e))
+        else:
+            put(_STAGE_DONE)
+        finally:
+            if hasattr(source, 'close'):
+                source.close()
+    
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item = handoff.get()
+            if item is _STAGE_DONE:
+                return
+            if isinstance(item, _StageFailure):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
+
+def parse_score_lines(lines: Iterable[str], question_ids: List[str]) -> List[Dict]:
+    """Incrementally parse autograder output into per-question results.
+    
+    A "Question N" line (the Classroom test name) labels the next score;
+    unlabelled scores are numbered in order. Lines after "Feedback:" are
+    collected until a blank line or the next question/score.
+    """
+    results = {}
+    current_num = None
+    last_result = None
+    feedback_for = None
+    
+    for line in lines:
+        line = LOG_TIMESTAMP.sub('', line.rstrip('\r\n'))
+        
+        score = SCORE_LINE.search(line)
+        question = QUESTION_LINE.search(line)
+        
+        if score:
+            question_num = current_num if current_num and current_num not in results else len(results) + 1
+            while question_num in results:
+                question_num += 1
+            last_result = results[question_num] = {
+                'question_id': question_ids[question_num - 1] if question_num <= len(question_ids) else f"q{question_num}",
+                'question_num': question_num,
+                'points': int(score.group(1)),
+                'max_points': int(score.group(2)),
+                'feedback': ''
+            }
+            current_num = None
+            feedback_for = None
+        elif question:
+            current_num = int(question.group(1))
+            feedback_for = None
+        elif feedback_for is not None:
+            if not line.strip() or line.startswith('##[') or line.startswith('::'):
+                feedback_for = None
+            else:
+                feedback_for['feedback'] += f"\n{line}"
+        elif last_result and FEEDBACK_LINE.match(line):
+            feedback_for = last_result
+            feedback_for['feedback'] = FEEDBACK_LINE.match(line).group(1)
+    
+    return [results[question_num] for question_num in sorted(results)]
+
+def classroom_points(value) -> float:
+    """Points from the Classroom API (sent as strings), kept whole when they are, e.g. 36 or 36.5"""
+    points = float(value or 0)
+    return int(points) if points.is_integer() else points
+
+def iter_archive_lines(fileobj) -> Iterator[str]:
+    """Yield log lines from a zipped Actions run-log archive, member by member.
+    
+    The archive holds one combined log per job at the top level plus the same
+    text split per step in sub-folders; only the combined logs are read.
+    """
+    with zipfile.ZipFile(fileobj) as archive:
+        names = [name for name in archive.namelist() if not name.endswith('/')]
+        top_level = [name for name in names if '/' not in name]
+        for name in sorted(top_level or names):
+            with archive.open(name) as member:
+                yield from io.TextIOWrapper(member, encoding='utf-8', errors='replace')
 
 class InstructorDashboard:
-    def __init__(self):
+    def __init__(self, api_url: Optional[str] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                 search_repos: bool = False, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 max_rate: float = DEFAULT_MAX_RATE, classroom_assignment_id: Optional[str] = None,
+                 gradebook_path: Optional[str] = None, uploads: Optional[str] = None,
+                 question_scores: bool = False, roster: Optional[str] = None):
         self.github_token = os.getenv('GITHUB_TOKEN')
         self.org_name = "your-github-classroom-org"  # Replace with your org
         self.assignment_name = "csci1436-assignment1"
+        self.api_url = api_url
+        self.concurrency = concurrency
+        self.search_repos = search_repos
+        self.cache_dir = cache_dir
+        self.max_rate = max_rate
+        # GitHub Classroom assignment ID (from the assignment's URL or GET /classrooms/{id}/assignments)
+        self.classroom_assignment_id = classroom_assignment_id or os.getenv('CLASSROOM_ASSIGNMENT_ID')
+        # Classroom grades only carry totals; per-question scores cost ~3 requests per student
+        self.question_scores = question_scores
+        
+        rubric = load_rubric('autograder')
+        self.question_ids = list(rubric.questions)
+        self.max_score = sum(rubric.max_points().values())
+        self.rubric_version = rubric.version
+        self.gradebook_path = gradebook_path
+        # Blackboard upload manifest or directory of Word files (see submission_index.py)
+        self.uploads = uploads
+        # Classroom roster CSV that maps GitHub logins to the names on Word uploads
+        self.roster_file = roster
+        self._client = None
+        self._gradebook = None
+        self._submission_index = None
+        # Student keys graded by the last run_dashboard(); exports are limited to them
+        self.roster = None
+    
+    @property
+    def client(self) -> GitHubClient:
+        """Shared connection-pooled GitHub client, created on first use"""
+        if self._client is None:
+            cache = ResponseCache(self.cache_dir) if self.cache_dir else None
+            self._client = GitHubClient(self.github_token, self.api_url, self.concurrency, cache=cache,
+                                        rate_limiter=RateLimiter(self.max_rate))
+        return self._client
+    
+    @property
+    def gradebook(self) -> Gradebook:
+        """Durable SQLite gradebook ($GRADEBOOK or gradebook.sqlite3), opened on first use"""
+        if self._gradebook is None:
+            self._gradebook = Gradebook(self.gradebook_path, owner=EXPORT_TARGET)
+        return self._gradebook
+    
+    @property
+    def submission_index(self) -> SubmissionIndex:
+        """Word uploads indexed once per run (--uploads, else blackboard_uploads.json, else this directory)"""
+        if self._submission_index is None:
+            source = self.uploads or (DEFAULT_UPLOADS_FILE if os.path.exists(DEFAULT_UPLOADS_FILE) else '.')
+            roster_file = self.roster_file or (DEFAULT_ROSTER_FILE if os.path.exists(DEFAULT_ROSTER_FILE) else None)
+            roster = {}
+            if roster_file:
+                try:
+                    roster = load_roster(roster_file)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Could not read the roster {roster_file} ({e}); matching uploads by name only")
+            try:
+                self._submission_index = SubmissionIndex.load(source, roster)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Could not read Word uploads from {source} ({e}); treating all as missing")
+                self._submission_index = SubmissionIndex([], source=source, roster=roster)
+        return self._submission_index
         
     def fetch_github_classroom_results(self) -> List[Dict]:
         """Fetch autograding results from GitHub Classroom"""
+        return list(self.iter_results())
+    
+    def iter_results(self) -> Iterator[Dict]:
+        """Yield autograding results as they arrive from GitHub Classroom"""
         if not self.github_token:
             print("⚠️ GITHUB_TOKEN not found. Using local files instead.")
-            return self.load_local_results()
+            yield from self.load_local_results()
+            return
         
-        headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
+        import requests  # Only for its HTTPError; GitHubClient does the actual loading
         
-        # Get all repositories for the assignment
-        url = f"https://api.github.com/orgs/{self.org_name}/repos"
-        response = requests.get(url, headers=headers)
+        results = None
+        if self.classroom_assignment_id:
+            try:
+                # The first row needs the grade totals and the first roster page, so an
+                # unavailable Classroom API shows up here, before anything is yielded
+                rows = self.iter_classroom_grades()
+                first = next(rows, None)
+                results = chain([first], rows) if first is not None else iter(())
+            except requests.HTTPError as e:
+                print(f"⚠️ Classroom API unavailable ({e.response.status_code}); crawling student repos instead")
         
-        if response.status_code != 200:
-            print(f"❌ Failed to fetch repositories: {response.status_code}")
-            return []
+        if results is None:
+            # Stream assignment repos page by page; per-repo fetches start immediately
+            results = self.client.imap(self.fetch_repo_result, self.iter_assignment_repos())
         
-        repos = response.json()
-        assignment_repos = [repo for repo in repos if self.assignment_name in repo['name']]
+        try:
+            # Results come back in roster order
+            for result in results:
+                if result is not None:
+                    result.setdefault('turnitin_submitted', self.check_turnitin_submission(result['student_name']))
+                    yield result
+        except requests.HTTPError as e:
+            print(f"❌ Failed to fetch repositories: {e.response.status_code}")
+            return
         
-        results = []
-        for repo in assignment_repos:
-            repo_name = repo['name']
-            student_name = repo_name.replace(f"{self.assignment_name}-", "")
-            
-            # Get latest commit autograding results
-            commits_url = f"https://api.github.com/repos/{self.org_name}/{repo_name}/commits"
-            commits_response = requests.get(commits_url, headers=headers)
+        budget = self.client.rate_limit()
+        if budget['remaining'] is not None:
+            print(f"🔑 GitHub API budget remaining: {budget['remaining']}/{budget['limit']}")
+    
+    def fetch_classroom_grades(self) -> List[Dict]:
+        """Fetch the whole roster's autograding points from the GitHub Classroom API"""
+        return list(self.iter_classroom_grades())
+    
+    def iter_classroom_grades(self) -> Iterator[Dict]:
+        """Yield the roster's autograding points from the GitHub Classroom API, in roster order.
+        
+        Uses the assignment-level grades and accepted-assignments endpoints instead
+        of listing every org repo, so the roster costs one request per page. Grades
+        only carry totals; with question_scores, each graded repo's autograding
+        check run is also fetched (concurrently) for per-question scores.
+        
+        The grade totals are read first (they are joined to the roster); rows are
+        then yielded as each page of accepted assignments arrives.
+        """
+        assignment_path = f"/assignments/{self.classroom_assignment_id}"
+        
+        grades = {}
+        for grade in self.client.paginate(f"{assignment_path}/grades"):
+            grades[grade['student_repository_name']] = grade
+        
+        def entries():
+            for accepted in self.client.paginate(f"{assignment_path}/accepted_assignments"):
+                repo_name = accepted['repository']['full_name'].split('/')[-1]
+                logins = ', '.join(student['login'] for student in accepted.get('students', []))
+                yield repo_name, grades.pop(repo_name, None), logins
             
-            if commits_response.status_code == 200:
-                commits = commits_response.json()
-                if commits:
-                    latest_commit = commits[0]
-                    
-                    # Get check runs for autograding
-                    check_runs_url = f"https://api.github.com/repos/{self.org_name}/{repo_name}/commits/{latest_commit['sha']}/check-runs"
-                    check_response = requests.get(check_runs_url, headers=headers)
-                    
-                    if check_response.status_code == 200:
-                        check_runs = check_response.json()
-                        autograding_results = self.parse_autograding_results(check_runs)
-                        
-                        results.append({
-                            'student_name': student_name,
-                            'repo_name': repo_name,
-                            'submission_time': latest_commit['commit']['committer']['date'],
-                            'autograding_results': autograding_results,
-                            'total_score': sum(result['points'] for result in autograding_results),
-                            'max_score': sum(result['max_points'] for result in autograding_results)
-                        })
+            # Graded repos missing from the accepted list (e.g. removed from the roster)
+            for repo_name, grade in list(grades.items()):
+                yield repo_name, grade, grade.get('github_username', '')
         
-        return results
+        if not self.question_scores:
+            for repo_name, grade, logins in entries():
+                yield self.classroom_result(repo_name, grade, logins)
+            return
+        
+        def with_question_scores(entry):
+            repo_name, grade, logins = entry
+            return self.classroom_result(repo_name, grade, logins,
+                                         self.fetch_question_scores(repo_name if grade else None))
+        
+        yield from self.client.imap(with_question_scores, entries())
+    
+    def classroom_result(self, repo_name: str, grade: Optional[Dict], logins: str,
+                         autograding_results: Optional[List[Dict]] = None) -> Dict:
+        """Build a dashboard result row from a Classroom grade (None if not yet graded)
+        and its per-question results"""
+        if grade is None:
+            return {
+                'student_name': logins or repo_name.replace(f"{self.assignment_name}-", ""),
+                'repo_name': repo_name,
+                'submission_time': '',
+                'autograding_results': [],
+                'total_score': 0,
+                'max_score': self.max_score
+            }
+        
+        return {
+            'student_name': grade.get('roster_identifier') or grade.get('github_username') or logins,
+            'repo_name': repo_name,
+            'submission_time': grade.get('submission_timestamp') or '',
+            'autograding_results': autograding_results or [],
+            'total_score': classroom_points(grade.get('points_awarded')),
+            'max_score': classroom_points(grade.get('points_available')) or self.max_score
+        }
+    
+    def iter_assignment_repos(self) -> Iterator[Dict]:
+        """Yield the assignment's repos as each page of the listing arrives"""
+        if self.search_repos:
+            # Server-side name filter; capped at 1,000 results and may lag new repos
+            query = f"{self.assignment_name} in:name org:{self.org_name} fork:true"
+            repos = self.client.paginate("/search/repositories", {'q': query}, items_key='items')
+        else:
+            repos = self.client.paginate(f"/orgs/{self.org_name}/repos", {'sort': 'full_name'})
+        
+        for repo in repos:
+            if self.assignment_name in repo['name']:
+                yield repo
+    
+    def fetch_autograding(self, repo_name: str) -> Optional[Tuple[Dict, List[Dict]]]:
+        """Fetch a student repo's latest commit and the per-question results of its autograding check run"""
+        # Get latest commit autograding results
+        commits = self.client.get_json(f"/repos/{self.org_name}/{repo_name}/commits")
+        if not commits:
+            return None
+        latest_commit = commits[0]
+        
+        # Get check runs for autograding
+        check_runs = self.client.get_json(
+            f"/repos/{self.org_name}/{repo_name}/commits/{latest_commit['sha']}/check-runs"
+        )
+        if check_runs is None:
+            return None
+        
+        return latest_commit, self.parse_autograding_results(check_runs, repo_name)
+    
+    def fetch_question_scores(self, repo_name: Optional[str]) -> List[Dict]:
+        """Per-question results behind a Classroom grade ([] if ungraded or unavailable; the total still stands)"""
+        import requests
+        
+        if repo_name is None:
+            return []
+        try:
+            fetched = self.fetch_autograding(repo_name)
+        except requests.RequestException as e:
+            print(f"⚠️ No per-question scores for {repo_name}: {e}")
+            return []
+        return fetched[1] if fetched else []
+    
+    def fetch_repo_result(self, repo: Dict) -> Optional[Dict]:
+        """Fetch the latest commit and its autograding check runs for one student repo"""
+        repo_name = repo['name']
+        student_name = repo_name.replace(f"{self.assignment_name}-", "")
+        
+        fetched = self.fetch_autograding(repo_name)
+        if fetched is None:
+            return None
+        latest_commit, autograding_results = fetched
+        if not autograding_results:
+            print(f"⚠️ No autograding scores for {repo_name}; scoring it out of the rubric total")
+        
+        return {
+            'student_name': student_name,
+            'repo_name': repo_name,
+            'submission_time': latest_commit['commit']['committer']['date'],
+            'autograding_results': autograding_results,
+            'total_score': sum(result['points'] for result in autograding_results),
+            # Nothing parsed (no score lines, logs expired): out of the rubric total, not 0
+            'max_score': sum(result['max_points'] for result in autograding_results) or self.max_score
+        }
     
     def load_local_results(self) -> List[Dict]:
         """Load results from local submission files (for testing)"""
@@ -114,38 +451,97 @@ class InstructorDashboard:
         
         return results
     
-    def parse_autograding_results(self, check_runs: Dict) -> List[Dict]:
+    def parse_autograding_results(self, check_runs: Dict, repo_name: Optional[str] = None) -> List[Dict]:
         """Parse GitHub Classroom autograding results"""
         results = []
         
         for check_run in check_runs.get('check_runs', []):
-            if check_run['name'] == 'Autograding':
-                # Parse the check run output for individual question scores
-                output = check_run.get('output', {}).get('text', '')
+            if 'autograding' in check_run['name'].lower():
+                # Scores usually appear in the check run output itself
+                output = check_run.get('output') or {}
+                text = "\n".join(part for part in (output.get('summary'), output.get('text')) if part)
+                results = parse_score_lines(text.splitlines(), self.question_ids)
                 
-                # This would need to be customized based on your autograding output format
-                # For now, return a placeholder
-                results = [
-                    {'question_id': 'q1_definitions', 'question_num': 1, 'points': 32, 'max_points': 40, 'feedback': 'Good definitions'},
-                    {'question_id': 'q2_high_level', 'question_num': 2, 'points': 10, 'max_points': 12, 'feedback': 'Missing some concepts'},
-                    {'question_id': 'q3_declarations', 'question_num': 3, 'points': 12, 'max_points': 12, 'feedback': 'Perfect syntax'},
-                    {'question_id': 'q4_modulo', 'question_num': 4, 'points': 9, 'max_points': 12, 'feedback': 'Some calculation errors'},
-                    {'question_id': 'q5_sphere_volume', 'question_num': 5, 'points': 10, 'max_points': 12, 'feedback': 'Good program structure'},
-                    {'question_id': 'q6_debugging', 'question_num': 6, 'points': 8, 'max_points': 12, 'feedback': 'Identified most issues'}
-                ]
+                # Otherwise stream them out of the job logs
+                if not results and repo_name:
+                    results = self.parse_job_logs(repo_name, check_run)
                 break
         
         return results
     
+    def parse_job_logs(self, repo_name: str, check_run: Dict) -> List[Dict]:
+        """Stream-parse scores from the Actions logs behind an autograding check run"""
+        repo_path = f"/repos/{self.org_name}/{repo_name}/actions"
+        
+        # Actions check runs share their ID with the job; job logs are plain text
+        response = self.client.stream(f"{repo_path}/jobs/{check_run['id']}/logs")
+        with response:
+            if response.status_code == 200:
+                # Logs are UTF-8; without a charset requests would assume ISO-8859-1 for text/plain
+                if 'charset' not in response.headers.get('Content-Type', '').lower():
+                    response.encoding = 'utf-8'
+                return parse_score_lines(response.iter_lines(decode_unicode=True), self.question_ids)
+        
+        # Fall back to the zipped logs of the whole workflow run
+        run_id = RUN_ID.search(check_run.get('details_url') or '')
+        if not run_id:
+            return []
+        
+        response = self.client.stream(f"{repo_path}/runs/{run_id.group(1)}/logs")
+        with response, tempfile.SpooledTemporaryFile(max_size=LOG_SPOOL_BYTES) as archive:
+            if response.status_code != 200:
+                return []
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                archive.write(chunk)
+            archive.seek(0)
+            try:
+                return parse_score_lines(iter_archive_lines(archive), self.question_ids)
+            except zipfile.BadZipFile:
+                return []
+    
+    def check_similarity(self) -> Tuple[List[Dict], Dict[str, str]]:
+        """Near-duplicate answer groups across the students' Word uploads (see similarity.py).
+        
+        Groups are keyed by upload path, so students who share a name stay apart;
+        also returns the label to show for each key. Needs numpy.
+        """
+        from similarity import cohort_report
+        
+        cohort = []
+        names = {}
+        for upload, answers in self.submission_index.answers():
+            cohort.append((upload['member'], answers))
+            names[upload['member']] = (f"{upload['student_name']} ({upload['username']})" if upload.get('username')
+                                       else upload['student_name'])
+        started = time.perf_counter()
+        report = cohort_report(cohort)
+        print(f"🔍 Compared answers of {len(cohort)} Word upload(s) in {time.perf_counter() - started:.2f} s")
+        return report, names
+    
     def check_turnitin_submission(self, student_name: str) -> bool:
-        """Check if student has submitted to Turnitin (placeholder)"""
-        # This would integrate with Turnitin API or check a tracking file
-        # For now, simulate random submissions
-        import random
-        return random.choice([True, False])
+        """Check if student has a verified Word upload for Turnitin (an index lookup)"""
+        return self.submission_index.submitted(student_name)
+    
+    def gradebook_row(self, result: Dict) -> Dict:
+        """Gradebook row for a dashboard result"""
+        return {
+            'student_id': result.get('student_id'),
+            'student_name': result['student_name'],
+            'submitted_at': result['submission_time'],
+            'total_earned': result['total_score'],
+            'total_possible': result['max_score'],
+            'turnitin_submitted': result.get('turnitin_submitted', False),
+            'questions': [
+                {'question_id': str(q_result['question_num']), 'points': q_result['points'],
+                 'max_points': q_result['max_points'], 'feedback': q_result['feedback']}
+                for q_result in result['autograding_results']
+            ]
+        }
     
-    def generate_grade_report(self, results: List[Dict]) -> pd.DataFrame:
+    def generate_grade_report(self, results: List[Dict]) -> 'pd.DataFrame':
         """Generate a comprehensive grade report"""
+        import pandas as pd  # Heavy; only this report needs it
+        
         report_data = []
         
         for result in results:
@@ -155,7 +551,7 @@ class InstructorDashboard:
                 'Submission Time': result['submission_time'],
                 'Total Score': result['total_score'],
                 'Max Score': result['max_score'],
-                'Percentage': f"{(result['total_score'] / result['max_score'] * 100):.1f}%",
+                'Percentage': f"{percent(result['total_score'], result['max_score']):.1f}%",
                 'Turnitin Submitted': '✅' if result.get('turnitin_submitted', False) else '❌'
             }
             
@@ -170,101 +566,202 @@ class InstructorDashboard:
     
     def generate_detailed_feedback(self, results: List[Dict]) -> None:
         """Generate detailed feedback for each student"""
+        for result in results:
+            self.write_feedback_report(result)
+    
+    def write_feedback_report(self, result: Dict) -> Dict:
+        """Write one student's feedback file; returns the result for chaining"""
         os.makedirs('feedback_reports', exist_ok=True)
         
-        for result in results:
-            student_name = result['student_name']
-            filename = f"feedback_reports/{student_name.replace(' ', '_')}_feedback.txt"
+        student_name = result['student_name']
+        filename = f"feedback_reports/{student_name.replace(' ', '_')}_feedback.txt"
+        
+        with open(filename, 'w') as f:
+            f.write(f"CSCI 1436 Programming Fundamentals I - Assignment #1\n")
+            f.write(f"Student: {student_name}\n")
+            f.write(f"Submission Time: {result['submission_time']}\n")
+            f.write(f"Total Score: {result['total_score']}/{result['max_score']} ({percent(result['total_score'], result['max_score']):.1f}%)\n")
+            f.write("=" * 60 + "\n\n")
             
-            with open(filename, 'w') as f:
-                f.write(f"CSCI 1436 Programming Fundamentals I - Assignment #1\n")
-                f.write(f"Student: {student_name}\n")
-                f.write(f"Submission Time: {result['submission_time']}\n")
-                f.write(f"Total Score: {result['total_score']}/{result['max_score']} ({(result['total_score'] / result['max_score'] * 100):.1f}%)\n")
-                f.write("=" * 60 + "\n\n")
-                
-                for q_result in result['autograding_results']:
-                    f.write(f"Question {q_result['question_num']}: {q_result['points']}/{q_result['max_points']} points\n")
-                    f.write(f"Feedback: {q_result['feedback']}\n\n")
-                
-                f.write("Turnitin Submission: ")
-                f.write("✅ Submitted" if result.get('turnitin_submitted', False) else "❌ Not Found")
-                f.write("\n\n")
-                
-                # Add improvement suggestions
-                f.write("Suggestions for Improvement:\n")
-                f.write("- Review concepts for questions with lower scores\n")
-                f.write("- Practice coding syntax and debugging\n")
-                f.write("- Ensure complete definitions for terminology questions\n")
-    
-    def export_to_lms(self, df: pd.DataFrame, format: str = 'csv') -> str:
-        """Export grades in LMS-compatible format"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            for q_result in result['autograding_results']:
+                f.write(f"Question {q_result['question_num']}: {q_result['points']}/{q_result['max_points']} points\n")
+                f.write(f"Feedback: {q_result['feedback']}\n\n")
+            
+            f.write("Turnitin Submission: ")
+            f.write("✅ Submitted" if result.get('turnitin_submitted', False) else "❌ Not Found")
+            f.write("\n\n")
+            
+            # Add improvement suggestions
+            f.write("Suggestions for Improvement:\n")
+            f.write("- Review concepts for questions with lower scores\n")
+            f.write("- Practice coding syntax and debugging\n")
+            f.write("- Ensure complete definitions for terminology questions\n")
         
-        if format == 'csv':
-            filename = f"grades_export_{timestamp}.csv"
-            df.to_csv(filename, index=False)
-        elif format == 'excel':
-            filename = f"grades_export_{timestamp}.xlsx"
-            df.to_excel(filename, index=False)
-        else:
-            raise ValueError("Format must be 'csv' or 'excel'")
+        return result
+    
+    def export_to_lms(self, formats: Iterable[str] = ('csv',), delta: bool = False) -> Optional[Dict]:
+        """Stream the gradebook to LMS-compatible files in one pass (no DataFrame).
         
-        return filename
+        Only students graded by the last run_dashboard() are exported, if it ran.
+        Returns the export manifest, or None if there was nothing to export.
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        basename = f"grades_export_{'delta_' if delta else ''}{timestamp}"
+        formats = [EXPORT_FORMAT_ALIASES.get(export_format, export_format) for export_format in formats]
+        return export_gradebook(self.gradebook, EXPORT_TARGET, formats, basename, len(self.question_ids),
+                                self.max_score, include_turnitin=True, delta=delta, roster=self.roster)
     
-    def run_dashboard(self, export_format: str = 'csv'):
-        """Main dashboard function"""
+    def run_dashboard(self, export_formats: Iterable[str] = ('csv',), delta: bool = False, similarity: bool = False):
+        """Main dashboard function (delta exports only students whose scores changed since the last export;
+        similarity flags near-duplicate answers in the Word uploads)
+        
+        Grading runs as a pipeline: fetch/parse → feedback files → gradebook. The
+        first two stages run on their own threads joined by bounded queues, and
+        the gradebook records rows on this thread in small batches as they arrive.
+        Stages overlap, a slow stage holds the others back, and at most a few
+        queues' worth of results are in memory (plus each student's name, for the
+        upload report). Exports run once the gradebook is up to date: they are
+        queries over it, streamed to every format in one pass, so --delta can
+        compare with the last export.
+        """
         print("🎓 CSCI 1436 Assignment #1 - Instructor Dashboard")
         print("=" * 60)
         
-        # Fetch results
         print("📊 Fetching autograding results...")
-        results = self.fetch_github_classroom_results()
+        uploads = self.submission_index
+        print(f"🗂️ Indexed {sum(len(found) for found in uploads.by_student.values())} Word upload(s) from {uploads.source}")
         
-        if not results:
+        similarity_report, names, flags = None, {}, {}
+        if similarity:
+            from similarity import student_flags
+            similarity_report, names = self.check_similarity()
+            flags = student_flags(similarity_report, names)
+        print("\n📊 Individual Grades:")
+        
+        results = buffered(self.iter_results(), PIPELINE_DEPTH)
+        results = buffered((self.write_feedback_report(result) for result in results), PIPELINE_DEPTH)
+        
+        stats = {'count': 0, 'total': 0, 'highest': None, 'lowest': None, 'max_score': 0, 'turnitin': 0}
+        students = []
+        roster = self.roster = set()
+        
+        def tally(results):
+            for result in results:
+                score = result['total_score']
+                stats['count'] += 1
+                stats['total'] += score
+                stats['highest'] = score if stats['highest'] is None else max(stats['highest'], score)
+                stats['lowest'] = score if stats['lowest'] is None else min(stats['lowest'], score)
+                stats['max_score'] = max(stats['max_score'], result['max_score'])
+                stats['turnitin'] += bool(result.get('turnitin_submitted', False))
+                students.append(result['student_name'])
+                
+                question_scores = '  '.join(
+                    f"Q{q_result['question_num']} {q_result['points']}/{q_result['max_points']}"
+                    for q_result in result['autograding_results']
+                )
+                print(f"📚 {result['student_name']}: {score}/{result['max_score']}  {question_scores}".rstrip())
+                for upload in uploads.uploads(result['student_name']):
+                    for flag in flags.get(upload['member'], []):
+                        print(f"   🚩 Similar answer: {flag}")
+                row = self.gradebook_row(result)
+                roster.add(row_key(row))
+                yield row
+        
+        # The gradebook (and its SQLite connection) stays on this thread; small
+        # batches commit as results arrive
+        run = self.gradebook.start_run('instructor_dashboard', self.rubric_version)
+        changed = self.gradebook.record(run, tally(results), batch_size=PIPELINE_RECORD_BATCH)
+        self.gradebook.finish_run(run)
+        
+        if not stats['count']:
             print("❌ No results found. Make sure students have submitted their assignments.")
             return
         
-        print(f"✅ Found {len(results)} submissions")
-        
-        # Generate reports
-        print("📋 Generating grade report...")
-        df = self.generate_grade_report(results)
+        print(f"\n✅ Found {stats['count']} submissions")
+        print(f"🗄️ Gradebook updated: {changed} student(s) changed ({self.gradebook.path})")
+        print("📝 Detailed feedback written to 'feedback_reports'")
         
         # Display summary
         print("\n📈 Grade Summary:")
-        print(f"Total Submissions: {len(results)}")
-        print(f"Average Score: {df['Total Score'].mean():.1f}/{df['Max Score'].iloc[0]}")
-        print(f"Highest Score: {df['Total Score'].max()}")
-        print(f"Lowest Score: {df['Total Score'].min()}")
-        
-        turnitin_count = sum(1 for result in results if result.get('turnitin_submitted', False))
-        print(f"Turnitin Submissions: {turnitin_count}/{len(results)}")
+        print(f"Total Submissions: {stats['count']}")
+        print(f"Average Score: {stats['total'] / stats['count']:.1f}/{stats['max_score']}")
+        print(f"Highest Score: {stats['highest']}")
+        print(f"Lowest Score: {stats['lowest']}")
+        print(f"Turnitin Submissions: {stats['turnitin']}/{stats['count']}")
+        print_report(uploads.report(students))
         
-        # Display grade table
-        print("\n📊 Individual Grades:")
-        print(df.to_string(index=False))
-        
-        # Generate detailed feedback
-        print("\n📝 Generating detailed feedback reports...")
-        self.generate_detailed_feedback(results)
+        if similarity_report is not None:
+            from similarity import print_report as print_similarity_report
+            print()
+            print_similarity_report(similarity_report, names=names)
         
-        # Export grades
-        export_file = self.export_to_lms(df, export_format)
-        print(f"💾 Grades exported to: {export_file}")
+        # Export grades (streamed from the gradebook)
+        manifest = self.export_to_lms(export_formats, delta)
+        if manifest is None:
+            print("✅ No grade changes since the last export - nothing to upload")
+        else:
+            for export_file in manifest['files']:
+                print(f"💾 Grades exported to: {export_file}")
+            if delta:
+                print(f"🧾 Delta: {manifest['new_students']} new, {manifest['changed_students']} changed "
+                      f"(manifest: {manifest['manifest_file']})")
         
         print("\n✅ Dashboard complete!")
         print("📁 Check the 'feedback_reports' folder for individual student feedback")
 
 def main():
     parser = argparse.ArgumentParser(description='Instructor Dashboard for CSCI 1436 Assignment #1')
-    parser.add_argument('--format', choices=['csv', 'excel'], default='csv',
-                       help='Export format for grades (default: csv)')
+    parser.add_argument('--format', nargs='+', choices=['csv', 'excel', 'report', 'blackboard', 'canvas', 'xlsx'],
+                       default=['csv'],
+                       help='Export formats, written in one pass; csv and excel write the original grade report, '
+                            'blackboard/canvas/xlsx the LMS import layouts (default: csv)')
+    parser.add_argument('--api-url', default=None,
+                       help='GitHub API base URL (default: $GITHUB_API_URL or https://api.github.com)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help=f'Concurrent GitHub requests (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--search-repos', action='store_true',
+                       help='Find assignment repos with the search API instead of listing the whole org')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                       help=f'Directory for cached GitHub responses (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Disable conditional-request caching of GitHub responses')
+    parser.add_argument('--assignment-id', default=None,
+                       help='GitHub Classroom assignment ID for bulk grade retrieval '
+                            '(default: $CLASSROOM_ASSIGNMENT_ID; falls back to crawling repos)')
+    parser.add_argument('--question-scores', action='store_true',
+                       help='With --assignment-id, also fetch each graded repo\'s check run for per-question '
+                            'scores (about 3 requests per student instead of one per roster page)')
+    parser.add_argument('--max-rate', type=float, default=DEFAULT_MAX_RATE,
+                       help=f'Maximum GitHub requests per second (default: {DEFAULT_MAX_RATE:g})')
+    parser.add_argument('--delta', action='store_true',
+                       help='Export only students whose scores changed since the last export, plus a manifest')
+    parser.add_argument('--uploads', default=None,
+                       help=f'Blackboard upload manifest or directory of Assignment1_*.docx files '
+                            f'(default: {DEFAULT_UPLOADS_FILE} if present, else the current directory)')
+    parser.add_argument('--roster', default=None,
+                       help=f'GitHub Classroom roster CSV mapping GitHub logins to the names on Word uploads '
+                            f'(default: {DEFAULT_ROSTER_FILE} if present; without it GitHub results only match '
+                            f'uploads when named "First Last")')
+    parser.add_argument('--similarity', action='store_true',
+                       help='Flag near-duplicate answers across the Word uploads (needs numpy)')
+    parser.add_argument('--gradebook', default=None,
+                       help=f'SQLite gradebook file (default: $GRADEBOOK or {DEFAULT_GRADEBOOK_FILE})')
     
     args = parser.parse_args()
     
-    dashboard = InstructorDashboard()
-    dashboard.run_dashboard(args.format)
+    dashboard = InstructorDashboard(api_url=args.api_url, concurrency=args.concurrency,
+                                    search_repos=args.search_repos,
+                                    cache_dir=None if args.no_cache else args.cache_dir,
+                                    max_rate=args.max_rate, classroom_assignment_id=args.assignment_id,
+                                    gradebook_path=args.gradebook, uploads=args.uploads,
+                                    question_scores=args.question_scores, roster=args.roster)
+    try:
+        dashboard.gradebook
+    except GradebookError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    dashboard.run_dashboard(args.format, args.delta, args.similarity)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Multi-keyword matching for the CSCI 1436 autograders
+Compiles keyword tables once into an Aho-Corasick automaton so every keyword
+hit in an answer is found in a single pass over the text.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+class KeywordMatcher:
+    """Aho-Corasick automaton reporting which keywords occur in a text"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [set()]
+
+        for keyword in keywords:
+            if keyword and keyword not in self.keywords:
+                self._add(keyword)
+        self._build_failure_links()
+
+    def _add(self, keyword: str) -> None:
+        """Insert a keyword into the trie"""
+        index = len(self.keywords)
+        self.keywords.append(keyword)
+
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].add(index)
+
+    def _build_failure_links(self) -> None:
+        """Breadth-first pass linking each state to its longest proper suffix"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+
+                # A match ending here also ends every suffix keyword
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """Return every keyword that occurs as a substring of text"""
+        return {self.keywords[index] for index in self.find_indices(text)}
+
+    def find_indices(self, text: str) -> Set[int]:
+        """Like find(), but as positions in self.keywords"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+
+        return found
+
+class KeywordTable:
+    """Named keyword groups sharing one automaton"""
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        self.groups = {name: list(keywords) for name, keywords in groups.items()}
+        self.matcher = KeywordMatcher(
+            keyword for keywords in self.groups.values() for keyword in keywords
+        )
+
+    def matches(self, text: str) -> Dict[str, List[str]]:
+        """Scan text once and return the keywords hit for each group, in table order"""
+        found = self.matcher.find(text)
+        return {
+            name: [keyword for keyword in keywords if keyword in found]
+            for name, keywords in self.groups.items()
+        }
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Streaming LMS exports for the CSCI 1436 dashboards
+Writes gradebook rows (see gradebook.py) to one or more sinks in a single pass:
+Blackboard CSV, Canvas CSV, a write-only XLSX workbook and the instructor
+dashboard's original grade report (totals first, "points/max" per question,
+Turnitin status) as CSV or XLSX. Rows are written as
+they arrive and never collected, so memory stays flat however big the class is.
+Each file is written beside its final name and swapped in when complete.
+"""
+
+import csv
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from itertools import chain
+from typing import Dict, Iterable, List, Optional
+
+ASSIGNMENT_TITLE = "CSCI 1436 Assignment #1"
+EXPORT_FORMATS = ('blackboard', 'canvas', 'xlsx', 'report', 'report_xlsx')
+
+def format_submission_date(submitted_at: Optional[str]) -> str:
+    """ISO timestamp as shown in the gradebook (blank if unknown)"""
+    if not submitted_at:
+        return ''
+    try:
+        return datetime.fromisoformat(submitted_at.replace('Z', '+00:00')).strftime('%m/%d/%Y %I:%M %p')
+    except ValueError:
+        return submitted_at
+
+def percent(points, max_points) -> float:
+    return (points / max_points) * 100 if max_points else 0.0
+
+class GradeSink(ABC):
+    """One export file; subclasses define the layout"""
+
+    suffix = '.csv'
+    blank = ''
+
+    def __init__(self, basename: str, question_count: int, points_possible: Optional[float] = None,
+                 include_turnitin: bool = False):
+        self.filename = f"{basename}{self.suffix}"
+        self.temp_filename = f"{self.filename}.tmp"
+        self.question_count = question_count
+        self.points_possible = points_possible
+        self.include_turnitin = include_turnitin
+
+    def open(self) -> None:
+        self.file = open(self.temp_filename, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        for header_row in self.header():
+            self.writer.writerow(header_row)
+
+    @abstractmethod
+    def header(self) -> List[List]:
+        """Rows written before the first student"""
+
+    def write(self, row: Dict) -> None:
+        self.writer.writerow(self.cells(row))
+
+    @abstractmethod
+    def cells(self, row: Dict) -> List:
+        """One student's cells"""
+
+    def close(self) -> str:
+        self.file.close()
+        os.replace(self.temp_filename, self.filename)
+        return self.filename
+
+    def abort(self) -> None:
+        self.file.close()
+        os.remove(self.temp_filename)
+
+class BlackboardCSV(GradeSink):
+    """Per-question scores plus totals, one row per student"""
+
+    def header(self) -> List[List]:
+        columns = ['Student Name', 'Student ID', 'Submission Date']
+        for number in range(1, self.question_count + 1):
+            columns += [f'Q{number} Score', f'Q{number} Max', f'Q{number} Percent']
+        columns += ['Total Score', 'Total Possible', 'Final Percentage']
+        if self.include_turnitin:
+            columns.append('Turnitin Submitted')
+        return [columns]
+
+    def percent_cell(self, points, max_points):
+        return f"{percent(points, max_points):.1f}%"
+
+    def cells(self, row: Dict) -> List:
+        cells = [row['student_name'], row['student_id'] or 'N/A', format_submission_date(row['submitted_at'])]
+
+        questions = row['questions'][:self.question_count]
+        for question in questions:
+            cells += [question['points'], question['max_points'],
+                      self.percent_cell(question['points'], question['max_points'])]
+        # Questions without a parsed score stay blank
+        cells += [self.blank] * (3 * (self.question_count - len(questions)))
+
+        cells += [row['total_earned'], row['total_possible'],
+                  self.percent_cell(row['total_earned'], row['total_possible'])]
+        if self.include_turnitin:
+            cells.append('Yes' if row.get('turnitin_submitted') else 'No')
+        return cells
+
+class CanvasCSV(GradeSink):
+    """Canvas gradebook import: one assignment column keyed by SIS User ID"""
+
+    suffix = '_canvas.csv'
+
+    def header(self) -> List[List]:
+        header = [['Student', 'ID', 'SIS User ID', 'SIS Login ID', 'Section', ASSIGNMENT_TITLE]]
+        if self.points_possible is not None:
+            header.append(['Points Possible', '', '', '', '', self.points_possible])
+        return header
+
+    def cells(self, row: Dict) -> List:
+        return [row['student_name'], '', row['student_id'] or '', '', '', row['total_earned']]
+
+class WorkbookSink:
+    """Streams a sink's layout into a write-only Excel workbook (needs openpyxl); mix in before the layout"""
+
+    suffix = '.xlsx'
+    blank = None
+
+    def open(self) -> None:
+        from openpyxl import Workbook  # Only needed when an XLSX export is requested
+
+        # Write-only workbooks stream rows to a temporary file instead of holding cells
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet('Grades')
+        for header_row in self.header():
+            self.sheet.append(header_row)
+
+    def write(self, row: Dict) -> None:
+        self.sheet.append(self.cells(row))
+
+    def close(self) -> str:
+        self.workbook.save(self.temp_filename)
+        os.replace(self.temp_filename, self.filename)
+        return self.filename
+
+    def abort(self) -> None:
+        self.workbook.close()
+
+class XLSXWorkbook(WorkbookSink, BlackboardCSV):
+    """Blackboard layout as a streaming write-only Excel workbook"""
+
+    def percent_cell(self, points, max_points):
+        # Numeric percentages sort properly in Excel
+        return round(percent(points, max_points), 1)
+
+class GradeReportCSV(GradeSink):
+    """The instructor dashboard's original CSV report: totals, Turnitin status, then "points/max" per question"""
+
+    def header(self) -> List[List]:
+        return [['Student Name', 'Student ID', 'Submission Time', 'Total Score', 'Max Score', 'Percentage',
+                 'Turnitin Submitted'] + [f'Q{number} Score' for number in range(1, self.question_count + 1)]]
+
+    def cells(self, row: Dict) -> List:
+        cells = [row['student_name'], row['student_id'] or 'N/A', row['submitted_at'] or '',
+                 row['total_earned'], row['total_possible'],
+                 f"{percent(row['total_earned'], row['total_possible']):.1f}%",
+                 '✅' if row.get('turnitin_submitted') else '❌']
+        questions = row['questions'][:self.question_count]
+        cells += [f"{question['points']}/{question['max_points']}" for question in questions]
+        return cells + [self.blank] * (self.question_count - len(questions))
+
+class GradeReportXLSX(WorkbookSink, GradeReportCSV):
+    """The original grade report as an Excel workbook (the instructor dashboard's --format excel)"""
+
+SINKS = {'blackboard': BlackboardCSV, 'canvas': CanvasCSV, 'xlsx': XLSXWorkbook, 'report': GradeReportCSV,
+         'report_xlsx': GradeReportXLSX}
+
+def export_rows(rows: Iterable[Dict], formats: Iterable[str], basename: str, question_count: int,
+                points_possible: Optional[float] = None, include_turnitin: bool = False) -> List[str]:
+    """Stream rows into every requested format at once; returns the files written.
+
+    If writing fails part-way, no partial file replaces an earlier export.
+    """
+    sinks, filenames = [], set()
+    for export_format in formats:
+        if export_format not in SINKS:
+            raise ValueError(f"Unknown export format: {export_format} (choose from {', '.join(EXPORT_FORMATS)})")
+        sink = SINKS[export_format](basename, question_count, points_possible, include_turnitin)
+        # Layouts sharing an extension (report and blackboard are both .csv): later ones are named by format
+        if sink.filename in filenames:
+            sink = SINKS[export_format](f"{basename}_{export_format}", question_count, points_possible,
+                                        include_turnitin)
+        filenames.add(sink.filename)
+        sinks.append(sink)
+
+    opened = []
+    try:
+        for sink in sinks:
+            sink.open()
+            opened.append(sink)
+        for row in rows:
+            for sink in sinks:
+                sink.write(row)
+    except BaseException:
+        for sink in opened:
+            sink.abort()
+        raise
+
+    return [sink.close() for sink in sinks]
+
+def export_gradebook(gradebook, target: str, formats: Iterable[str], basename: str, question_count: int,
+                     points_possible: Optional[float] = None, include_turnitin: bool = False,
+                     delta: bool = False, roster: Optional[Iterable[str]] = None) -> Optional[Dict]:
+    """Stream a gradebook export (or, with delta, only unexported changes) to every format.
+
+    With roster (student keys), only those students are exported, e.g. the ones
+    graded in the current run rather than everyone the gradebook has ever seen.
+
+    Returns the export manifest, or None when there is nothing to export. Delta
+    exports also write the manifest to <basename>.manifest.json.
+    """
+    from gradebook import write_export_manifest
+
+    export = gradebook.start_export(target, delta, roster)
+    try:
+        rows = export.rows()
+        first = next(rows, None)
+        if first is None:
+            export.abort()
+            return None
+        files = export_rows(chain([first], rows), formats, basename, question_count,
+                            points_possible, include_turnitin)
+    except BaseException:
+        export.abort()
+        raise
+
+    manifest = export.finish(files)
+    if delta:
+        manifest['manifest_file'] = write_export_manifest(manifest, f"{basename}.manifest.json")
+    return manifest
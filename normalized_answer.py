@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Normalized answer text shared by the CSCI 1436 graders
+Each answer is normalized once per submission: Unicode NFKC (so full-width
+letters, ligatures and non-breaking spaces read as plain text) with runs of
+whitespace collapsed to one space. The case-folded and no-space variants and
+the word counts are derived from that once, and every rubric question, the
+grade cache and the cohort grader read the same view.
+
+Rubric keywords go through the same normalization when a rubric is compiled
+(see rubric.py), so a keyword typed with odd spacing or case still matches.
+"""
+
+import unicodedata
+from functools import cached_property
+from typing import Union
+
+def normalize_text(text: str) -> str:
+    """NFKC with whitespace runs collapsed to one space and trimmed"""
+    return ' '.join(unicodedata.normalize('NFKC', text).split())
+
+def normalize_keyword(keyword: str, fold: bool = True) -> str:
+    """A rubric keyword in the form it is matched against answer text"""
+    keyword = normalize_text(keyword)
+    return keyword.casefold() if fold else keyword
+
+class NormalizedAnswer:
+    """One answer, normalized once for every grader that reads it"""
+
+    def __init__(self, raw: str):
+        self.raw = raw or ''
+        words = unicodedata.normalize('NFKC', self.raw).split()
+        self.text = ' '.join(words)        # Case kept, for code questions
+        self.folded = self.text.casefold()
+        self.word_count = len(words)
+
+    @cached_property
+    def no_space(self) -> str:
+        """Case-folded text with no whitespace at all"""
+        return self.folded.replace(' ', '')
+
+    def view(self, fold: bool) -> str:
+        """Text a question matches against: folded, or case-preserving"""
+        return self.folded if fold else self.text
+
+def normalize(answer: Union[str, NormalizedAnswer, None]) -> NormalizedAnswer:
+    """The normalized view of an answer (views pass through unchanged)"""
+    return answer if isinstance(answer, NormalizedAnswer) else NormalizedAnswer(answer)
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Declarative rubrics for the CSCI 1436 autograders
+Rubric files in rubrics/ describe keyword groups, regex patterns, thresholds
+and point weights. They are compiled from JSON into matcher objects once per
+process. Nothing compiled is read back from disk: the autograder runs inside
+students' checkouts, where a cached pickle could be planted.
+
+Rubric format (JSON):
+
+    {
+      "name": "...",
+      "questions": {
+        "<question_id>": {
+          "max_points": 12,
+          "lowercase": true,                # match against the lowercased answer
+          "mention": "ignore_spaces",       # optional gate on the group name:
+                                            #   "exact", "ignore_spaces" or "any_word"
+          "tiers": [{"min_hits": 2, "points": 4, "feedback": "..."}],
+          "per_hit": 1,                     # alternative to tiers
+          "hit": "...", "miss": "...", "unmentioned": "...",
+          "bonus": {"min_words": 20, "points": 2},
+          "summary": "Found concepts: {found}",
+          "groups": [
+            {"name": "repl", "keywords": ["read", "eval"]},
+            {"name": "double length = 23.6", "patterns": ["double\\s+length"]}
+          ]
+        }
+      }
+    }
+
+Question-level "tiers", "per_hit", "hit", "miss" and "unmentioned" are defaults
+that any group may override. Feedback strings may use {name}, {NAME} and
+{keywords}; the summary may use {found}.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+from keyword_matcher import KeywordTable
+from normalized_answer import normalize, normalize_keyword
+
+RUBRIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rubrics')
+
+# Bump when matching semantics change; grade_cache keys include it so old
+# cached grades are ignored
+COMPILER_VERSION = 2
+
+GROUP_DEFAULTS = ('tiers', 'per_hit', 'hit', 'miss', 'unmentioned')
+
+class RubricError(ValueError):
+    """Raised when a rubric file is malformed"""
+
+def _mention_keywords(name: str, mode: str) -> List[str]:
+    """Keywords that count as mentioning a group name"""
+    if mode == 'exact':
+        return [name]
+    if mode == 'ignore_spaces':
+        return [name.replace(' ', '')]
+    if mode == 'any_word':
+        return name.split()
+    raise RubricError(f"Unknown mention mode: {mode}")
+
+def _fill(template: Optional[str], group: Dict) -> str:
+    """Expand feedback placeholders for a group"""
+    if not template:
+        return ""
+    return (template.replace('{NAME}', group['name'].upper())
+                    .replace('{name}', group['name'])
+                    .replace('{keywords}', ', '.join(group.get('keywords', []))))
+
+def _hit_matrix(matcher, texts: List[str]):
+    """Answers x keywords boolean matrix, one automaton pass per answer"""
+    import numpy as np
+
+    hits = np.zeros((len(texts), len(matcher.keywords)), dtype=bool)
+    for row, text in enumerate(texts):
+        found = matcher.find_indices(text)
+        if found:
+            hits[row, list(found)] = True
+    return hits
+
+class CompiledQuestion:
+    """One rubric question with its matchers built and ready to run"""
+
+    def __init__(self, question_id: str, spec: Dict):
+        if 'groups' not in spec or 'max_points' not in spec:
+            raise RubricError(f"{question_id}: 'groups' and 'max_points' are required")
+
+        self.question_id = question_id
+        self.title = spec.get('title', question_id)
+        self.max_points = spec['max_points']
+        self.lowercase = spec.get('lowercase', True)
+        self.mention = spec.get('mention')
+        self.bonus = spec.get('bonus')
+        self.summary = spec.get('summary')
+
+        self.groups = []
+        for group_spec in spec['groups']:
+            group = {key: spec[key] for key in GROUP_DEFAULTS if key in spec}
+            group.update(group_spec)
+            if 'tiers' not in group and 'per_hit' not in group:
+                raise RubricError(f"{question_id}/{group['name']}: needs 'tiers' or 'per_hit'")
+            group['tiers'] = sorted(group.get('tiers', []), key=lambda tier: -tier['min_hits'])
+            self.groups.append(group)
+
+        # Keywords are normalized like the answers they are matched against
+        keyword_groups = {
+            index: [normalize_keyword(keyword, self.lowercase) for keyword in group['keywords']]
+            for index, group in enumerate(self.groups) if 'keywords' in group
+        }
+        self.keywords = KeywordTable(keyword_groups) if keyword_groups else None
+
+        flags = 0
+        for flag in spec.get('flags', []):
+            flags |= getattr(re, flag)
+        self.patterns = {
+            index: [re.compile(pattern, flags) for pattern in group['patterns']]
+            for index, group in enumerate(self.groups) if 'patterns' in group
+        }
+
+        self.mentions = None
+        if self.mention:
+            self.mentions = KeywordTable({
+                index: _mention_keywords(normalize_keyword(group['name'], self.lowercase), self.mention)
+                for index, group in enumerate(self.groups)
+            })
+
+    def _mention_text(self, answer) -> str:
+        """Text of a NormalizedAnswer that the group-name gate is matched against"""
+        if self.mention != 'ignore_spaces':
+            return answer.view(self.lowercase)
+        return answer.no_space if self.lowercase else answer.text.replace(' ', '')
+
+    def grade(self, answer) -> Dict:
+        """Score an answer (text or NormalizedAnswer) and return points, feedback and the groups found"""
+        answer = normalize(answer)
+        text = answer.view(self.lowercase)
+
+        keyword_hits = self.keywords.matches(text) if self.keywords else {}
+        mentioned = self.mentions.matches(self._mention_text(answer)) if self.mentions else None
+
+        points = 0
+        found = []
+        lines = []
+
+        for index, group in enumerate(self.groups):
+            if mentioned is not None and not mentioned[index]:
+                lines.append(_fill(group.get('unmentioned'), group))
+                continue
+
+            if index in self.patterns:
+                hits = sum(1 for pattern in self.patterns[index] if pattern.search(text))
+            else:
+                hits = len(keyword_hits[index])
+
+            earned, feedback = 0, group.get('miss')
+            if 'per_hit' in group:
+                earned = group['per_hit'] * hits
+                if hits:
+                    feedback = group.get('hit')
+            else:
+                for tier in group['tiers']:
+                    if hits >= tier['min_hits']:
+                        earned = tier['points']
+                        feedback = tier.get('feedback', group.get('hit'))
+                        break
+
+            points += earned
+            if earned:
+                found.append(group['name'])
+            lines.append(_fill(feedback, group))
+
+        if self.bonus and answer.word_count >= self.bonus['min_words']:
+            points += self.bonus['points']
+
+        if self.summary:
+            feedback_text = self.summary.replace('{found}', ', '.join(found))
+        else:
+            feedback_text = "\n".join(line for line in lines if line)
+
+        return {
+            'points': min(points, self.max_points),
+            'max_points': self.max_points,
+            'feedback': feedback_text,
+            'found': found
+        }
+
+    def grade_cohort(self, answers: List) -> Dict:
+        """Score many answers at once with NumPy; points and found groups match grade().
+
+        Each answer is normalized once and scanned once by the compiled
+        keyword automaton (once more for the group-name gate); NumPy only does
+        the scoring. Returns 'points' (per answer), 'found' (answers x groups),
+        'keyword_hits' (answers x keywords) and 'keywords', the column labels
+        of keyword_hits.
+        """
+        import numpy as np  # Only cohort grading needs numpy
+
+        answers = [normalize(answer) for answer in answers]
+        texts = [answer.view(self.lowercase) for answer in answers]
+        count = len(texts)
+
+        keywords = self.keywords.matcher.keywords if self.keywords else []
+        if self.keywords:
+            keyword_hits = _hit_matrix(self.keywords.matcher, texts)
+        else:
+            keyword_hits = np.zeros((count, 0), dtype=bool)
+        keyword_index = {keyword: index for index, keyword in enumerate(keywords)}
+
+        mentioned = np.ones((count, len(self.groups)), dtype=bool)
+        if self.mentions:
+            matcher = self.mentions.matcher
+            mention_texts = texts
+            if self.mention == 'ignore_spaces':
+                mention_texts = [self._mention_text(answer) for answer in answers]
+            mention_hits = _hit_matrix(matcher, mention_texts)
+            mention_index = {word: index for index, word in enumerate(matcher.keywords)}
+            for index, words in self.mentions.groups.items():
+                columns = [mention_index[word] for word in words if word]
+                mentioned[:, index] = mention_hits[:, columns].any(axis=1)
+
+        earned = np.zeros((count, len(self.groups)))
+        for index, group in enumerate(self.groups):
+            if index in self.patterns:
+                hits = np.array([sum(1 for pattern in self.patterns[index] if pattern.search(text))
+                                 for text in texts], dtype=np.int64)
+            else:
+                # Listed keywords count once each, as in KeywordTable.matches()
+                group_keywords = self.keywords.groups.get(index, []) if self.keywords else []
+                columns = [keyword_index[keyword] for keyword in group_keywords if keyword]
+                hits = keyword_hits[:, columns].sum(axis=1)
+
+            if 'per_hit' in group:
+                earned[:, index] = group['per_hit'] * hits
+            elif group['tiers']:
+                # Tiers are sorted highest first, so the first one reached wins
+                earned[:, index] = np.select([hits >= tier['min_hits'] for tier in group['tiers']],
+                                             [tier['points'] for tier in group['tiers']], 0)
+        earned[~mentioned] = 0
+
+        points = earned.sum(axis=1)
+        if self.bonus:
+            words = np.fromiter((answer.word_count for answer in answers), dtype=np.int64, count=count)
+            points += np.where(words >= self.bonus['min_words'], self.bonus['points'], 0)
+
+        return {
+            'points': np.minimum(points, self.max_points),
+            'found': earned != 0,
+            'keyword_hits': keyword_hits,
+            'keywords': keywords
+        }
+
+class CompiledRubric:
+    """All questions of a rubric, keyed by question ID"""
+
+    def __init__(self, spec: Dict, version: str):
+        if 'questions' not in spec:
+            raise RubricError("Rubric must define 'questions'")
+        self.name = spec.get('name', '')
+        self.version = version
+        self.questions = {
+            question_id: CompiledQuestion(question_id, question_spec)
+            for question_id, question_spec in spec['questions'].items()
+        }
+
+    def grade(self, question_id: str, answer) -> Dict:
+        """Grade one answer against its question"""
+        return self.questions[question_id].grade(answer)
+
+    def max_points(self) -> Dict[str, int]:
+        """Point value of every question"""
+        return {question_id: question.max_points for question_id, question in self.questions.items()}
+
+_loaded = {}
+
+def rubric_path(name: str) -> str:
+    """Resolve a rubric name (e.g. 'autograder') or path to a .json file"""
+    # Names resolve against rubrics/ even when a file or directory of that name is in the cwd
+    if name.endswith('.json') and os.path.isfile(name):
+        return name
+    return os.path.join(RUBRIC_DIR, f"{name}.json")
+
+def compile_rubric(raw: bytes) -> CompiledRubric:
+    """Compile rubric file contents"""
+    version = hashlib.sha256(raw).hexdigest()
+    try:
+        spec = json.loads(raw)
+    except ValueError as e:
+        raise RubricError(f"Invalid rubric JSON: {e}") from e
+    return CompiledRubric(spec, version)
+
+def load_rubric(name: str) -> CompiledRubric:
+    """Load a compiled rubric (compiled from JSON once per process)"""
+    with open(rubric_path(name), 'rb') as f:
+        raw = f.read()
+
+    version = hashlib.sha256(raw).hexdigest()
+    if version in _loaded:
+        return _loaded[version]
+
+    rubric = _loaded[version] = compile_rubric(raw)
+    return rubric
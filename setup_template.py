@@ -7,21 +7,44 @@ IMPORTANT: This is for instructor use only to prepare the GitHub Classroom templ
 Students will never see this file or the autograding logic.
 """
 
+import glob
 import os
 import shutil
 
+# Files students need (will be renamed); patterns keep each match's name
+STUDENT_FILES = {
+    'simple_submission.py': 'simple_submission.py',  # Student assignment script
+    'docx_render.py': 'docx_render.py',              # Builds the Word proof from templates/
+    'templates/submission*.json': None,              # Word proof templates docx_render.py reads
+    'STUDENT_README.md': 'README.md',                # Student instructions
+    'requirements.txt': 'requirements.txt'           # Just python-docx
+}
+
+def student_files():
+    """(source, destination) for each file students get ((pattern, None) if a pattern matches nothing)"""
+    files = []
+    for src, dst in STUDENT_FILES.items():
+        if glob.has_magic(src):
+            files += [(path, path) for path in sorted(glob.glob(src))] or [(src, None)]
+        else:
+            files.append((src, dst))
+    return files
+
+def copy_student_template(destination):
+    """Copy the student files into destination (a new student repo); returns the destination paths"""
+    copied = []
+    for src, dst in student_files():
+        target = os.path.join(destination, dst)
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        shutil.copyfile(src, target)
+        copied.append(target)
+    return copied
+
 def prepare_student_template():
     """Prepare clean template for GitHub Classroom"""
     
     print("🏗️  Preparing GitHub Classroom student template...")
     
-    # Files students need (will be renamed)
-    student_files = {
-        'simple_submission.py': 'simple_submission.py',  # Student assignment script
-        'STUDENT_README.md': 'README.md',                # Student instructions
-        'requirements.txt': 'requirements.txt'           # Just python-docx
-    }
-    
     # Files to keep for instructor use (hidden from students)
     instructor_files = [
         'simple_autograder.py',     # Grading logic (stays in template)
@@ -36,8 +59,8 @@ def prepare_student_template():
     # .github/workflows/classroom.yml
     
     print("📁 Files students will get:")
-    for src, dst in student_files.items():
-        if os.path.exists(src):
+    for src, dst in student_files():
+        if dst and os.path.exists(src):
             print(f"   ✅ {dst}")
         else:
             print(f"   ❌ {src} (missing)")
@@ -57,6 +80,8 @@ def prepare_student_template():
     print("3. Enable autograding (6 tests will be detected)")
     print("4. Students get clean repo with just:")
     print("   - simple_submission.py")
+    print("   - docx_render.py (builds the Word proof)")
+    print("   - templates/submission.json, templates/submission_proof.json")
     print("   - README.md (student instructions)")
     print("   - requirements.txt")
     print("   - .github/workflows/classroom.yml (autograding)")
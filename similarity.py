@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate answer detection for CSCI 1436 cohorts
+Turns each answer into a set of fingerprints, then finds the groups of
+students whose answers to a question are nearly the same without comparing
+every pair:
+
+- Prose answers: hashed 3-word shingles of the normalized text.
+- Code answers: winnowed fingerprints of 5-token k-grams (the MOSS scheme).
+  Comments and whitespace are dropped before tokenizing.
+
+Fingerprint sets become 128-value MinHash signatures. LSH banding (16 bands of
+8 rows) puts sets with Jaccard similarity of about 0.7 or more in a shared
+bucket. Only those candidate pairs are checked with exact Jaccard similarity.
+Identical answers are merged before banding, so the work grows roughly
+linearly with the number of answers. Needs numpy (imported on first use).
+
+Submissions are identified by a unique key (a file path or student ID), never
+by display name: two students can share a name. Pass names (key -> label) to
+student_flags() and print_report() to show people instead of keys.
+
+    python similarity.py submissions/    # ranked report for assignment1_*.json
+"""
+
+import glob
+import json
+import os
+import re
+import sys
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Questions checked by default, and how their answers are fingerprinted
+DEFAULT_QUESTIONS = {'q1_definitions': 'text', 'q2_languages': 'text', 'q5_programming': 'code'}
+
+NUM_PERMUTATIONS = 128
+BANDS = 16                      # 16 bands x 8 rows: candidates from ~0.7 Jaccard
+SIMILARITY_THRESHOLD = 0.8      # Reported pairs must be at least this similar
+SHINGLE_WORDS = 3
+MIN_WORDS = 10                  # Shorter prose answers match by chance
+CODE_KGRAM = 5
+CODE_WINDOW = 4
+MIN_CODE_TOKENS = 12
+MERSENNE_PRIME = (1 << 61) - 1
+HASH_SEED = 1436
+
+WORD = re.compile(r'\w+')
+CODE_COMMENT = re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL)
+CODE_TOKEN = re.compile(r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|[A-Za-z_]\w*|\d+(?:\.\d+)?[A-Za-z]?|\S')
+
+def _hash(text: str) -> int:
+    return zlib.crc32(text.encode('utf-8'))
+
+def text_fingerprints(answer: str) -> Set[int]:
+    """Hashed word shingles of a prose answer (empty if it is too short to judge)"""
+    words = WORD.findall(answer.lower())
+    if len(words) < MIN_WORDS:
+        return set()
+    return {_hash(' '.join(words[i:i + SHINGLE_WORDS])) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+def code_fingerprints(answer: str) -> Set[int]:
+    """Winnowed k-gram fingerprints of a code answer (empty if it is too short to judge)"""
+    tokens = CODE_TOKEN.findall(CODE_COMMENT.sub(' ', answer))
+    if len(tokens) < MIN_CODE_TOKENS:
+        return set()
+
+    hashes = [_hash(' '.join(tokens[i:i + CODE_KGRAM])) for i in range(len(tokens) - CODE_KGRAM + 1)]
+    if len(hashes) <= CODE_WINDOW:
+        return {min(hashes)}
+
+    # Keep the minimum of every window (the rightmost one on ties), as in MOSS
+    fingerprints = set()
+    for start in range(len(hashes) - CODE_WINDOW + 1):
+        window = hashes[start:start + CODE_WINDOW]
+        smallest = min(window)
+        fingerprints.add((start + CODE_WINDOW - 1 - window[::-1].index(smallest), smallest))
+    return {value for _, value in fingerprints}
+
+FINGERPRINTERS = {'text': text_fingerprints, 'code': code_fingerprints}
+
+class MinHasher:
+    """Universal-hash permutations shared by every signature in a run"""
+
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, seed: int = HASH_SEED):
+        import numpy as np  # Only the similarity check needs numpy
+
+        self.np = np
+        rng = np.random.default_rng(seed)
+        # a < 2**31 and crc32 values < 2**32, so a * x + b stays inside uint64
+        self.a = rng.integers(1, 1 << 31, size=(num_permutations, 1), dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 31, size=(num_permutations, 1), dtype=np.uint64)
+
+    def signature(self, fingerprints: Set[int]):
+        values = self.np.fromiter(fingerprints, dtype=self.np.uint64, count=len(fingerprints))
+        return ((self.a * values + self.b) % MERSENNE_PRIME).min(axis=1)
+
+def jaccard(first: Set[int], second: Set[int]) -> float:
+    return len(first & second) / len(first | second)
+
+def _find(parents: Dict[int, int], item: int) -> int:
+    while parents[item] != item:
+        parents[item] = parents[parents[item]]
+        item = parents[item]
+    return item
+
+def similar_groups(answers: Iterable[Tuple[str, str]], kind: str = 'text',
+                   threshold: float = SIMILARITY_THRESHOLD, bands: int = BANDS,
+                   hasher: Optional[MinHasher] = None) -> List[Dict]:
+    """Cluster (key, answer) pairs whose answers are near-duplicates.
+
+    Returns groups of two or more submissions, most similar first:
+    {'students': [key, ...], 'similarity': best pair, 'pairs': [(a, b, similarity)]}
+    """
+    fingerprint = FINGERPRINTERS[kind]
+
+    # Identical fingerprint sets collapse to one entry before banding
+    unique = {}
+    owners = defaultdict(list)
+    for student, answer in answers:
+        fingerprints = fingerprint(answer if isinstance(answer, str) else '')
+        if fingerprints:
+            key = frozenset(fingerprints)
+            unique.setdefault(key, len(unique))
+            owners[unique[key]].append(student)
+    sets = list(unique)
+    if not sets:
+        return []
+
+    hasher = hasher or MinHasher()
+    rows = NUM_PERMUTATIONS // bands
+    buckets = defaultdict(list)
+    for index, fingerprints in enumerate(sets):
+        signature = hasher.signature(fingerprints)
+        for band in range(bands):
+            buckets[(band, signature[band * rows:(band + 1) * rows].tobytes())].append(index)
+
+    # Only answers sharing a bucket are ever compared
+    verified = {}
+    for members in buckets.values():
+        for i, first in enumerate(members):
+            for second in members[i + 1:]:
+                pair = (first, second) if first < second else (second, first)
+                if pair not in verified:
+                    verified[pair] = jaccard(sets[first], sets[second])
+
+    parents = {index: index for index in owners}
+    best = {index: 1.0 if len(owners[index]) > 1 else 0.0 for index in owners}
+    pairs = defaultdict(list)
+    for index, students in owners.items():
+        pairs[index] += [(students[0], other, 1.0) for other in students[1:]]
+    for (first, second), similarity in verified.items():
+        if similarity >= threshold:
+            root_first, root_second = _find(parents, first), _find(parents, second)
+            if root_first != root_second:
+                parents[root_second] = root_first
+                best[root_first] = max(best[root_first], best[root_second])
+                pairs[root_first] += pairs.pop(root_second, [])
+            best[root_first] = max(best[root_first], similarity)
+            pairs[root_first].append((owners[first][0], owners[second][0], round(similarity, 3)))
+
+    clusters = defaultdict(list)
+    for index in owners:
+        clusters[_find(parents, index)] += owners[index]
+
+    groups = [
+        {'students': sorted(students), 'similarity': round(best[root], 3),
+         'pairs': sorted(pairs[root], key=lambda pair: -pair[2])}
+        for root, students in clusters.items() if len(students) > 1
+    ]
+    groups.sort(key=lambda group: (-group['similarity'], -len(group['students']), group['students']))
+    return groups
+
+def cohort_report(submissions: Iterable[Tuple[str, Dict[str, str]]],
+                  questions: Optional[Dict[str, str]] = None,
+                  threshold: float = SIMILARITY_THRESHOLD) -> List[Dict]:
+    """Near-duplicate groups for every checked question, highest similarity first.
+
+    submissions are (key, {question_id: answer}) pairs with a unique key per
+    submission; questions maps each question ID to 'text' or 'code'
+    (DEFAULT_QUESTIONS if not given).
+    """
+    questions = questions or DEFAULT_QUESTIONS
+    by_question = defaultdict(list)
+    for student, answers in submissions:
+        for question_id in questions:
+            by_question[question_id].append((student, answers.get(question_id, '')))
+
+    hasher = MinHasher()
+    report = []
+    for question_id, kind in questions.items():
+        for group in similar_groups(by_question[question_id], kind, threshold, hasher=hasher):
+            report.append(dict(group, question_id=question_id, kind=kind))
+    report.sort(key=lambda group: (-group['similarity'], -len(group['students'])))
+    return report
+
+def student_flags(report: List[Dict], names: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
+    """Notes per submission key for showing next to grades, e.g. "q5_programming 0.93 with Ann Lee" """
+    names = names or {}
+    flags = defaultdict(list)
+    for group in report:
+        for student in group['students']:
+            others = [names.get(other, other) for other in group['students'] if other != student]
+            shown = ', '.join(others[:3]) + (f" +{len(others) - 3}" if len(others) > 3 else '')
+            flags[student].append(f"{group['question_id']} {group['similarity']:.2f} with {shown}")
+    return flags
+
+def print_report(report: List[Dict], limit: int = 20, names: Optional[Dict[str, str]] = None) -> None:
+    """Ranked near-duplicate groups, as shown by the dashboards"""
+    names = names or {}
+    print("🔍 Answer Similarity (near-duplicate groups, most similar first):")
+    if not report:
+        print("   ✅ No near-duplicate answers found")
+        return
+    for rank, group in enumerate(report[:limit], 1):
+        print(f"   {rank}. {group['question_id']} ({group['kind']}) {group['similarity']:.2f}: "
+              f"{', '.join(names.get(student, student) for student in group['students'])}")
+    if len(report) > limit:
+        print(f"   ... {len(report) - limit} more group(s)")
+
+def main():
+    """Report near-duplicates among assignment1_*.json files: similarity.py [directory]"""
+    directory = sys.argv[1] if len(sys.argv) > 1 else '.'
+    submissions = []
+    names = {}
+    for json_file in sorted(glob.glob(os.path.join(directory, "assignment1_*.json"))):
+        with open(json_file, 'r') as f:
+            data = json.load(f)
+        answers = {question_id: entry.get('answer', '') for question_id, entry in data.get('answers', {}).items()}
+        submissions.append((json_file, answers))
+        names[json_file] = f"{data['student']['name']} ({os.path.basename(json_file)})"
+
+    print(f"🎓 CSCI 1436 Assignment #1 - {len(submissions)} submission(s) in {directory}")
+    print("=" * 60)
+    print_report(cohort_report(submissions), names=names)
+
+if __name__ == "__main__":
+    main()
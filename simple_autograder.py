@@ -5,13 +5,32 @@ Grades JSON submissions and provides percentage scores to students.
 """
 
 import json
-import re
+import os
 import sys
 import glob
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from rubric import load_rubric
+from grade_cache import default_cache, grade_answers
+from normalized_answer import normalize
+
+# Compiled rubric (keyword groups, patterns and point weights) from rubrics/simple_autograder.json
+RUBRIC = load_rubric('simple_autograder')
+
+# Submissions handed to each worker process per task
+BATCH_CHUNK_SIZE = 25
 
 class SimpleGrader:
-    def __init__(self):
-        self.submission = self.load_submission()
+    def __init__(self, submission=None, cache=None):
+        # Graders built from in-memory data skip the submission file lookup
+        self.submission = submission if submission is not None else self.load_submission()
+        # Only instructor-side grading passes a grade cache (see grade_cache.py)
+        self.cache = cache
+        # Each answer is normalized once, however many graders read it (malformed entries grade as blank)
+        self.answers = {
+            question_id: normalize(entry.get('answer') if isinstance(entry, dict) else None)
+            for question_id, entry in self.submission['answers'].items()
+        }
     
     def load_submission(self):
         """Load student submission JSON"""
@@ -23,151 +42,46 @@ class SimpleGrader:
         with open(json_files[0], 'r') as f:
             return json.load(f)
     
+    def grade_question(self, question_id):
+        """Grade one answer against the compiled rubric"""
+        return grade_answers(RUBRIC, {question_id: self.answers[question_id]}, self.cache)[question_id]['points']
+    
     def grade_definitions(self):
         """Grade Q1: Definitions (40 points)"""
-        answer = self.submission['answers']['q1_definitions']['answer'].lower()
-        
-        # Key terms and their important concepts
-        terms = {
-            'repl': ['read', 'eval', 'print', 'loop', 'interactive', 'command'],
-            'java api': ['application', 'programming', 'interface', 'library', 'classes', 'methods'],
-            'jdk': ['development', 'kit', 'tools', 'compiler', 'runtime', 'java'],
-            'variable': ['storage', 'container', 'value', 'memory', 'data', 'holds'],
-            'data type': ['type', 'kind', 'category', 'int', 'string', 'boolean', 'specifies'],
-            'variable declaration': ['create', 'define', 'specify', 'type', 'name', 'declares'],
-            'assignment statement': ['assign', 'value', 'variable', '=', 'store', 'gives'],
-            'expression': ['combination', 'evaluate', 'value', 'operation', 'calculate', 'produces'],
-            'constant': ['unchanging', 'fixed', 'final', 'immutable', 'same', 'cannot change'],
-            'literal': ['value', 'directly', 'written', 'code', 'constant', 'actual']
-        }
-        
-        score = 0
-        for term, keywords in terms.items():
-            # Check if term is mentioned
-            if any(word in answer for word in term.split()):
-                # Award points based on keyword coverage
-                matches = sum(1 for keyword in keywords if keyword in answer)
-                if matches >= 3:
-                    score += 4  # Excellent definition
-                elif matches >= 2:
-                    score += 3  # Good definition
-                elif matches >= 1:
-                    score += 2  # Basic definition
-                else:
-                    score += 1  # Term mentioned but poor definition
-        
-        return min(score, 40)
+        return self.grade_question('q1_definitions')
     
     def grade_languages(self):
         """Grade Q2: High-level vs Low-level (12 points)"""
-        answer = self.submission['answers']['q2_languages']['answer'].lower()
-        
-        key_concepts = [
-            'abstract', 'abstraction', 'portable', 'portability', 'readable', 'readability',
-            'easier', 'simple', 'understand', 'maintain', 'productive', 'faster',
-            'english', 'natural', 'human', 'complex', 'hardware'
-        ]
-        
-        score = 0
-        for concept in key_concepts:
-            if concept in answer:
-                score += 1
-        
-        # Bonus for substantial answer
-        if len(answer.split()) >= 15:
-            score += 2
-        
-        return min(score, 12)
+        return self.grade_question('q2_languages')
     
     def grade_declarations(self):
         """Grade Q3: Variable declarations (12 points)"""
-        answer = self.submission['answers']['q3_declarations']['answer']
-        
-        # Check for correct declarations (3 points each)
-        patterns = [
-            r'double\s+length\s*=\s*23\.6',
-            r'float\s+width\s*=\s*14\.7[fF]?',
-            r'long\s+distance\s*=\s*3172900000[lL]?',
-            r'final\s+int\s+speedOfSound\s*=\s*343'
-        ]
-        
-        score = 0
-        for pattern in patterns:
-            if re.search(pattern, answer, re.IGNORECASE):
-                score += 3
-        
-        return score
+        return self.grade_question('q3_declarations')
     
     def grade_modulo(self):
         """Grade Q4: Modulo operations (12 points)"""
-        answer = self.submission['answers']['q4_modulo']['answer']
-        
-        # Expected answers (3 points each)
-        expected = ['6', '0', '23', '6']
-        
-        score = 0
-        for expected_val in expected:
-            if expected_val in answer:
-                score += 3
-        
-        return score
+        return self.grade_question('q4_modulo')
     
     def grade_programming(self):
         """Grade Q5: Sphere volume program (12 points)"""
-        answer = self.submission['answers']['q5_programming']['answer'].lower()
-        
-        # Required elements (2 points each)
-        elements = [
-            ['input', 'scanner', 'readline'],           # Input handling
-            ['radius', 'r'],                           # Variable name
-            ['volume', 'vol'],                         # Result variable  
-            ['4/3', '4.0/3', '(4/3)'],                # Formula constant
-            ['pi', 'math.pi', '3.14'],                # Pi constant
-            ['*', 'multiply', 'pow', '^', '**']       # Mathematical operations
-        ]
-        
-        score = 0
-        for element_group in elements:
-            if any(element in answer for element in element_group):
-                score += 2
-        
-        return min(score, 12)
+        return self.grade_question('q5_programming')
     
     def grade_debugging(self):
         """Grade Q6: Code debugging (12 points)"""
-        answer = self.submission['answers']['q6_debugging']['answer'].lower()
-        
-        # Key issues to identify (4 points each)
-        issues = [
-            ['division by zero', 'divide by zero', '/0', 'zero division'],
-            ['overflow', 'integer overflow', 'exceed', 'too large', 'maximum'],
-            ['type mismatch', 'long to int', 'conversion', 'cast', 'incompatible']
-        ]
-        
-        score = 0
-        for issue_group in issues:
-            if any(issue in answer for issue in issue_group):
-                score += 4
-        
-        return min(score, 12)
+        return self.grade_question('q6_debugging')
     
     def grade_all(self):
         """Grade entire assignment and return results"""
-        grading_methods = {
-            'q1_definitions': (self.grade_definitions, 40),
-            'q2_languages': (self.grade_languages, 12),
-            'q3_declarations': (self.grade_declarations, 12),
-            'q4_modulo': (self.grade_modulo, 12),
-            'q5_programming': (self.grade_programming, 12),
-            'q6_debugging': (self.grade_debugging, 12)
-        }
-        
         results = {}
         total_earned = 0
         total_possible = 0
         
-        for question_id, (method, max_points) in grading_methods.items():
-            earned = method()
+        # One cache round-trip for the whole submission
+        answers = {question_id: self.answers[question_id] for question_id in RUBRIC.questions}
+        graded = grade_answers(RUBRIC, answers, self.cache)
+        
+        for question_id, max_points in RUBRIC.max_points().items():
+            earned = graded[question_id]['points']
             percentage = (earned / max_points) * 100
             
             results[question_id] = {
@@ -183,11 +97,134 @@ class SimpleGrader:
         
         return results, total_earned, total_possible, overall_percentage
 
+def grade_submission_data(submission):
+    """Grade an in-memory submission dict and return its score summary"""
+    results, total_earned, total_possible, overall_percentage = SimpleGrader(submission, default_cache()).grade_all()
+    return {
+        'results': results,
+        'total_earned': total_earned,
+        'total_possible': total_possible,
+        'overall_percentage': overall_percentage
+    }
+
+def _grade_chunk(chunk):
+    """Worker task: grade a list of (key, submission) pairs.
+    
+    A malformed submission (missing fields, wrong types) gets an {'error': ...}
+    result instead of failing the rest of its chunk.
+    """
+    results = []
+    for key, submission in chunk:
+        try:
+            results.append((key, grade_submission_data(submission)))
+        except (KeyError, TypeError, AttributeError, ValueError) as e:
+            results.append((key, {'error': f"malformed submission ({type(e).__name__}: {e})"}))
+    return results
+
+def grade_many(submissions, workers=None, chunk_size=BATCH_CHUNK_SIZE):
+    """Grade (key, submission) pairs across a process pool.
+    
+    Yields (key, result) pairs as each chunk finishes, so results stream back
+    in completion order rather than input order. A submission that could not
+    be graded yields {'error': message} as its result.
+    """
+    items = iter(submissions)
+    chunks = iter(lambda: list(islice(items, chunk_size)), [])
+    
+    first = next(chunks, None)
+    if first is None:
+        return
+    
+    if workers == 1:
+        # No pool for serial runs: avoids process start-up entirely
+        yield from _grade_chunk(first)
+        for chunk in chunks:
+            yield from _grade_chunk(chunk)
+        return
+    
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded number of chunks in flight so huge inputs stream
+        pending = {executor.submit(_grade_chunk, first)}
+        for chunk in islice(chunks, workers * 2 - 1):
+            pending.add(executor.submit(_grade_chunk, chunk))
+        
+        while pending:
+            done = next(as_completed(pending))
+            pending.remove(done)
+            next_chunk = next(chunks, None)
+            if next_chunk is not None:
+                pending.add(executor.submit(_grade_chunk, next_chunk))
+            yield from done.result()
+
+def load_submission_dir(directory):
+    """Yield (path, submission) pairs for every assignment1_*.json in a directory,
+    plus Word-only submissions (Assignment1_*.docx without a JSON beside them)"""
+    from docx_extract import DOCX_PATTERN, extract_submission, word_only
+    
+    for json_file in sorted(glob.glob(os.path.join(directory, "assignment1_*.json"))):
+        try:
+            with open(json_file, 'r') as f:
+                submission = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Skipping {os.path.basename(json_file)}: {e}")
+            continue
+        yield json_file, submission
+    
+    for docx_file in word_only(sorted(glob.glob(os.path.join(directory, DOCX_PATTERN)))):
+        try:
+            yield docx_file, extract_submission(docx_file, RUBRIC)
+        except ValueError as e:
+            print(f"⚠️ Skipping {os.path.basename(docx_file)}: {e}")
+
+def batch_main(args):
+    """Grade a whole directory of submissions: simple_autograder.py batch <dir> [workers]"""
+    usage = "Usage: python simple_autograder.py batch <directory> [workers]"
+    if not args or not os.path.isdir(args[0]):
+        print(usage)
+        sys.exit(1)
+    
+    workers = None
+    if len(args) > 1:
+        workers = int(args[1]) if args[1].isdigit() else 0
+        if workers < 1:
+            print(usage)
+            print(f"❌ workers must be a positive number, not '{args[1]}'")
+            sys.exit(1)
+    
+    print(f"🎓 CSCI 1436 Assignment #1 - Batch Grading: {args[0]}")
+    print("=" * 60)
+    
+    graded = 0
+    skipped = 0
+    total_percentage = 0
+    for json_file, result in grade_many(load_submission_dir(args[0]), workers=workers):
+        if 'error' in result:
+            skipped += 1
+            print(f"⚠️ Skipping {os.path.basename(json_file)}: {result['error']}")
+            continue
+        graded += 1
+        total_percentage += result['overall_percentage']
+        print(f"{os.path.basename(json_file)}: {result['total_earned']}/{result['total_possible']} "
+              f"({result['overall_percentage']:.1f}%)")
+    
+    print("=" * 60)
+    if graded:
+        print(f"📊 Graded {graded} submissions, average {total_percentage / graded:.1f}%")
+    elif not skipped:
+        print("❌ No submission files found")
+    if skipped:
+        print(f"⚠️ {skipped} submission(s) could not be graded")
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python simple_autograder.py <question_id|all>")
+        print("Usage: python simple_autograder.py <question_id|all|batch <dir>>")
         sys.exit(1)
     
+    if sys.argv[1] == 'batch':
+        batch_main(sys.argv[2:])
+        return
+    
     grader = SimpleGrader()
     student_name = grader.submission['student']['name']
     
@@ -224,20 +261,11 @@ def main():
         # Grade individual question (for GitHub Classroom)
         question_id = sys.argv[1]
         
-        methods = {
-            'q1_definitions': grader.grade_definitions,
-            'q2_languages': grader.grade_languages,
-            'q3_declarations': grader.grade_declarations,
-            'q4_modulo': grader.grade_modulo,
-            'q5_programming': grader.grade_programming,
-            'q6_debugging': grader.grade_debugging
-        }
-        
-        if question_id not in methods:
+        if question_id not in RUBRIC.questions:
             print(f"❌ Unknown question: {question_id}")
             sys.exit(1)
         
-        score = methods[question_id]()
+        score = grader.grade_question(question_id)
         max_points = grader.submission['answers'][question_id]['max_points']
         percentage = (score / max_points) * 100
         
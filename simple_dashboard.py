@@ -6,26 +6,119 @@ View autograding results and export grades.
 
 import json
 import glob
+import hashlib
 import os
+import sys
+import time
+import argparse
 from datetime import datetime
-import csv
 
-def load_all_submissions():
-    """Load all student submissions from local files or GitHub API"""
+# Fingerprints and last grades of every submission seen, for incremental regrading
+MANIFEST_FILE = ".dashboard_manifest.json"
+
+# Rewritten in place after every batch in --watch mode
+LIVE_EXPORT_BASENAME = "csci1436_assignment1_grades_live"
+
+# Gradebook export target whose last-exported scores --delta compares against
+# (and owner of the gradebook below)
+EXPORT_TARGET = "simple_dashboard"
+
+# This dashboard's own gradebook: its question IDs differ from instructor_dashboard.py's
+GRADEBOOK_FILE = "simple_gradebook.sqlite3"
+
+# Per-student Word feedback written by --feedback-docs
+FEEDBACK_DIR = "feedback_reports"
+
+def load_manifest(rubric_version, path=MANIFEST_FILE):
+    """Return {file: entry} from the manifest, or {} if it is missing or was graded under another
+    rubric or rubric compiler (whose matching may differ)"""
+    import rubric as rubric_module
+    
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    if (manifest.get('rubric_version') != rubric_version
+            or manifest.get('compiler_version') != rubric_module.COMPILER_VERSION):
+        return {}
+    return manifest.get('files', {})
+
+def manifest_entry(submission):
+    """Fingerprint plus last grade of a graded submission"""
+    return dict(submission['fingerprint'], graded=submission['graded'])
+
+def save_manifest(submissions, rubric_version, path=MANIFEST_FILE):
+    """Record each graded submission's fingerprint and grade (files no longer present drop out)"""
+    import rubric as rubric_module
+    
+    manifest = {
+        'rubric_version': rubric_version,
+        'compiler_version': rubric_module.COMPILER_VERSION,
+        'files': {
+            submission['file']: manifest_entry(submission)
+            for submission in submissions if submission.get('graded')
+        }
+    }
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(temp_path, path)
+
+def load_submission_file(json_file, entry=None):
+    """Fingerprint one submission file, reusing the manifest entry's grade if it is unchanged"""
+    stat = os.stat(json_file)
+    
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        # Untouched since the last run: no need to even read it
+        return {'file': json_file, 'fingerprint': entry, 'graded': entry['graded']}
+    
+    with open(json_file, 'rb') as f:
+        raw = f.read()
+    fingerprint = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': hashlib.sha256(raw).hexdigest()
+    }
+    
+    if entry and entry['sha256'] == fingerprint['sha256']:
+        # Touched or copied but identical content: keep the old grade
+        return {'file': json_file, 'fingerprint': fingerprint, 'graded': entry['graded']}
+    
+    if json_file.endswith('.docx'):
+        from docx_extract import extract_submission
+        data = extract_submission(json_file)  # ValueError if it holds no answers
+    else:
+        data = json.loads(raw)
+    return {'file': json_file, 'fingerprint': fingerprint, 'data': data}
+
+def load_all_submissions(manifest=None):
+    """Load all student submissions from local files or GitHub API
+    
+    Files whose size and mtime (or, failing that, content hash) match the
+    manifest are not parsed; they carry their previous grade under 'graded'.
+    """
     submissions = []
+    manifest = manifest or {}
     
-    # Look for local submission files (for testing)
-    json_files = glob.glob("assignment1_*.json")
+    # Look for local submission files (for testing), plus Word-only submissions
+    from docx_extract import DOCX_PATTERN, word_only
+    json_files = glob.glob("assignment1_*.json") + word_only(glob.glob(DOCX_PATTERN))
     
     if json_files:
-        print(f"📁 Found {len(json_files)} local submission files")
+        changed = 0
         for json_file in json_files:
-            with open(json_file, 'r') as f:
-                submission = json.load(f)
-                submissions.append({
-                    'file': json_file,
-                    'data': submission
-                })
+            try:
+                submission = load_submission_file(json_file, manifest.get(json_file))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Skipping {json_file}: {e}")
+                continue
+            if not submission.get('graded'):
+                changed += 1
+            submissions.append(submission)
+        
+        print(f"📁 Found {len(submissions)} local submission files ({changed} new or changed)")
     else:
         print("ℹ️ No local submissions found. In production, this would fetch from GitHub Classroom API.")
     
@@ -33,32 +126,122 @@ def load_all_submissions():
 
 def grade_submission(submission_data):
     """Grade a single submission using the autograder logic"""
-    from simple_autograder import SimpleGrader
+    from simple_autograder import grade_submission_data
     
-    # Temporarily save submission for grader
-    temp_file = f"temp_submission_{datetime.now().timestamp()}.json"
-    with open(temp_file, 'w') as f:
-        json.dump(submission_data, f)
+    return grade_submission_data(submission_data)
+
+def grade_pending(submissions, workers=None):
+    """Grade every submission without a 'graded' row and attach one; returns how many were graded.
     
+    A submission that cannot be graded gets an 'error', is reported and is
+    removed from the list, so one malformed file never stops the rest.
+    """
+    from simple_autograder import grade_many
+    
+    # Grade only new or changed submissions across a process pool
+    keyed_submissions = (
+        (index, submission['data']) for index, submission in enumerate(submissions)
+        if not submission.get('graded')
+    )
+    graded = 0
+    for index, grading_result in grade_many(keyed_submissions, workers=workers):
+        submission = submissions[index]
+        try:
+            if 'error' in grading_result:
+                raise ValueError(grading_result['error'])
+            submission['graded'] = {
+                'student_name': submission['data']['student']['name'],
+                'student_id': submission['data']['student']['id'],
+                'submitted_at': submission['data']['assignment']['submitted_at'],
+                'total_earned': grading_result['total_earned'],
+                'total_possible': grading_result['total_possible'],
+                'percentage': grading_result['overall_percentage'],
+                'detailed_results': grading_result['results']
+            }
+        except (KeyError, TypeError, ValueError) as e:
+            submission['error'] = grading_result.get('error') or f"malformed submission ({type(e).__name__}: {e})"
+            print(f"⚠️ Could not grade {submission['file']}: {submission['error']}")
+            continue
+        graded += 1
+    submissions[:] = [submission for submission in submissions if 'error' not in submission]
+    return graded
+
+def gradebook_row(submission):
+    """Gradebook row for a graded submission"""
+    graded = submission['graded']
+    return {
+        'student_id': graded['student_id'],
+        'student_name': graded['student_name'],
+        'submitted_at': graded['submitted_at'],
+        'content_sha256': submission['fingerprint']['sha256'],
+        'total_earned': graded['total_earned'],
+        'total_possible': graded['total_possible'],
+        'questions': [
+            {'question_id': q_id, 'points': result['earned'], 'max_points': result['max_points']}
+            for q_id, result in graded['detailed_results'].items()
+        ]
+    }
+
+def open_gradebook():
+    """This dashboard's gradebook ($GRADEBOOK or simple_gradebook.sqlite3)"""
+    from gradebook import Gradebook, GradebookError
     try:
-        # Create grader instance and grade
-        grader = SimpleGrader()
-        grader.submission = submission_data  # Override loaded submission
-        results, total_earned, total_possible, overall_percentage = grader.grade_all()
-        
-        return {
-            'results': results,
-            'total_earned': total_earned,
-            'total_possible': total_possible,
-            'overall_percentage': overall_percentage
-        }
-    finally:
-        # Clean up temp file
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
+        return Gradebook(owner=EXPORT_TARGET, default_path=GRADEBOOK_FILE)
+    except GradebookError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
 
-def display_grade_summary(submissions):
-    """Display grade summary for all submissions"""
+def roster_keys(submissions):
+    """Gradebook student keys of graded submissions"""
+    from gradebook import row_key
+    return {row_key(gradebook_row(submission)) for submission in submissions if submission.get('graded')}
+
+def record_grades(gradebook, submissions, rubric_version):
+    """Upsert graded submissions into the gradebook as one grading run"""
+    run = gradebook.start_run('simple_dashboard', rubric_version)
+    changed = gradebook.record(run, (gradebook_row(submission) for submission in submissions))
+    gradebook.finish_run(run)
+    print(f"🗄️ Gradebook updated: {changed} student(s) changed ({gradebook.path})")
+    return changed
+
+def submission_answers(submission):
+    """(file, {question_id: answer}) for a submission, re-reading files skipped as unchanged"""
+    data = submission.get('data')
+    if data is None:
+        if submission['file'].endswith('.docx'):
+            from docx_extract import extract_submission
+            data = extract_submission(submission['file'])
+        else:
+            with open(submission['file'], 'r') as f:
+                data = json.load(f)
+    answers = {}
+    for question_id, entry in data.get('answers', {}).items():
+        # Malformed answers (numbers, lists, missing) compare as empty rather than crash the check
+        answer = entry.get('answer') if isinstance(entry, dict) else None
+        answers[question_id] = answer if isinstance(answer, str) else ''
+    return submission['file'], answers
+
+def student_label(graded):
+    """Name and ID, as similarity flags show a student"""
+    return f"{graded['student_name']} ({graded['student_id']})" if graded.get('student_id') else graded['student_name']
+
+def check_similarity(submissions):
+    """Near-duplicate answer groups across the cohort (see similarity.py), keyed by submission file"""
+    from similarity import cohort_report
+    
+    cohort = []
+    for submission in submissions:
+        try:
+            cohort.append(submission_answers(submission))
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️ Similarity check skips {submission['file']}: {e}")
+    started = time.perf_counter()
+    report = cohort_report(cohort)
+    print(f"🔍 Compared answers of {len(cohort)} submission(s) in {time.perf_counter() - started:.2f} s")
+    return report
+
+def display_grade_summary(submissions, similarity_report=None):
+    """Display grade summary for all submissions, flagging students in the similarity report"""
     if not submissions:
         print("❌ No submissions to display")
         return []
@@ -66,39 +249,41 @@ def display_grade_summary(submissions):
     print("🎓 CSCI 1436 Assignment #1 - Grade Summary")
     print("=" * 80)
     
-    graded_results = []
+    grade_pending(submissions)
     
-    for submission in submissions:
-        student_name = submission['data']['student']['name']
-        student_id = submission['data']['student']['id']
-        submitted_at = submission['data']['assignment']['submitted_at']
-        
-        # Grade the submission
-        grading_result = grade_submission(submission['data'])
-        
-        # Store result
-        graded_results.append({
-            'student_name': student_name,
-            'student_id': student_id,
-            'submitted_at': submitted_at,
-            'total_earned': grading_result['total_earned'],
-            'total_possible': grading_result['total_possible'],
-            'percentage': grading_result['overall_percentage'],
-            'detailed_results': grading_result['results']
-        })
-        
-        # Display result
-        print(f"📚 {student_name} (ID: {student_id})")
-        print(f"   Score: {grading_result['total_earned']}/{grading_result['total_possible']} ({grading_result['overall_percentage']:.1f}%)")
-        print(f"   Submitted: {datetime.fromisoformat(submitted_at.replace('Z', '+00:00')).strftime('%m/%d/%Y %I:%M %p')}")
+    # Keep display and exports in the same order as the submission files
+    graded_results = [submission['graded'] for submission in submissions]
+    names = {submission['file']: student_label(submission['graded']) for submission in submissions}
+    
+    flags = {}
+    if similarity_report is not None:
+        from similarity import student_flags
+        flags = student_flags(similarity_report, names)
+    
+    for submission, graded in zip(submissions, graded_results):
+        print(f"📚 {graded['student_name']} (ID: {graded['student_id']})")
+        print(f"   Score: {graded['total_earned']}/{graded['total_possible']} ({graded['percentage']:.1f}%)")
+        print(f"   Submitted: {datetime.fromisoformat(graded['submitted_at'].replace('Z', '+00:00')).strftime('%m/%d/%Y %I:%M %p')}")
         
         # Question breakdown
-        for q_id, result in grading_result['results'].items():
+        for q_id, result in graded['detailed_results'].items():
             q_num = q_id.split('_')[0].replace('q', 'Q')
             print(f"   {q_num}: {result['earned']}/{result['max_points']} ({result['percentage']:.1f}%)")
+        for flag in flags.get(submission['file'], []):
+            print(f"   🚩 Similar answer: {flag}")
+        print()
+    
+    display_class_statistics(graded_results)
+    
+    if similarity_report is not None:
+        from similarity import print_report
         print()
+        print_report(similarity_report, names=names)
     
-    # Class statistics
+    return graded_results
+
+def display_class_statistics(graded_results):
+    """Print average, highest and lowest scores"""
     if graded_results:
         avg_score = sum(r['percentage'] for r in graded_results) / len(graded_results)
         max_score = max(r['percentage'] for r in graded_results)
@@ -109,61 +294,167 @@ def display_grade_summary(submissions):
         print(f"   Highest: {max_score:.1f}%")
         print(f"   Lowest: {min_score:.1f}%")
         print(f"   Total Submissions: {len(graded_results)}")
+
+def feedback_context(graded):
+    """Fill-in values for templates/feedback.json"""
+    submitted_at = graded['submitted_at']
+    return {
+        'student_name': graded['student_name'],
+        'student_id': graded['student_id'] or 'N/A',
+        'submitted': datetime.fromisoformat(submitted_at.replace('Z', '+00:00')).strftime('%m/%d/%Y %I:%M %p')
+                     if submitted_at else '',
+        'total_earned': graded['total_earned'],
+        'total_possible': graded['total_possible'],
+        'percentage': f"{graded['percentage']:.1f}%",
+        'questions': [
+            {'number': number, 'earned': result['earned'], 'max_points': result['max_points'],
+             'percentage': f"{result['percentage']:.1f}%"}
+            for number, result in enumerate(graded['detailed_results'].values(), 1)
+        ]
+    }
+
+def write_feedback_documents(graded_results, directory=FEEDBACK_DIR, workers=None):
+    """Render one feedback .docx per student across a process pool; returns how many were written"""
+    from docx_render import render_many
     
-    return graded_results
+    os.makedirs(directory, exist_ok=True)
+    jobs = (
+        (os.path.join(directory, f"{graded['student_name'].replace(' ', '_')}_feedback.docx"), feedback_context(graded))
+        for graded in graded_results
+    )
+    started = time.perf_counter()
+    written = sum(1 for _ in render_many('feedback', jobs, workers=workers))
+    print(f"📝 {written} feedback document(s) written to '{directory}' in {time.perf_counter() - started:.1f} s")
+    return written
 
-def export_grades(graded_results, format='csv'):
-    """Export grades for LMS import"""
-    if not graded_results:
-        print("❌ No grades to export")
-        return
+def export_grades(gradebook, formats=('blackboard',), delta=False, roster=None):
+    """Stream the gradebook (the roster's students, if given) to LMS import files;
+    with delta, only students whose scores changed since the last export"""
+    from lms_export import export_gradebook
+    from simple_autograder import RUBRIC
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"csci1436_assignment1_grades_{timestamp}.{format}"
-    
-    if format == 'csv':
-        with open(filename, 'w', newline='') as csvfile:
-            fieldnames = [
-                'Student Name', 'Student ID', 'Submission Date',
-                'Q1 Score', 'Q1 Max', 'Q1 Percent',
-                'Q2 Score', 'Q2 Max', 'Q2 Percent', 
-                'Q3 Score', 'Q3 Max', 'Q3 Percent',
-                'Q4 Score', 'Q4 Max', 'Q4 Percent',
-                'Q5 Score', 'Q5 Max', 'Q5 Percent',
-                'Q6 Score', 'Q6 Max', 'Q6 Percent',
-                'Total Score', 'Total Possible', 'Final Percentage'
-            ]
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+    basename = f"csci1436_assignment1_grades_{'delta_' if delta else ''}{timestamp}"
+    manifest = export_gradebook(gradebook, EXPORT_TARGET, formats, basename, len(RUBRIC.questions),
+                                sum(RUBRIC.max_points().values()), delta=delta, roster=roster)
+    
+    if manifest is None:
+        print("✅ No grade changes since the last export - nothing to upload" if delta else "❌ No grades to export")
+        return []
+    
+    for filename in manifest['files']:
+        print(f"💾 Grades exported to: {filename}")
+    if delta:
+        print(f"🧾 Delta: {manifest['new_students']} new, {manifest['changed_students']} changed "
+              f"(manifest: {manifest['manifest_file']})")
+    return manifest['files']
+
+def watch_main(debounce, formats=('blackboard',)):
+    """Keep grading submissions as they land, updating statistics and the live export"""
+    from docx_extract import DOCX_PATTERN, json_counterpart, word_only
+    from file_watcher import open_watcher, watch_batches
+    from lms_export import export_rows
+    from simple_autograder import RUBRIC, BATCH_CHUNK_SIZE
+    
+    # Start watching before the first scan so nothing that lands during it is missed
+    watcher = open_watcher('.', ('assignment1_*.json', DOCX_PATTERN))
+    
+    submissions = load_all_submissions(load_manifest(RUBRIC.version))
+    grade_pending(submissions)
+    by_file = {submission['file']: submission for submission in submissions}
+    gradebook = open_gradebook()
+    
+    def publish(graded_submissions):
+        ordered = [by_file[json_file] for json_file in sorted(by_file)]
+        display_class_statistics([submission['graded'] for submission in ordered])
+        save_manifest(ordered, RUBRIC.version)
+        if record_grades(gradebook, graded_submissions, RUBRIC.version) or not os.path.exists(f"{LIVE_EXPORT_BASENAME}.csv"):
+            # A live view, not an upload: written in place without touching the export snapshot,
+            # and only for the files being watched, not everyone the gradebook has seen
+            rows = gradebook.rows(roster=roster_keys(ordered))
+            for filename in export_rows(rows, formats, LIVE_EXPORT_BASENAME, len(RUBRIC.questions),
+                                        sum(RUBRIC.max_points().values())):
+                print(f"💾 Grades exported to: {filename}")
+    
+    publish(submissions)
+    print(f"👀 Watching for new submissions ({type(watcher).__name__}) - press Ctrl+C to stop")
+    
+    try:
+        for changed in watch_batches(watcher, debounce):
+            started = time.monotonic()
+            pending = []
             
-            for result in graded_results:
-                row = {
-                    'Student Name': result['student_name'],
-                    'Student ID': result['student_id'],
-                    'Submission Date': datetime.fromisoformat(result['submitted_at'].replace('Z', '+00:00')).strftime('%m/%d/%Y %I:%M %p'),
-                    'Total Score': result['total_earned'],
-                    'Total Possible': result['total_possible'],
-                    'Final Percentage': f"{result['percentage']:.1f}%"
-                }
+            for path in sorted(changed):
+                json_file = os.path.normpath(path)
+                if json_file.endswith('.docx') and not word_only([json_file]):
+                    continue  # The JSON beside it is graded instead
+                previous = by_file.pop(json_file, None)
+                try:
+                    submission = load_submission_file(json_file, previous and manifest_entry(previous))
+                except FileNotFoundError:
+                    print(f"🗑️ Removed: {json_file}")
+                    continue
+                except ValueError:
+                    # Usually a half-copied file; its next write triggers another event
+                    print(f"⚠️ Skipping unreadable submission: {json_file}")
+                    continue
+                except OSError as e:
+                    print(f"⚠️ Skipping {json_file}: {e}")
+                    continue
                 
-                # Add individual question scores
-                for i, (q_id, q_result) in enumerate(result['detailed_results'].items(), 1):
-                    row[f'Q{i} Score'] = q_result['earned']
-                    row[f'Q{i} Max'] = q_result['max_points']
-                    row[f'Q{i} Percent'] = f"{q_result['percentage']:.1f}%"
-                
-                writer.writerow(row)
-    
-    print(f"💾 Grades exported to: {filename}")
-    return filename
+                by_file[json_file] = submission
+                # A JSON submission replaces the Word-only copy graded before it arrived
+                for docx_file in [name for name in by_file if name.endswith('.docx') and json_counterpart(name) == json_file]:
+                    del by_file[docx_file]
+                if not submission.get('graded'):
+                    pending.append(submission)
+            
+            # Small batches grade in-process: starting a pool would cost more than grading
+            grade_pending(pending, workers=1 if len(pending) <= BATCH_CHUNK_SIZE else None)
+            # Files that could not be graded are skipped until their next change
+            for json_file in [json_file for json_file, submission in by_file.items() if 'error' in submission]:
+                del by_file[json_file]
+            
+            print(f"\n🔄 {datetime.now().strftime('%I:%M:%S %p')}: {len(pending)} submission(s) graded "
+                  f"in {(time.monotonic() - started) * 1000:.0f} ms")
+            for submission in pending:
+                graded = submission['graded']
+                print(f"   📚 {graded['student_name']} (ID: {graded['student_id']}): "
+                      f"{graded['total_earned']}/{graded['total_possible']} ({graded['percentage']:.1f}%)")
+            publish(pending)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+        gradebook.close()
 
 def main():
+    parser = argparse.ArgumentParser(description='CSCI 1436 Assignment #1 - Instructor Dashboard')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and grade assignment1_*.json (and Word-only) submissions as they are added or changed')
+    parser.add_argument('--debounce', type=float, default=0.2,
+                        help='Seconds of quiet before a batch of changed files is graded (--watch)')
+    parser.add_argument('--format', nargs='+', choices=['blackboard', 'canvas', 'xlsx'], default=['blackboard'],
+                        help='Export formats, written in one pass (default: blackboard)')
+    parser.add_argument('--delta', action='store_true',
+                        help='Export only students whose scores changed since the last export, plus a manifest')
+    parser.add_argument('--feedback-docs', action='store_true',
+                        help=f'Also write a Word feedback document per student to {FEEDBACK_DIR}/')
+    parser.add_argument('--similarity', action='store_true',
+                        help='Flag near-duplicate answers across the cohort (needs numpy)')
+    args = parser.parse_args()
+    
     print("🎓 CSCI 1436 Assignment #1 - Instructor Dashboard")
     print("=" * 60)
     
-    # Load submissions
-    submissions = load_all_submissions()
+    if args.watch:
+        watch_main(args.debounce, args.format)
+        return
+    
+    from simple_autograder import RUBRIC
+    
+    # Load submissions, reusing grades of files unchanged since the last run
+    submissions = load_all_submissions(load_manifest(RUBRIC.version))
     
     if not submissions:
         print("ℹ️ No submissions found. To test this dashboard:")
@@ -171,21 +462,34 @@ def main():
         print("   2. Or create sample submission files")
         return
     
+    similarity_report = check_similarity(submissions) if args.similarity else None
+    
     # Display grades
-    graded_results = display_grade_summary(submissions)
+    graded_results = display_grade_summary(submissions, similarity_report)
+    save_manifest(submissions, RUBRIC.version)
+    
+    gradebook = open_gradebook()
+    record_grades(gradebook, submissions, RUBRIC.version)
+    
+    if args.feedback_docs:
+        write_feedback_documents(graded_results)
     
     # Export option
     if graded_results:
         print("\n💾 Export Options:")
-        export_choice = input("Export grades to CSV? (y/n): ").lower()
+        prompt = "Export changed grades? (y/n): " if args.delta else "Export grades? (y/n): "
+        export_choice = input(prompt).lower()
         if export_choice == 'y':
-            export_grades(graded_results, 'csv')
+            # A query over the gradebook, limited to this run's students
+            export_grades(gradebook, args.format, args.delta, roster_keys(submissions))
         
         print("\n✅ Dashboard complete!")
         print("📋 For GitHub Classroom integration:")
         print("   - Students see these scores in their GitHub Actions")
         print("   - Use the CSV export for your LMS gradebook")
         print("   - Word docs in Blackboard are just submission proof")
+    
+    gradebook.close()
 
 if __name__ == "__main__":
     main()
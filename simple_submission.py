@@ -7,8 +7,6 @@ Complete the assignment by answering questions.
 Generates: JSON for autograding + Word doc for Blackboard submission proof.
 """
 
-from docx import Document
-from docx.shared import Pt
 import json
 import datetime
 
@@ -112,20 +110,16 @@ def main():
     with open(json_file, 'w') as f:
         json.dump(submission, f, indent=2)
     
-    # Create simple Word doc for Blackboard submission proof
-    doc = Document()
-    doc.add_heading("CSCI 1436 Programming Fundamentals I", level=1)
-    doc.add_heading("Assignment #1 - Submission Proof", level=2)
-    doc.add_paragraph(f"Student: {first_name} {last_name}")
-    doc.add_paragraph(f"Student ID: {student_id}")
-    doc.add_paragraph(f"Submitted: {datetime.datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
-    doc.add_paragraph("")
-    doc.add_paragraph("This document serves as proof of assignment submission.")
-    doc.add_paragraph("Answers have been submitted for autograding via GitHub Classroom.")
-    doc.add_paragraph(f"Total Questions: {len(questions)} | Total Points: {total_points}")
+    # Create simple Word doc for Blackboard submission proof (templates/submission_proof.json)
+    from docx_render import render_document
     
-    word_file = f"Assignment1_{first_name}_{last_name}.docx"
-    doc.save(word_file)
+    word_file = render_document('submission_proof', {
+        'student_name': f"{first_name} {last_name}",
+        'student_id': student_id,
+        'submitted': datetime.datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+        'question_count': len(questions),
+        'total_points': total_points
+    }, f"Assignment1_{first_name}_{last_name}.docx")
     
     # Success message
     print(f"\n" + "="*60)
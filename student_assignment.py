@@ -7,8 +7,6 @@ This script will guide you through answering assignment questions
 and prepare your submission for both GitHub Classroom and Turnitin.
 """
 
-from docx import Document
-from docx.shared import Pt
 import json
 import datetime
 
@@ -96,33 +94,23 @@ def collect_responses():
 
 def create_word_document(first_name, last_name, student_id, responses):
     """Create Word document for Turnitin submission"""
-    doc = Document()
+    from docx_render import render_document  # Fills templates/submission.json at the XML level
     
-    # Header
-    doc.add_heading("CSCI 1436 Programming Fundamentals I", level=1)
-    doc.add_heading("Assignment #1", level=2)
-    doc.add_paragraph(f"Student: {first_name} {last_name}")
-    doc.add_paragraph(f"Student ID: {student_id}")
-    doc.add_paragraph(f"Submission Date: {datetime.datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
-    doc.add_paragraph("")
-    
-    # Questions and responses
-    for question_data in questions:
-        response_data = responses[question_data['id']]
-        
-        doc.add_paragraph(f"Question {response_data['question_num']}:", style='Heading 3')
-        doc.add_paragraph(question_data['question'])
-        
-        # Add response
-        response_para = doc.add_paragraph("Answer:")
-        response_para.add_run(f"\n{response_data['response']}")
-        response_para.runs[-1].font.size = Pt(11)
-        doc.add_paragraph("")
+    context = {
+        'student_name': f"{first_name} {last_name}",
+        'student_id': student_id,
+        'submitted': datetime.datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+        'questions': [
+            {
+                'number': responses[question_data['id']]['question_num'],
+                'question': question_data['question'],
+                'answer': responses[question_data['id']]['response']
+            }
+            for question_data in questions
+        ]
+    }
     
-    # Save document
-    filename = f"Assignment1_{first_name}_{last_name}.docx"
-    doc.save(filename)
-    return filename
+    return render_document('submission', context, f"Assignment1_{first_name}_{last_name}.docx")
 
 def create_submission_data(first_name, last_name, student_id, responses):
     """Create submission data for autograding"""
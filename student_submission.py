@@ -4,8 +4,6 @@ Enhanced Student Assignment Submission Script
 Generates both Word document and JSON data for autograding in GitHub Classroom
 """
 
-from docx import Document
-from docx.shared import Pt
 import json
 import datetime
 import os
@@ -118,34 +116,23 @@ def collect_responses(questions):
 
 def create_word_document(first_name, last_name, student_id, questions, responses):
     """Create the Word document for Turnitin submission"""
-    doc = Document()
+    from docx_render import render_document  # Fills templates/submission.json at the XML level
     
-    # Header
-    doc.add_heading("CSCI 1436 Programming Fundamentals I", level=1)
-    doc.add_heading("Assignment #1", level=2)
-    doc.add_paragraph(f"Student: {first_name} {last_name}")
-    doc.add_paragraph(f"Student ID: {student_id}")
-    doc.add_paragraph(f"Submission Date: {datetime.datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
-    doc.add_paragraph("")
-    
-    # Questions and responses
-    for question_data in questions:
-        question_id = question_data['id']
-        response_data = responses[question_id]
-        
-        doc.add_paragraph(f"Question {response_data['question_num']}:", style='Heading 3')
-        doc.add_paragraph(question_data['question'])
-        
-        # Add response
-        response_para = doc.add_paragraph("Answer:")
-        response_para.add_run(f"\n{response_data['response']}")
-        response_para.runs[-1].font.size = Pt(11)
-        doc.add_paragraph("")
+    context = {
+        'student_name': f"{first_name} {last_name}",
+        'student_id': student_id,
+        'submitted': datetime.datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+        'questions': [
+            {
+                'number': responses[question_data['id']]['question_num'],
+                'question': question_data['question'],
+                'answer': responses[question_data['id']]['response']
+            }
+            for question_data in questions
+        ]
+    }
     
-    # Save document
-    filename = f"Assignment1_{first_name}_{last_name}.docx"
-    doc.save(filename)
-    return filename
+    return render_document('submission', context, f"Assignment1_{first_name}_{last_name}.docx")
 
 def create_autograding_data(first_name, last_name, student_id, responses):
     """Create JSON data for GitHub Classroom autograding"""
@@ -188,7 +175,7 @@ def create_github_files():
         "tests": [
             {
                 "name": "Question 1 - Definitions",
-                "setup": "",
+                "setup": "python autograder.py all",
                 "run": "python autograder.py q1_definitions",
                 "input": "",
                 "output": "",
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Index of uploaded Word submissions for the CSCI 1436 dashboards
+Built once per run from the upload manifest written by blackboard_ingest.py, or
+from one scan of a directory of Assignment1_*.docx files. Uploads are keyed by
+normalized student name and by content hash, so checking a student is a dict
+lookup and no per-student filesystem access is needed.
+
+Word files are named by student ("First Last"), but GitHub results are named by
+login or Classroom roster identifier. Pass a roster (GitHub Classroom's roster
+CSV export, see load_roster) so those names resolve to the students' own;
+without one, only results named "First Last" (local files, or Classroom
+identifiers set to full names) match an upload.
+
+    index = SubmissionIndex.load('blackboard_uploads.json', load_roster('classroom_roster.csv'))
+    index.submitted('Ann Lee')         # True if a verified upload exists
+    index.report(['Ann Lee', ...])     # missing, duplicate, mismatched, ...
+    index.answers()                    # (upload, {question_id: answer}) per student
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+import zipfile
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from blackboard_ingest import DEFAULT_MANIFEST_FILE, document_problems, match_member
+from docx_extract import read_document, submission_from_document
+from gradebook import normalize_name
+
+READ_CHUNK_BYTES = 64 * 1024
+DEFAULT_ROSTER_FILE = "classroom_roster.csv"
+
+def load_roster(path: str = DEFAULT_ROSTER_FILE) -> Dict[str, str]:
+    """Student name for each GitHub login and roster identifier, from a GitHub Classroom roster CSV.
+
+    The export has identifier, github_username, github_id and name columns;
+    when name is blank the identifier is taken to be the student's name.
+    """
+    names = {}
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            name = (row.get('name') or row.get('identifier') or '').strip()
+            if not name:
+                continue
+            for alias in (row.get('identifier'), row.get('github_username')):
+                if alias and alias.strip():
+                    names[normalize_name(alias)] = name
+    return names
+
+class SubmissionIndex:
+    """Upload records (as in blackboard_uploads.json) indexed by student and content"""
+
+    def __init__(self, uploads: Iterable[Dict], source: Optional[str] = None, archive: Optional[str] = None,
+                 roster: Optional[Dict[str, str]] = None):
+        self.source = source
+        # Blackboard archive that manifest members are read from (None: members are file paths)
+        self.archive = archive
+        # GitHub login / roster identifier -> student name (see load_roster)
+        self.roster = roster or {}
+        self.by_student = defaultdict(list)
+        self.by_hash = defaultdict(list)
+        for upload in uploads:
+            self.by_student[normalize_name(upload['student_name'])].append(upload)
+            if upload.get('sha256'):
+                self.by_hash[upload['sha256']].append(upload)
+
+    @classmethod
+    def from_manifest(cls, path: str = DEFAULT_MANIFEST_FILE,
+                      roster: Optional[Dict[str, str]] = None) -> 'SubmissionIndex':
+        """Index the uploads recorded by blackboard_ingest.py"""
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        return cls(manifest['uploads'], source=path, archive=manifest.get('archive'), roster=roster)
+
+    @classmethod
+    def from_directory(cls, directory: str, roster: Optional[Dict[str, str]] = None) -> 'SubmissionIndex':
+        """Hash and verify every Assignment1_*.docx in a directory (one scan).
+
+        A file that cannot be read is recorded as an 'unreadable' upload with
+        the error as its problem; the scan carries on with the rest.
+        """
+        uploads = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                upload = match_member(entry.name) if entry.is_file() else None
+                if upload is None:
+                    continue
+
+                upload.update(member=entry.path, size=None, sha256=None)
+                try:
+                    digest = hashlib.sha256()
+                    with open(entry.path, 'rb') as f:
+                        for chunk in iter(lambda: f.read(READ_CHUNK_BYTES), b''):
+                            digest.update(chunk)
+                    upload.update(size=entry.stat().st_size, sha256=digest.hexdigest())
+
+                    fields, sections = read_document(entry.path)
+                    upload['kind'] = 'answers' if sections else 'proof'
+                    upload['problems'] = document_problems(upload['student_name'], fields)
+                except (OSError, ValueError) as e:
+                    fields, upload['kind'], upload['problems'] = {}, 'unreadable', [str(e)]
+                upload['document_name'] = fields.get('Student')
+                upload['document_id'] = fields.get('Student ID')
+                uploads.append(upload)
+        return cls(uploads, source=directory, roster=roster)
+
+    @classmethod
+    def load(cls, source: str, roster: Optional[Dict[str, str]] = None) -> 'SubmissionIndex':
+        """Index a directory of Word files or an upload manifest"""
+        if os.path.isdir(source):
+            return cls.from_directory(source, roster)
+        return cls.from_manifest(source, roster)
+
+    def student_key(self, student_name: str) -> str:
+        """Index key for a student named by full name, GitHub login or roster identifier"""
+        key = normalize_name(student_name)
+        return normalize_name(self.roster[key]) if key in self.roster else key
+
+    def uploads(self, student_name: str) -> List[Dict]:
+        return self.by_student.get(self.student_key(student_name), [])
+
+    def submitted(self, student_name: str) -> bool:
+        """Whether the student has at least one upload that passed verification"""
+        return any(not upload.get('problems') for upload in self.uploads(student_name))
+
+    def answers(self) -> Iterator[Tuple[Dict, Dict[str, str]]]:
+        """(upload, {question_id: answer}) for each student's latest verified upload with answers.
+
+        Documents are read again on demand, from their directory or from the
+        Blackboard archive; one that can no longer be read is skipped.
+        """
+        archive = zipfile.ZipFile(self.archive) if self.archive and os.path.exists(self.archive) else None
+        try:
+            for uploads in self.by_student.values():
+                verified = [upload for upload in uploads if upload.get('kind') == 'answers' and not upload.get('problems')]
+                if not verified:
+                    continue
+                upload = max(verified, key=lambda upload: upload.get('attempt') or '')
+                try:
+                    source = io.BytesIO(archive.read(upload['member'])) if archive else upload['member']
+                    fields, sections = read_document(source)
+                except Exception:  # Moved, changed or corrupt since it was indexed
+                    continue
+                submission = submission_from_document(fields, sections, upload['filename'], 0)
+                yield upload, {question_id: entry['answer'] for question_id, entry in submission['answers'].items()}
+        finally:
+            if archive:
+                archive.close()
+
+    def report(self, expected: Iterable[str]) -> Dict[str, List]:
+        """Compare uploads with the students expected to have made one.
+
+        missing     expected students with no upload at all
+        duplicates  students with more than one upload (name, count)
+        mismatched  uploads that failed verification (name, problems)
+        unexpected  uploaded names that match no expected student
+        shared      identical files uploaded under different names
+        """
+        expected = {self.student_key(name): name for name in expected}
+        report = {'missing': [], 'duplicates': [], 'mismatched': [], 'unexpected': [], 'shared': []}
+
+        for key, name in sorted(expected.items()):
+            if key not in self.by_student:
+                report['missing'].append(name)
+
+        for key, uploads in sorted(self.by_student.items()):
+            name = uploads[0]['student_name']
+            if key not in expected:
+                report['unexpected'].append(name)
+            if len(uploads) > 1:
+                report['duplicates'].append((name, len(uploads)))
+            for upload in uploads:
+                if upload.get('problems'):
+                    report['mismatched'].append((name, upload['problems']))
+
+        for uploads in self.by_hash.values():
+            names = sorted({normalize_name(upload['student_name']) for upload in uploads})
+            if len(names) > 1:
+                report['shared'].append([self.by_student[key][0]['student_name'] for key in names])
+        return report
+
+def print_report(report: Dict[str, List], limit: int = 10) -> None:
+    """Dashboard summary of an upload report"""
+    def names(items):
+        shown = ', '.join(items[:limit])
+        return shown + (f" (+{len(items) - limit} more)" if len(items) > limit else '')
+
+    if report['missing']:
+        print(f"❌ No Word upload: {names(report['missing'])}")
+    if report['duplicates']:
+        print(f"📑 Several uploads: {names([f'{name} ({count})' for name, count in report['duplicates']])}")
+    if report['mismatched']:
+        print(f"⚠️ Failed verification: {names([f'{name} - {problems[0]}' for name, problems in report['mismatched']])}")
+    if report['unexpected']:
+        print(f"❓ Uploads from unknown students: {names(report['unexpected'])}")
+    if report['shared']:
+        print(f"🚩 Identical files under different names: {names([' = '.join(group) for group in report['shared']])}")
+    if not any(report.values()):
+        print("✅ Every student has exactly one verified upload")
+
+def main():
+    """Summarize uploads: submission_index.py [manifest.json | directory]"""
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MANIFEST_FILE
+    try:
+        index = SubmissionIndex.load(source)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Could not read uploads from {source}: {e}")
+        sys.exit(1)
+
+    students = sorted({uploads[0]['student_name'] for uploads in index.by_student.values()})
+    print(f"🗂️ {sum(len(uploads) for uploads in index.by_student.values())} upload(s) "
+          f"from {len(students)} student(s) in {source}")
+    print_report(index.report(students))
+
+if __name__ == "__main__":
+    main()
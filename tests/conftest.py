@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+# The modules under test live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simple_autograder import RUBRIC
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Sample answers shared by the rubric parity and cohort grading tests
+ANSWERS = [
+    "",
+    "REPL",
+    # Overlapping keywords: 'type' inside 'data type', 'variable' inside 'variable declaration',
+    # 'overflow' inside 'integer overflow', 'int' inside 'interface', 'print' inside 'println'
+    "A Data Type is a kind of value; a variable declaration creates a VARIABLE of that type. "
+    "The Java API is an application programming interface. println prints a literal value written in code.",
+    "The REPL reads, EVALuates and prints in a Loop. The JDK is the Java development kit with tools and a compiler. "
+    "An expression is a combination that evaluates to a value. A constant is final: it cannot change.",
+    "Division by zero: you divide by /0. Integer overflow when values exceed the maximum limit. "
+    "Type mismatch: long to int needs a conversion or cast, they are incompatible.",
+    "High-level languages are abstract, portable across platforms, readable and easier to maintain. "
+    "They hide complexity, read like natural English and make programmers faster and more productive than hardware code.",
+    "assignmentstatement = store a value in a variable; datatype; javaapi",
+    # Unicode: accents, CJK, emoji and symbols around the keywords, in mixed case
+    "Le REPL lit, évalue et affiche en boucle — ÉVAL, Read, PRINT ✅ 变量 (variable) holds a valeur/value 🚀",
+    "Überlauf → overflow; División por cero → division by ZERO; conversión de TYPE long→int (cast) ≠ mismatch",
+    "Naïve café answer: the JDK’s compiler and runtime tools; “constant” values are immutable and fixed",
+]
+
+DEFINITIONS = ("A compiler translates the whole program into machine code before it runs, while an "
+               "interpreter reads and executes the source one statement at a time, and the JVM runs bytecode")
+
+def write_submission(directory, name, answers):
+    """Write assignment1_First_Last.json as simple_submission.py does; unlisted questions are blank"""
+    first, last = name.split()
+    answers = dict({question_id: '' for question_id in RUBRIC.questions}, **answers)
+    submission = {
+        'student': {'name': name, 'id': f"{first}{last}".lower()},
+        'assignment': {'submitted_at': '2025-09-01T10:00:00Z'},
+        'answers': {question_id: {'answer': answer} for question_id, answer in answers.items()}
+    }
+    with open(directory / f"assignment1_{first}_{last}.json", 'w') as f:
+        json.dump(submission, f)
+
+@pytest.fixture
+def serve():
+    """Start local http.server instances; serve(handler_class) returns the base URL"""
+    servers = []
+
+    def start(handler_class):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
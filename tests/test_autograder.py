@@ -0,0 +1,126 @@
+"""The shared results artifact is only reused for the same submission, rubric and checkout;
+malformed answer entries grade as blank instead of failing the whole submission"""
+
+import hashlib
+import json
+import sys
+
+import pytest
+
+import autograder
+from autograder import AutoGrader, default_results_file, load_cached_results
+from simple_autograder import SimpleGrader
+
+SUBMISSION = b'''{"responses": {
+    "q1_definitions": {"response": "REPL: read eval print loop. Java API: application programming interface"},
+    "q4_modulo": {"response": "17 % 5 = 2"}
+}}'''
+
+def write_artifact(tmp_path):
+    (tmp_path / "submission_test.json").write_bytes(SUBMISSION)
+    grader = AutoGrader(str(tmp_path / "submission_test.json"))
+    path = str(tmp_path / "results.json")
+    return grader, grader.write_results(path), path
+
+def test_current_artifact_is_reused(tmp_path):
+    grader, results, path = write_artifact(tmp_path)
+    assert load_cached_results(grader.submission_hash, path) == results
+
+def test_other_submission_or_rubric_is_not_reused(tmp_path, monkeypatch):
+    grader, _, path = write_artifact(tmp_path)
+    assert load_cached_results('0' * 64, path) is None
+
+    monkeypatch.setattr(autograder.RUBRIC, 'version', 'edited-rubric')
+    assert load_cached_results(grader.submission_hash, path) is None
+
+    monkeypatch.undo()
+    monkeypatch.setattr(autograder, 'COMPILER_VERSION', autograder.COMPILER_VERSION + 1)
+    assert load_cached_results(grader.submission_hash, path) is None
+
+def test_checkouts_get_their_own_artifact(tmp_path, monkeypatch):
+    monkeypatch.delenv('RUNNER_TEMP', raising=False)
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    monkeypatch.chdir(tmp_path / "a")
+    first = default_results_file()
+    monkeypatch.chdir(tmp_path / "b")
+    assert default_results_file() != first
+
+    monkeypatch.setenv('RUNNER_TEMP', str(tmp_path))
+    assert default_results_file() == str(tmp_path / "csci1436_autograding_results.json")
+
+def run(argv, monkeypatch, capsys):
+    """autograder.py <argv>; returns its output (per-question runs exit with the score)"""
+    monkeypatch.setattr(sys, 'argv', ['autograder.py', argv])
+    try:
+        autograder.main()
+    except SystemExit:
+        pass
+    return capsys.readouterr().out
+
+@pytest.fixture
+def checkout(tmp_path, monkeypatch):
+    """A student checkout with its artifact in tmp_path; returns the submission hash of each full grading"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "submission_test.json").write_bytes(SUBMISSION)
+    monkeypatch.setattr(autograder, 'RESULTS_FILE', str(tmp_path / "artifact.json"))
+
+    gradings = []
+    grade_all = AutoGrader.grade_all
+    def counting(self):
+        gradings.append(self.submission_hash)
+        return grade_all(self)
+    monkeypatch.setattr(AutoGrader, 'grade_all', counting)
+    return gradings
+
+def read_artifact(tmp_path):
+    with open(tmp_path / "artifact.json") as f:
+        return json.load(f)
+
+def test_grade_all_writes_the_artifact_that_question_runs_reuse(checkout, tmp_path, monkeypatch, capsys):
+    assert "Results written to" in run('all', monkeypatch, capsys)
+    artifact = read_artifact(tmp_path)
+    assert artifact['submission_sha256'] == hashlib.sha256(SUBMISSION).hexdigest()
+    assert len(checkout) == 1
+
+    for question_id in ('q1_definitions', 'q4_modulo'):
+        result = artifact['questions'][question_id]
+        assert run(question_id, monkeypatch, capsys).startswith(f"Score: {result['points']}/{result['max_points']}\n")
+    assert len(checkout) == 1
+
+def test_stale_artifact_is_regraded_and_replaced(checkout, tmp_path, monkeypatch, capsys):
+    run('all', monkeypatch, capsys)
+
+    # A new push: the per-question run grades it once and rewrites the artifact
+    changed = SUBMISSION.replace(b'17 % 5 = 2', b'17 % 5 = 3')
+    (tmp_path / "submission_test.json").write_bytes(changed)
+    run('q4_modulo', monkeypatch, capsys)
+    run('q1_definitions', monkeypatch, capsys)
+    assert checkout == [hashlib.sha256(SUBMISSION).hexdigest(), hashlib.sha256(changed).hexdigest()]
+    assert read_artifact(tmp_path)['submission_sha256'] == hashlib.sha256(changed).hexdigest()
+
+    monkeypatch.setattr(autograder.RUBRIC, 'version', 'edited-rubric')
+    run('q1_definitions', monkeypatch, capsys)
+    assert len(checkout) == 3
+    assert read_artifact(tmp_path)['rubric_version'] == 'edited-rubric'
+
+    monkeypatch.setattr(autograder, 'COMPILER_VERSION', autograder.COMPILER_VERSION + 1)
+    run('q1_definitions', monkeypatch, capsys)
+    run('q4_modulo', monkeypatch, capsys)
+    assert len(checkout) == 4
+    assert read_artifact(tmp_path)['compiler_version'] == autograder.COMPILER_VERSION
+
+def test_malformed_response_entries_grade_as_blank(tmp_path):
+    submission = json.loads(SUBMISSION)
+    submission['responses'].update({'q2_high_level': {'text': "no response key"}, 'q3_declarations': "not a dict"})
+    (tmp_path / "submission_test.json").write_text(json.dumps(submission))
+    grader = AutoGrader(str(tmp_path / "submission_test.json"))
+    assert grader.grade_q2_high_level()[0] == grader.grade_q3_declarations()[0] == 0
+    assert grader.grade_q1_definitions()[0] > 0
+
+def test_malformed_answer_entries_grade_as_blank():
+    answers = {'q1_definitions': {'answer': "REPL: read eval print loop"}, 'q2_languages': {'text': "no answer key"},
+               'q3_declarations': None, 'q4_modulo': "not a dict"}
+    grader = SimpleGrader({'answers': answers})
+    assert grader.grade_question('q1_definitions') > 0
+    assert [grader.grade_question(question_id) for question_id in ('q2_languages', 'q3_declarations', 'q4_modulo')] == [0, 0, 0]
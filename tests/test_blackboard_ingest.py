@@ -0,0 +1,94 @@
+"""blackboard_ingest.py: member names, streaming ingestion of a bulk download, and the command line"""
+
+import hashlib
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+import blackboard_ingest
+from conftest import DEFINITIONS
+from docx_render import render_document
+
+@pytest.mark.parametrize('workers', ['0', '-2'])
+def test_workers_must_be_positive(workers, monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'argv', ['blackboard_ingest.py', 'download.zip', '--workers', workers])
+    with pytest.raises(SystemExit) as exit_info:
+        blackboard_ingest.main()
+    assert exit_info.value.code == 1
+    usage, message = capsys.readouterr().out.rstrip('\n').rsplit('\n', 1)
+    assert usage.startswith('usage: ')
+    assert message == f"❌ workers must be a positive number, not '{workers}'"
+
+def render_submission(path, name, answer):
+    render_document('submission', {
+        'student_name': name, 'student_id': "A0042", 'submitted': "September 01, 2025 at 10:30 AM",
+        'questions': [{'number': 1, 'question': "1. (40 points) Definitions", 'answer': answer}]
+    }, str(path))
+    return path.read_bytes()
+
+@pytest.fixture
+def download(tmp_path):
+    """A Blackboard bulk download: two attempts by Ann, a corrupt bare upload by Bo, a receipt and a stray file"""
+    first = render_submission(tmp_path / 'first.docx', "Ann Lee", "REPL: read-eval-print loop")
+    latest = render_submission(tmp_path / 'latest.docx', "Ann Lee", DEFINITIONS)
+    members = {
+        'Assignment 1_annlee_attempt_2025-08-31-09-00-00_Assignment1_Ann_Lee.docx': first,
+        'Assignment 1_annlee_attempt_2025-09-01-10-30-00_Assignment1_Ann_Lee.docx': latest,
+        'Assignment1_Bo_Chen.docx': b'PK\x03\x04 not really a zip',
+        'Assignment 1_annlee_attempt_2025-09-01-10-30-00.txt': b'Name: Ann Lee',
+        'extras/notes.pdf': b'%PDF-1.4',
+    }
+    archive = tmp_path / 'gradebook_CSCI1436_Assignment1.zip'
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as f:
+        f.writestr('extras/', b'')
+        for name, data in members.items():
+            f.writestr(name, data)
+    return archive, members
+
+def test_member_names_are_matched_to_students():
+    assert blackboard_ingest.match_member(
+        'Assignment 1_annlee_attempt_2025-09-01-10-30-00_Assignment1_Ann_Lee.docx') == {
+        'member': 'Assignment 1_annlee_attempt_2025-09-01-10-30-00_Assignment1_Ann_Lee.docx',
+        'filename': 'Assignment1_Ann_Lee.docx', 'student_name': "Ann Lee", 'username': 'annlee',
+        'attempt': '2025-09-01T10:30:00'
+    }
+    assert blackboard_ingest.match_member('sub/Assignment1_Bo_Chen.docx')['username'] is None
+    assert blackboard_ingest.match_member('Assignment 1_annlee_attempt_2025-09-01-10-30-00.txt') is None
+    assert blackboard_ingest.match_member('extras/notes.pdf') is None
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_archive_is_ingested_into_a_manifest_and_answers(download, tmp_path, monkeypatch, workers):
+    archive, members = download
+    # Spool every member to disk, as large uploads are
+    monkeypatch.setattr(blackboard_ingest, 'MEMBER_SPOOL_BYTES', 1024)
+    manifest_path, extract_dir = tmp_path / 'uploads.json', tmp_path / 'extracted'
+
+    manifest = blackboard_ingest.ingest_archive(str(archive), str(manifest_path), workers, str(extract_dir))
+    with open(manifest_path) as f:
+        assert json.load(f) == manifest
+
+    assert manifest['unmatched'] == ['extras/notes.pdf']
+    uploads = manifest['uploads']
+    assert [(upload['student_name'], upload['attempt'], upload['kind']) for upload in uploads] == [
+        ("Ann Lee", '2025-08-31T09:00:00', 'answers'),
+        ("Ann Lee", '2025-09-01T10:30:00', 'answers'),
+        ("Bo Chen", None, 'unreadable'),
+    ]
+    for upload in uploads:
+        data = members[upload['member']]
+        assert upload['size'] == len(data)
+        assert upload['sha256'] == hashlib.sha256(data).hexdigest()
+    assert [upload['problems'] for upload in uploads[:2]] == [[], []]
+    assert uploads[0]['document_name'] == "Ann Lee" and uploads[0]['document_id'] == "A0042"
+    assert uploads[2]['problems'][0].startswith("not a readable .docx file")
+
+    # Only the latest verified attempt is written, and nothing for the corrupt upload
+    assert os.listdir(extract_dir) == ['assignment1_Ann_Lee.json']
+    with open(extract_dir / 'assignment1_Ann_Lee.json') as f:
+        submission = json.load(f)
+    assert submission['student']['name'] == "Ann Lee"
+    assert submission['answers']['q1_definitions']['answer'] == DEFINITIONS
+    assert submission['answers']['q2_languages']['answer'] == ""
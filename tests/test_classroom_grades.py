@@ -0,0 +1,119 @@
+"""InstructorDashboard.fetch_classroom_grades() against recorded GitHub API responses"""
+
+import json
+import os
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+import pytest
+
+from conftest import FIXTURES
+from instructor_dashboard import InstructorDashboard
+
+RECORDED = os.path.join(FIXTURES, 'github')
+
+class RecordedGitHub(BaseHTTPRequestHandler):
+    """Answers GET /<path> with tests/fixtures/github/<path>.json, or 404"""
+    protocol_version = "HTTP/1.1"
+    requested = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        self.requested.append(path)
+        fixture = os.path.join(RECORDED, path.strip('/') + '.json')
+        if os.path.isfile(fixture):
+            status = 200
+            with open(fixture, 'rb') as f:
+                body = f.read()
+        else:
+            status, body = 404, json.dumps({'message': 'Not Found'}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def fetch_grades(api_url, tmp_path, question_scores):
+    RecordedGitHub.requested = []
+    dashboard = InstructorDashboard(api_url=api_url, cache_dir=None, max_rate=1000, classroom_assignment_id='42',
+                                    gradebook_path=str(tmp_path / 'gradebook.sqlite3'),
+                                    question_scores=question_scores)
+    try:
+        return {result['repo_name']: result for result in dashboard.fetch_classroom_grades()}
+    finally:
+        dashboard.client.close()
+
+@pytest.fixture
+def results(serve, tmp_path):
+    return fetch_grades(serve(RecordedGitHub), tmp_path, question_scores=True)
+
+def test_totals_alone_cost_one_request_per_page(serve, tmp_path):
+    results = fetch_grades(serve(RecordedGitHub), tmp_path, question_scores=False)
+    assert RecordedGitHub.requested == ['/assignments/42/grades', '/assignments/42/accepted_assignments']
+    assert {repo_name: result['total_score'] for repo_name, result in results.items()} == {
+        'csci1436-assignment1-carol': 0, 'csci1436-assignment1-alice': 36.5,
+        'csci1436-assignment1-bob': 71, 'csci1436-assignment1-dave': 88
+    }
+    assert all(result['autograding_results'] == [] for result in results.values())
+
+def test_roster_order_with_unlisted_grades_last(results):
+    assert list(results) == ['csci1436-assignment1-carol', 'csci1436-assignment1-alice',
+                             'csci1436-assignment1-bob', 'csci1436-assignment1-dave']
+
+def test_fractional_points_are_kept(results):
+    alice = results['csci1436-assignment1-alice']
+    assert alice['student_name'] == 'Alice Adams'
+    assert alice['total_score'] == 36.5
+    assert alice['max_score'] == 100
+
+def test_per_question_scores_come_from_the_check_run(results):
+    questions = results['csci1436-assignment1-alice']['autograding_results']
+    assert [(q['question_id'], q['points'], q['max_points']) for q in questions] == [
+        ('q1_definitions', 20, 40), ('q2_high_level', 6, 12), ('q3_declarations', 4, 12),
+        ('q4_modulo', 0, 12), ('q5_sphere_volume', 6, 12), ('q6_debugging', 0, 12)
+    ]
+    assert questions[0]['feedback'] == 'Found 5 of 10 terms'
+
+def test_missing_check_run_keeps_the_classroom_total(results):
+    bob = results['csci1436-assignment1-bob']
+    assert bob['student_name'] == 'bob-gh'
+    assert bob['total_score'] == 71
+    assert bob['autograding_results'] == []
+
+def test_ungraded_repos_are_not_fetched(results):
+    carol = results['csci1436-assignment1-carol']
+    assert carol['student_name'] == 'carol-gh'
+    assert carol['total_score'] == 0
+    assert not any('carol' in path for path in RecordedGitHub.requested)
+
+def iter_results(api_url, tmp_path, assignment_id):
+    RecordedGitHub.requested = []
+    dashboard = InstructorDashboard(api_url=api_url, cache_dir=None, max_rate=1000,
+                                    classroom_assignment_id=assignment_id, uploads=str(tmp_path),
+                                    gradebook_path=str(tmp_path / 'gradebook.sqlite3'))
+    try:
+        results = dashboard.iter_results()
+        yield next(results, None)
+        yield from results
+    finally:
+        dashboard.client.close()
+
+def test_classroom_rows_stream_through_iter_results(serve, tmp_path, monkeypatch):
+    monkeypatch.setenv('GITHUB_TOKEN', 'test-token')
+    results = iter_results(serve(RecordedGitHub), tmp_path, '42')
+    assert next(results)['repo_name'] == 'csci1436-assignment1-carol'
+    assert [result['repo_name'] for result in results] == [
+        'csci1436-assignment1-alice', 'csci1436-assignment1-bob', 'csci1436-assignment1-dave'
+    ]
+
+def test_unavailable_classroom_api_falls_back_to_crawling(serve, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('GITHUB_TOKEN', 'test-token')
+    assert list(iter_results(serve(RecordedGitHub), tmp_path, '404')) == [None]
+    assert RecordedGitHub.requested[:2] == ['/assignments/404/grades', '/orgs/your-github-classroom-org/repos']
+
+    output = capsys.readouterr().out
+    assert "Classroom API unavailable (404); crawling student repos instead" in output
+    assert "Failed to fetch repositories: 404" in output
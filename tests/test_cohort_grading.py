@@ -0,0 +1,49 @@
+"""CompiledQuestion.grade_cohort() (NumPy, whole class at once) agrees with grade() per student"""
+
+import os
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from autograde_keywords import grade_cohort
+from conftest import ANSWERS
+from rubric import load_rubric
+
+# The practice questions autograde_keywords.py grades
+QUESTIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'questions.json')
+
+# Empty, missing (None) and whitespace-only answers sit between real ones
+COHORT = ANSWERS[2:5] + ["", None, "   \n\t "] + ANSWERS[5:] + [None, "REPL"]
+
+@pytest.mark.parametrize('rubric_name', ['autograder', 'simple_autograder', QUESTIONS])
+def test_cohort_points_and_found_match_grade(rubric_name):
+    for question in load_rubric(rubric_name).questions.values():
+        graded = question.grade_cohort(COHORT)
+        names = [group['name'] for group in question.groups]
+        for row, answer in enumerate(COHORT):
+            expected = question.grade(answer)
+            assert graded['points'][row] == expected['points'], (question.question_id, answer)
+            assert [name for name, found in zip(names, graded['found'][row]) if found] == expected['found']
+
+def test_empty_cohort():
+    for question in load_rubric('autograder').questions.values():
+        graded = question.grade_cohort([])
+        assert graded['points'].shape == (0,)
+        assert graded['found'].shape == (0, len(question.groups))
+
+def test_students_missing_a_question_score_as_empty():
+    questions = load_rubric(QUESTIONS)
+    question_ids = list(questions.questions)
+    cohort = {
+        'ann': {question_id: answer for question_id, answer in zip(question_ids, ANSWERS[2:])},
+        'bo': {},
+        'cy': {question_ids[0]: ""}
+    }
+    students, summaries = grade_cohort(questions, cohort)
+    assert students == ['ann', 'bo', 'cy']
+    for question_id, question in questions.questions.items():
+        for row, student in enumerate(students):
+            expected = question.grade(cohort[student].get(question_id, ""))
+            assert summaries[question_id]['scores'][row] == expected['points'] / question.max_points
+            assert summaries[question_id]['matched'][row] == ', '.join(expected['found'])
@@ -0,0 +1,82 @@
+"""buffered(): the bounded hand-off between run_dashboard's pipeline stages"""
+
+import threading
+import time
+
+import pytest
+
+from instructor_dashboard import buffered
+
+DEPTH = 3
+
+def test_slow_consumer_keeps_order_and_bounds_the_queue():
+    produced = []
+
+    def source():
+        for item in range(20):
+            produced.append(item)
+            yield item
+
+    consumed, lag = [], []
+    for item in buffered(source(), DEPTH):
+        time.sleep(0.005)
+        # Up to DEPTH items wait in the queue, plus one the producer holds while blocked
+        lag.append(len(produced) - len(consumed) - 1)
+        consumed.append(item)
+
+    assert consumed == list(range(20))
+    assert max(lag) <= DEPTH + 1
+    assert max(lag) >= DEPTH  # The producer did run ahead while the consumer was slow
+
+def test_slow_middle_stage_keeps_order():
+    def slow(items):
+        for item in items:
+            time.sleep(0.002 * (item % 3))
+            yield item * 10
+
+    stages = buffered(slow(buffered(iter(range(15)), DEPTH)), DEPTH)
+    assert list(stages) == [item * 10 for item in range(15)]
+
+def test_stage_error_reaches_the_caller_after_earlier_items():
+    def failing():
+        yield from range(5)
+        raise ValueError("bad check run")
+
+    def double(items):
+        for item in items:
+            yield item * 2
+
+    consumed = []
+    with pytest.raises(ValueError, match="bad check run"):
+        for item in buffered(double(buffered(failing(), DEPTH)), DEPTH):
+            consumed.append(item)
+    assert consumed == [0, 2, 4, 6, 8]
+
+def test_stages_run_on_their_own_threads():
+    threads = set()
+
+    def source():
+        for item in range(3):
+            threads.add(threading.current_thread())
+            yield item
+
+    assert list(buffered(source(), DEPTH)) == [0, 1, 2]
+    assert threads and threading.current_thread() not in threads
+
+def test_producers_stop_when_the_consumer_does():
+    finished = threading.Event()
+
+    def endless():
+        try:
+            item = 0
+            while True:
+                yield item
+                item += 1
+        finally:
+            finished.set()
+
+    stages = buffered((item * 10 for item in buffered(endless(), DEPTH)), DEPTH)
+    assert [next(stages) for _ in range(5)] == [0, 10, 20, 30, 40]
+    stages.close()
+    # Both producers were blocked on full queues; each stops and closes its source
+    assert finished.wait(5)
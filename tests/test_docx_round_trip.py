@@ -0,0 +1,36 @@
+"""A Word submission rendered by docx_render reads back through docx_extract unchanged"""
+
+from docx_extract import extract_submission
+from docx_render import render_document
+from simple_autograder import RUBRIC
+
+ANSWERS = {
+    'q1_definitions': "REPL: read-eval-print loop.\nA constant can't change & a literal is <written> in code.",
+    'q2_languages': "  Portable,\treadable — and “easier” to maintain. Ünïcödé ✅  ",
+    'q3_declarations': "double length = 23.6;\nfloat width = 14.7f;\n\nlong distance = 3172900000L;",
+    'q4_modulo': "6, 0, 23, 6",
+    'q5_programming': "",
+}
+
+def test_rendered_submission_extracts_to_the_same_answers(tmp_path):
+    path = str(tmp_path / "Assignment1_Ann_Lee-Smith.docx")
+    questions = [
+        {'number': number, 'question': f"{number}. (10 points) {question_id}", 'answer': ANSWERS[question_id]}
+        for number, question_id in enumerate(RUBRIC.questions, 1) if question_id in ANSWERS
+    ]
+    render_document('submission', {
+        'student_name': "Ann Lee-Smith",
+        'student_id': "A0042",
+        'submitted': "September 01, 2025 at 10:30 AM",
+        'questions': questions
+    }, path)
+
+    submission = extract_submission(path)
+    assert submission['student'] == {'name': "Ann Lee-Smith", 'first_name': "Ann", 'last_name': "Lee-Smith",
+                                     'id': "A0042"}
+    assert submission['assignment']['submitted_at'] == "2025-09-01T10:30:00"
+    assert list(submission['answers']) == list(RUBRIC.questions)
+    for question_id, entry in submission['answers'].items():
+        # Surrounding whitespace is trimmed; the last question was never written
+        assert entry['answer'] == ANSWERS.get(question_id, "").strip()
+        assert entry['max_points'] == RUBRIC.questions[question_id].max_points
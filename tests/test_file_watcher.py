@@ -0,0 +1,102 @@
+"""Directory watching: several patterns, inotify queue overflow, and the dashboard's --watch loop"""
+
+import os
+import sys
+
+import pytest
+
+import file_watcher
+import simple_dashboard
+from conftest import DEFINITIONS, write_submission
+from docx_render import render_document
+from file_watcher import EVENT_HEADER, IN_Q_OVERFLOW, InotifyWatcher, PollingWatcher
+
+PATTERNS = ('assignment1_*.json', 'Assignment1_*.docx')
+
+inotify_only = pytest.mark.skipif(not sys.platform.startswith('linux'), reason="inotify is Linux-only")
+
+def touch(path):
+    with open(path, 'w') as f:
+        f.write('{}')
+
+@pytest.mark.parametrize('watcher_class', [PollingWatcher, pytest.param(InotifyWatcher, marks=inotify_only)])
+def test_every_pattern_is_watched(tmp_path, watcher_class):
+    watcher = watcher_class(str(tmp_path), PATTERNS)
+    try:
+        for name in ('assignment1_Ann_Lee.json', 'Assignment1_Bo_Chen.docx', 'notes.txt'):
+            touch(tmp_path / name)
+        assert watcher.wait(5) == {str(tmp_path / 'assignment1_Ann_Lee.json'), str(tmp_path / 'Assignment1_Bo_Chen.docx')}
+    finally:
+        watcher.close()
+
+@inotify_only
+def test_queue_overflow_rescans_the_directory(tmp_path):
+    touch(tmp_path / 'assignment1_Ann_Lee.json')
+    touch(tmp_path / 'assignment1_Bo_Chen.json')
+    watcher = InotifyWatcher(str(tmp_path), PATTERNS)
+
+    # Replace the inotify queue with a pipe, so the changes below are only seen through the overflow
+    os.close(watcher.fd)
+    watcher.fd, write_end = os.pipe()
+    os.set_blocking(watcher.fd, False)
+    try:
+        os.remove(tmp_path / 'assignment1_Bo_Chen.json')
+        touch(tmp_path / 'Assignment1_Cy_Diaz.docx')
+        touch(tmp_path / 'notes.txt')
+        os.write(write_end, EVENT_HEADER.pack(-1, IN_Q_OVERFLOW, 0, 0))
+
+        assert watcher.wait(1) == {str(tmp_path / name) for name in (
+            'assignment1_Ann_Lee.json', 'assignment1_Bo_Chen.json', 'Assignment1_Cy_Diaz.docx')}
+        assert watcher.paths == {str(tmp_path / 'assignment1_Ann_Lee.json'), str(tmp_path / 'Assignment1_Cy_Diaz.docx')}
+    finally:
+        os.close(write_end)
+        watcher.close()
+
+class OneBatch:
+    """Stands in for the watcher: arrive() lands some files after the first scan, they come
+    through as one batch, then Ctrl+C"""
+
+    def __init__(self, arrive, changed):
+        self.arrive = arrive
+        self.changed = changed
+
+    def batches(self, watcher, debounce):
+        self.arrive()
+        yield self.changed
+        raise KeyboardInterrupt
+
+    def close(self):
+        pass
+
+def test_watch_skips_unreadable_files_and_grades_word_only(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('GRADE_CACHE', 'off')
+    monkeypatch.delenv('GRADEBOOK', raising=False)
+    write_submission(tmp_path, "Ann Lee", {'q1_definitions': DEFINITIONS})
+
+    load_submission_file = simple_dashboard.load_submission_file
+    def unreadable(json_file, entry=None):
+        if 'Bo_Chen' in json_file:
+            raise PermissionError(13, "Permission denied", json_file)
+        return load_submission_file(json_file, entry)
+    monkeypatch.setattr(simple_dashboard, 'load_submission_file', unreadable)
+
+    def arrive():
+        # Bo's file cannot be read; Cy only hands in a Word document
+        write_submission(tmp_path, "Bo Chen", {'q1_definitions': DEFINITIONS})
+        render_document('submission', {
+            'student_name': "Cy Diaz", 'student_id': "cy", 'submitted': "September 01, 2025 at 10:30 AM",
+            'questions': [{'number': 1, 'question': "1. (40 points) Definitions", 'answer': DEFINITIONS}]
+        }, str(tmp_path / 'Assignment1_Cy_Diaz.docx'))
+
+    batch = OneBatch(arrive, {'./assignment1_Bo_Chen.json', './Assignment1_Cy_Diaz.docx'})
+    monkeypatch.setattr(file_watcher, 'open_watcher', lambda directory, pattern: batch)
+    monkeypatch.setattr(file_watcher, 'watch_batches', batch.batches)
+
+    simple_dashboard.watch_main(0)
+
+    output = capsys.readouterr().out
+    assert "⚠️ Skipping assignment1_Bo_Chen.json: [Errno 13] Permission denied" in output
+    assert "1 submission(s) graded" in output
+    assert "📚 Cy Diaz (ID: cy)" in output
+    assert "👋 Stopped watching" in output
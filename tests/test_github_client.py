@@ -0,0 +1,254 @@
+"""GitHubClient: roster order under concurrency, retries of rate limits and timeouts, and
+conditional requests against the response cache"""
+
+import json
+import re
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import github_client
+from github_client import GitHubClient, RateLimiter, ResponseCache, retry_after_seconds
+
+ROSTER = [f"student{number:02d}" for number in range(25)]
+
+class Roster(BaseHTTPRequestHandler):
+    """GET /roster pages the roster (Link: rel="next"); GET /students/<login> answers
+    slowest for the first students, so later requests finish first"""
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/roster':
+            query = parse_qs(url.query)
+            per_page, page = int(query['per_page'][0]), int(query.get('page', ['1'])[0])
+            headers = {}
+            if page * per_page < len(ROSTER):
+                headers['Link'] = (f'<http://127.0.0.1:{self.server.server_port}/roster'
+                                   f'?per_page={per_page}&page={page + 1}>; rel="next"')
+            return self.send_json([{'login': login} for login in ROSTER[(page - 1) * per_page:page * per_page]],
+                                  headers)
+
+        login = re.fullmatch(r'/students/(\w+)', url.path).group(1)
+        with Roster.lock:
+            Roster.active += 1
+            Roster.peak = max(Roster.peak, Roster.active)
+        time.sleep(0.002 * (len(ROSTER) - ROSTER.index(login)))
+        with Roster.lock:
+            Roster.active -= 1
+        self.send_json({'login': login, 'score': ROSTER.index(login)})
+
+@pytest.fixture
+def client(serve):
+    Roster.active = Roster.peak = 0
+    client = GitHubClient(None, serve(Roster), concurrency=8, rate_limiter=RateLimiter(1000))
+    yield client
+    client.close()
+
+def fetch(client):
+    return lambda login: client.get_json(f"/students/{login}")['login']
+
+def test_map_keeps_input_order(client):
+    assert client.map(fetch(client), ROSTER) == ROSTER
+    assert Roster.peak > 1
+
+def test_imap_streams_paginated_roster_in_order(client):
+    logins = (student['login'] for student in client.paginate('/roster', {'per_page': 10}))
+    assert list(client.imap(fetch(client), logins)) == ROSTER
+    assert Roster.peak > 1
+
+def test_single_worker_is_sequential(serve):
+    Roster.active = Roster.peak = 0
+    client = GitHubClient(None, serve(Roster), concurrency=1, rate_limiter=RateLimiter(1000))
+    try:
+        assert client.map(fetch(client), ROSTER[:5]) == ROSTER[:5]
+        assert Roster.peak == 1
+    finally:
+        client.close()
+
+class Flaky(BaseHTTPRequestHandler):
+    """First GET of each path fails as set by the test (503 + Retry-After, 403 + rate-limit headers,
+    or a stall); then 200"""
+    protocol_version = "HTTP/1.1"
+    retry_after = None
+    rate_limit = None
+    stall = 0
+    seen = set()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        first = self.path not in Flaky.seen
+        Flaky.seen.add(self.path)
+        if first and Flaky.stall:
+            time.sleep(Flaky.stall)
+        status, headers = 200, {}
+        if first and Flaky.retry_after is not None:
+            status, headers = 503, {'Retry-After': Flaky.retry_after}
+        if first and Flaky.rate_limit is not None:
+            status, headers = 403, Flaky.rate_limit
+        data = json.dumps({'path': self.path}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+@pytest.fixture
+def flaky(serve, monkeypatch):
+    monkeypatch.setattr(github_client, 'BACKOFF_BASE', 0.01)
+    Flaky.retry_after, Flaky.rate_limit, Flaky.stall, Flaky.seen = None, None, 0, set()
+    return serve(Flaky)
+
+def test_retry_after_forms():
+    assert retry_after_seconds('7') == 7.0
+    assert 25 < retry_after_seconds(formatdate(time.time() + 30, usegmt=True)) <= 30
+    assert retry_after_seconds('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert retry_after_seconds('later') is None
+
+@pytest.mark.parametrize('retry_after', ['0', formatdate(time.time() - 5, usegmt=True), 'later'])
+def test_retry_after_is_honored_in_either_form(flaky, retry_after):
+    Flaky.retry_after = retry_after
+    client = GitHubClient(None, flaky, rate_limiter=RateLimiter(1000))
+    try:
+        assert client.get_json('/ok') == {'path': '/ok'}
+    finally:
+        client.close()
+
+def test_malformed_rate_limit_headers_are_ignored():
+    limiter = RateLimiter(1000)
+    limiter.update({'X-RateLimit-Remaining': '4000', 'X-RateLimit-Reset': str(int(time.time()) + 60),
+                    'X-RateLimit-Limit': '5000'})
+    budget = limiter.budget()
+    for junk in ({'X-RateLimit-Remaining': 'lots', 'X-RateLimit-Reset': '1'},
+                 {'X-RateLimit-Remaining': '10', 'X-RateLimit-Reset': '<html>'},
+                 {'X-RateLimit-Remaining': '', 'X-RateLimit-Reset': '12.5'}):
+        limiter.update(junk)
+        assert limiter.budget() == budget
+
+    # A bad limit alone keeps the last good one
+    limiter.update({'X-RateLimit-Remaining': '3999', 'X-RateLimit-Reset': str(budget['reset_at']),
+                    'X-RateLimit-Limit': 'n/a'})
+    assert limiter.budget() == dict(budget, remaining=3999)
+
+def test_rate_limit_with_malformed_reset_is_retried(flaky):
+    Flaky.rate_limit = {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': 'soon', 'X-RateLimit-Limit': 'proxy'}
+    client = GitHubClient(None, flaky, rate_limiter=RateLimiter(1000))
+    try:
+        assert client.get_json('/limited') == {'path': '/limited'}
+    finally:
+        client.close()
+
+def test_timeouts_are_retried(flaky):
+    Flaky.stall = 0.5
+    client = GitHubClient(None, flaky, timeout=0.1, rate_limiter=RateLimiter(1000))
+    try:
+        assert client.get_json('/slow') == {'path': '/slow'}
+    finally:
+        client.close()
+
+class Conditional(BaseHTTPRequestHandler):
+    """Pages the roster like Roster, with an ETag and Last-Modified per page. A GET whose
+    If-None-Match or If-Modified-Since matches gets a bare 304: no body and no Link header"""
+    protocol_version = "HTTP/1.1"
+    last_modified = 'Mon, 01 Sep 2025 10:00:00 GMT'
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        page = int(query.get('page', ['1'])[0])
+        etag = f'"roster-page-{page}"'
+        Conditional.requests.append((page, self.headers.get('If-None-Match'), self.headers.get('If-Modified-Since')))
+
+        if self.headers.get('If-None-Match') == etag or self.headers.get('If-Modified-Since') == self.last_modified:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        data = json.dumps([{'login': login} for login in ROSTER[(page - 1) * 10:page * 10]]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.last_modified)
+        if page * 10 < len(ROSTER):
+            self.send_header('Link', f'<http://127.0.0.1:{self.server.server_port}/roster?page={page + 1}>; rel="next"')
+        self.end_headers()
+        self.wfile.write(data)
+
+def test_not_modified_pages_reuse_cached_body_and_link(serve, tmp_path):
+    Conditional.requests = []
+    base_url = serve(Conditional)
+    cache = ResponseCache(str(tmp_path / 'cache'))
+
+    # Two runs sharing the cache, each paging through the whole roster
+    runs = []
+    for _ in range(2):
+        client = GitHubClient(None, base_url, rate_limiter=RateLimiter(1000), cache=cache)
+        responses, get = [], client.get
+        client.get = lambda path, params=None: responses.append(get(path, params)) or responses[-1]
+        try:
+            logins = [student['login'] for student in client.paginate('/roster')]
+        finally:
+            client.close()
+        assert logins == ROSTER
+        runs.append(responses)
+    first, second = runs
+
+    assert len(first) == len(second) == 3
+    assert [response.status_code for response in second] == [200, 200, 200]
+    assert all(response.from_cache for response in second)
+    assert not any(getattr(response, 'from_cache', False) for response in first)
+    assert [response.json() for response in second] == [response.json() for response in first]
+    # The 304s carried no Link header: the second run only reached pages 2 and 3 through the cached one
+    assert [response.links for response in second] == [response.links for response in first]
+
+    # Each page was fetched once, then revalidated with both of its validators
+    assert Conditional.requests[:3] == [(1, None, None), (2, None, None), (3, None, None)]
+    assert Conditional.requests[3:] == [(page, f'"roster-page-{page}"', Conditional.last_modified)
+                                        for page in (1, 2, 3)]
+
+def test_last_modified_alone_revalidates(serve, tmp_path, monkeypatch):
+    Conditional.requests = []
+    base_url = serve(Conditional)
+    client = GitHubClient(None, base_url, rate_limiter=RateLimiter(1000), cache=ResponseCache(str(tmp_path)))
+    try:
+        first = client.get('/roster')
+        # A cache entry written when the server sent only Last-Modified
+        entry = client.cache.get(first.url)
+        monkeypatch.setattr(client.cache, 'get', lambda url: dict(entry, etag=None))
+        second = client.get('/roster')
+    finally:
+        client.close()
+
+    assert Conditional.requests[1] == (1, None, Conditional.last_modified)
+    assert second.from_cache and second.json() == first.json()
+    assert second.links['next'] == first.links['next']
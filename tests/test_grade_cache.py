@@ -0,0 +1,91 @@
+"""Grade cache: hits for unchanged answers, misses when the answer, rubric or compiler changes, opt-in only"""
+
+import pytest
+
+import grade_cache
+import rubric as rubric_module
+from conftest import DEFINITIONS
+from grade_cache import GradeCache, default_cache, grade_answers
+from rubric import compile_rubric, rubric_path
+
+ANSWERS = {'q1_definitions': DEFINITIONS, 'q2_languages': "Portable, readable and easier to maintain"}
+
+@pytest.fixture
+def rubric():
+    with open(rubric_path('simple_autograder'), 'rb') as f:
+        return compile_rubric(f.read())
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = GradeCache(str(tmp_path / 'grades.sqlite3'))
+    yield cache
+    cache.close()
+
+def counting(rubric, monkeypatch):
+    """Record which questions the rubric actually grades (cache misses)"""
+    graded = []
+    grade = rubric.grade
+
+    def spy(question_id, answer):
+        graded.append(question_id)
+        return grade(question_id, answer)
+    monkeypatch.setattr(rubric, 'grade', spy)
+    return graded
+
+def test_identical_submission_is_a_hit(rubric, cache, monkeypatch):
+    graded = counting(rubric, monkeypatch)
+    first = grade_answers(rubric, ANSWERS, cache)
+    assert graded == ['q1_definitions', 'q2_languages']
+
+    graded.clear()
+    # Only the whitespace differs, which normalization removes
+    assert grade_answers(rubric, dict(ANSWERS, q2_languages="Portable,  readable\nand easier to maintain"),
+                         cache) == first
+    assert graded == []
+    assert first == {question_id: rubric.grade(question_id, answer) for question_id, answer in ANSWERS.items()}
+
+def test_changed_answer_is_a_miss(rubric, cache, monkeypatch):
+    graded = counting(rubric, monkeypatch)
+    grade_answers(rubric, ANSWERS, cache)
+    graded.clear()
+    results = grade_answers(rubric, dict(ANSWERS, q2_languages="Abstract and portable"), cache)
+    assert graded == ['q2_languages']
+    assert results['q2_languages'] == rubric.grade('q2_languages', "Abstract and portable")
+
+def test_new_rubric_version_is_a_miss(rubric, cache, monkeypatch):
+    grade_answers(rubric, ANSWERS, cache)
+    with open(rubric_path('simple_autograder'), 'rb') as f:
+        edited = compile_rubric(f.read() + b'\n')
+    assert edited.version != rubric.version
+
+    graded = counting(edited, monkeypatch)
+    grade_answers(edited, ANSWERS, cache)
+    assert graded == ['q1_definitions', 'q2_languages']
+
+def test_new_compiler_version_is_a_miss(rubric, cache, monkeypatch):
+    grade_answers(rubric, ANSWERS, cache)
+    monkeypatch.setattr(rubric_module, 'COMPILER_VERSION', rubric_module.COMPILER_VERSION + 1)
+    graded = counting(rubric, monkeypatch)
+    grade_answers(rubric, ANSWERS, cache)
+    assert graded == ['q1_definitions', 'q2_languages']
+
+@pytest.mark.parametrize('setting', [None, '', 'off', 'OFF'])
+def test_cache_is_off_unless_grade_cache_names_a_file(setting, tmp_path, monkeypatch):
+    monkeypatch.setattr(grade_cache, '_caches', {})
+    monkeypatch.chdir(tmp_path)
+    if setting is None:
+        monkeypatch.delenv('GRADE_CACHE', raising=False)
+    else:
+        monkeypatch.setenv('GRADE_CACHE', setting)
+    assert default_cache() is None
+    assert list(tmp_path.iterdir()) == []
+
+def test_grade_cache_file_is_opened_once_per_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(grade_cache, '_caches', {})
+    monkeypatch.setenv('GRADE_CACHE', str(tmp_path / 'grades.sqlite3'))
+    cache = default_cache()
+    try:
+        assert cache.path == str(tmp_path / 'grades.sqlite3')
+        assert default_cache() is cache
+    finally:
+        cache.close()
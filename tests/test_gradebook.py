@@ -0,0 +1,69 @@
+"""Delta exports: only students whose scores changed since the last export to the target"""
+
+import csv
+import json
+
+import pytest
+
+from gradebook import Gradebook
+from lms_export import export_gradebook
+
+TARGET = "simple_dashboard"
+
+def graded(name, student_id, *points, feedback="ok"):
+    questions = [{'question_id': f"q{number}", 'points': earned, 'max_points': 10, 'feedback': feedback}
+                 for number, earned in enumerate(points, 1)]
+    return {'student_id': student_id, 'student_name': name, 'submitted_at': '2025-09-01T10:00:00Z',
+            'total_earned': sum(points), 'total_possible': 10 * len(points), 'questions': questions}
+
+def record(gradebook, *rows):
+    run = gradebook.start_run("test")
+    changed = gradebook.record(run, rows)
+    gradebook.finish_run(run)
+    return changed
+
+def export(gradebook, basename, delta):
+    return export_gradebook(gradebook, TARGET, ['blackboard'], str(basename), 2, delta=delta)
+
+def exported_names(manifest):
+    with open(manifest['files'][0], newline='') as f:
+        return [row[0] for row in list(csv.reader(f))[1:]]
+
+def test_delta_export_holds_only_rows_changed_since_the_last_export(tmp_path):
+    gradebook = Gradebook(str(tmp_path / 'gradebook.sqlite3'), owner=TARGET)
+    try:
+        record(gradebook, graded("Ann Lee", "ann", 5, 5), graded("Bo Chen", "bo", 7, 3), graded("Cy Diaz", None, 0, 4))
+        full = export(gradebook, tmp_path / 'full', delta=False)
+        assert exported_names(full) == ["Ann Lee", "Bo Chen", "Cy Diaz"]
+        assert full['new_students'] == 3
+
+        # Bo's score changes, Ann is regraded with new feedback only, Dee is new
+        assert record(gradebook, graded("Ann Lee", "ann", 5, 5, feedback="regraded"),
+                      graded("Bo Chen", "bo", 9, 3), graded("Dee Ng", "dee", 1, 1)) == 2
+        delta = export(gradebook, tmp_path / 'delta', delta=True)
+        assert exported_names(delta) == ["Bo Chen", "Dee Ng"]
+        assert (delta['changed_students'], delta['new_students']) == (1, 1)
+        assert [(student['student_name'], student['status'], student['total_earned'])
+                for student in delta['students']] == [("Bo Chen", 'changed', 12), ("Dee Ng", 'new', 2)]
+        assert delta['previous_export']['files'] == full['files']
+        with open(delta['manifest_file']) as f:
+            assert json.load(f)['students'] == delta['students']
+
+        # Nothing changed since that export
+        assert export(gradebook, tmp_path / 'again', delta=True) is None
+        assert not (tmp_path / 'again.csv').exists()
+    finally:
+        gradebook.close()
+
+def test_failed_export_leaves_the_snapshot(tmp_path):
+    gradebook = Gradebook(str(tmp_path / 'gradebook.sqlite3'), owner=TARGET)
+    try:
+        record(gradebook, graded("Ann Lee", "ann", 5, 5))
+        export(gradebook, tmp_path / 'full', delta=False)
+        record(gradebook, graded("Ann Lee", "ann", 6, 5))
+
+        with pytest.raises(ValueError):
+            export_gradebook(gradebook, TARGET, ['blackboard', 'nonsense'], str(tmp_path / 'broken'), 2, delta=True)
+        assert exported_names(export(gradebook, tmp_path / 'delta', delta=True)) == ["Ann Lee"]
+    finally:
+        gradebook.close()
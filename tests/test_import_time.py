@@ -0,0 +1,32 @@
+"""Entry-point scripts load no heavy dependency at import (see check_import_time.py)
+
+The millisecond budgets depend on the machine, so they are only checked when
+CHECK_IMPORT_TIME is set (or by running check_import_time.py directly).
+"""
+
+import os
+
+import pytest
+
+from check_import_time import IMPORT_BUDGETS_MS, check_module, heavy_imports, measure, parse_importtime
+
+def test_parse_importtime_reads_cumulative_times():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |   json.decoder\n"
+              "import time:       300 |        420 | json\n")
+    assert parse_importtime(stderr) == {'json.decoder': 120, 'json': 420}
+
+def test_heavy_imports_finds_submodules():
+    assert heavy_imports({'numpy.core': 1, 'requests': 2, 'rubric': 3}) == ['numpy', 'requests']
+    assert heavy_imports({'rubric': 3, 'json': 1}) == []
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS_MS))
+def test_module_loads_no_heavy_dependency(module):
+    timing = measure(module)
+    assert module in timing
+    assert heavy_imports(timing) == []
+
+@pytest.mark.skipif(not os.getenv('CHECK_IMPORT_TIME'), reason="timing budgets are opt-in: set CHECK_IMPORT_TIME=1")
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS_MS))
+def test_module_within_budget(module):
+    assert check_module(module, IMPORT_BUDGETS_MS[module]) == []
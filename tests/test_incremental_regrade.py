@@ -0,0 +1,72 @@
+"""simple_dashboard regrades only new or changed files (.dashboard_manifest.json)"""
+
+import os
+
+import pytest
+
+import rubric
+from conftest import ANSWERS, DEFINITIONS, write_submission
+from simple_autograder import RUBRIC
+from simple_dashboard import MANIFEST_FILE, grade_pending, load_all_submissions, load_manifest, save_manifest
+
+def dashboard_run(rubric_version=RUBRIC.version):
+    """One dashboard pass: load against the manifest, grade what is pending, save; returns (submissions, graded)"""
+    submissions = load_all_submissions(load_manifest(rubric_version))
+    graded = grade_pending(submissions, workers=1)
+    save_manifest(submissions, rubric_version)
+    return {submission['file']: submission for submission in submissions}, graded
+
+@pytest.fixture
+def cohort(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('GRADE_CACHE', 'off')
+    write_submission(tmp_path, "Ann Lee", {'q1_definitions': DEFINITIONS})
+    write_submission(tmp_path, "Bo Chen", {'q1_definitions': "REPL"})
+    write_submission(tmp_path, "Cy Diaz", {})
+    submissions, graded = dashboard_run()
+    assert graded == 3 and os.path.exists(MANIFEST_FILE)
+    return tmp_path, submissions
+
+def test_unchanged_files_are_not_regraded(cohort):
+    _, first = cohort
+    submissions, graded = dashboard_run()
+    assert graded == 0
+    for name, submission in submissions.items():
+        # Size and mtime matched, so the file was not even parsed
+        assert 'data' not in submission
+        assert submission['graded'] == first[name]['graded']
+
+def test_touched_but_identical_file_is_not_regraded(cohort):
+    tmp_path, first = cohort
+    path = tmp_path / 'assignment1_Bo_Chen.json'
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    submissions, graded = dashboard_run()
+    assert graded == 0
+    bo = submissions['assignment1_Bo_Chen.json']
+    assert 'data' not in bo and bo['graded'] == first['assignment1_Bo_Chen.json']['graded']
+    # The new mtime is recorded, so the next run skips hashing it again
+    assert load_manifest(RUBRIC.version)['assignment1_Bo_Chen.json']['mtime_ns'] == os.stat(path).st_mtime_ns
+
+def test_modified_file_is_regraded(cohort):
+    tmp_path, first = cohort
+    write_submission(tmp_path, "Bo Chen", {'q1_definitions': ANSWERS[3]})
+
+    submissions, graded = dashboard_run()
+    assert graded == 1
+    bo = submissions['assignment1_Bo_Chen.json']
+    assert bo['graded']['total_earned'] > first['assignment1_Bo_Chen.json']['graded']['total_earned']
+    assert submissions['assignment1_Ann_Lee.json']['graded'] == first['assignment1_Ann_Lee.json']['graded']
+    assert load_manifest(RUBRIC.version)['assignment1_Bo_Chen.json']['graded'] == bo['graded']
+
+def test_rubric_change_regrades_everything(cohort):
+    _, graded = dashboard_run(rubric_version='edited')
+    assert graded == 3
+
+def test_rubric_compiler_change_regrades_everything(cohort, monkeypatch):
+    monkeypatch.setattr(rubric, 'COMPILER_VERSION', rubric.COMPILER_VERSION + 1)
+    _, graded = dashboard_run()
+    assert graded == 3
+    _, graded = dashboard_run()
+    assert graded == 0
@@ -0,0 +1,122 @@
+"""Per-question scores parsed from autograding output: check-run text, job logs and zipped run logs"""
+
+import io
+import json
+import zipfile
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+import pytest
+
+from instructor_dashboard import InstructorDashboard, parse_score_lines
+
+QUESTION_IDS = ['q1_definitions', 'q2_high_level', 'q3_declarations', 'q4_modulo', 'q5_sphere_volume', 'q6_debugging']
+
+# A Classroom job log: timestamped lines, ✅/❌ test names, and a test (Question 3) that printed no score
+JOB_LOG = """2025-09-01T17:40:01.1234567Z ##[group]Run education/autograding-command-grader@v1
+2025-09-01T17:40:02.0000000Z ✅ Question 1 - Definitions
+2025-09-01T17:40:02.1000000Z Score: 32/40
+2025-09-01T17:40:02.1000000Z Feedback: ✅ REPL: Well defined
+2025-09-01T17:40:02.1000000Z ❌ JDK: Not found or poorly defined
+2025-09-01T17:40:02.1000000Z
+2025-09-01T17:40:03.0000000Z ❌ Question 2 - High-level languages
+2025-09-01T17:40:03.1000000Z Score: 4/12
+2025-09-01T17:40:03.1000000Z Feedback: Found concepts: portability
+2025-09-01T17:40:03.1000000Z ##[endgroup]
+2025-09-01T17:40:04.0000000Z ❌ Question 3 - Declarations
+2025-09-01T17:40:04.1000000Z Traceback (most recent call last):
+2025-09-01T17:40:05.0000000Z ✅ Question 6 - Debugging
+2025-09-01T17:40:05.1000000Z Score: 12/12
+"""
+
+def scores(results):
+    return [(result['question_id'], result['points'], result['max_points']) for result in results]
+
+def test_score_lines_are_labelled_by_question():
+    results = parse_score_lines(io.StringIO(JOB_LOG), QUESTION_IDS)
+    assert scores(results) == [('q1_definitions', 32, 40), ('q2_high_level', 4, 12), ('q6_debugging', 12, 12)]
+    assert results[0]['feedback'] == "✅ REPL: Well defined\n❌ JDK: Not found or poorly defined"
+    assert results[1]['feedback'] == "Found concepts: portability"
+    assert results[2]['feedback'] == ""
+
+def test_unlabelled_scores_are_numbered_in_order():
+    lines = ["Score: 30/40", "Score: 10/12", "Question 2", "Score: 8/12", "Score: 1/2"] + ["Score: 0/1"] * 4
+    assert scores(parse_score_lines(lines, QUESTION_IDS)) == [
+        ('q1_definitions', 30, 40), ('q2_high_level', 10, 12), ('q3_declarations', 8, 12),
+        ('q4_modulo', 1, 2), ('q5_sphere_volume', 0, 1), ('q6_debugging', 0, 1), ('q7', 0, 1), ('q8', 0, 1)
+    ]
+    assert parse_score_lines(["Run autograder", "❌ Question 1", "Error: no submission"], QUESTION_IDS) == []
+
+def zipped_run_log(text):
+    """An Actions run-log archive: one combined log per job, plus the same text split per step"""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as f:
+        f.writestr('0_Autograding.txt', text)
+        f.writestr('Autograding/', '')
+        f.writestr('Autograding/3_Run autograder.txt', text)
+    return archive.getvalue()
+
+LOGS = {
+    # repo-a: the job log itself
+    '/repos/your-github-classroom-org/repo-a/actions/jobs/501/logs': ('text/plain', JOB_LOG.encode()),
+    # repo-b: no job log, so the zipped logs of the whole run
+    '/repos/your-github-classroom-org/repo-b/actions/runs/9002/logs': ('application/zip', zipped_run_log(JOB_LOG)),
+    # repo-d: the run's logs are not a zip
+    '/repos/your-github-classroom-org/repo-d/actions/runs/9004/logs': ('application/zip', b'PK\x03\x04 truncated'),
+}
+
+class ActionsLogs(BaseHTTPRequestHandler):
+    """Serves LOGS by path; anything else is 404 (as for expired logs)"""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        content_type, body = LOGS.get(urlparse(self.path).path, ('application/json', b'{"message": "Not Found"}'))
+        self.send_response(200 if urlparse(self.path).path in LOGS else 404)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+@pytest.fixture
+def dashboard(serve, tmp_path):
+    dashboard = InstructorDashboard(api_url=serve(ActionsLogs), cache_dir=None, max_rate=1000,
+                                    gradebook_path=str(tmp_path / 'gradebook.sqlite3'))
+    yield dashboard
+    dashboard.client.close()
+
+def check_runs(job_id, run_id):
+    """An autograding check run whose output has no scores, so the logs are read"""
+    return {'check_runs': [
+        {'id': 1, 'name': 'Lint', 'output': {'text': "Score: 1/1"}},
+        {'id': job_id, 'name': 'Autograding', 'output': {'summary': None, 'text': ''},
+         'details_url': f"https://github.com/your-github-classroom-org/repo/actions/runs/{run_id}/job/{job_id}"}
+    ]}
+
+@pytest.mark.parametrize('repo_name, job_id, run_id', [('repo-a', 501, 9001), ('repo-b', 502, 9002)])
+def test_scores_are_read_from_job_or_run_logs(dashboard, repo_name, job_id, run_id):
+    results = dashboard.parse_autograding_results(check_runs(job_id, run_id), repo_name)
+    # The per-step copy in the run archive is not counted twice
+    assert scores(results) == [('q1_definitions', 32, 40), ('q2_high_level', 4, 12), ('q6_debugging', 12, 12)]
+    assert results[0]['feedback'] == "✅ REPL: Well defined\n❌ JDK: Not found or poorly defined"
+
+@pytest.mark.parametrize('repo_name, job_id, run_id', [('repo-c', 503, 9003), ('repo-d', 504, 9004)])
+def test_missing_or_corrupt_logs_give_no_scores(dashboard, repo_name, job_id, run_id):
+    assert dashboard.parse_autograding_results(check_runs(job_id, run_id), repo_name) == []
+
+def test_repo_without_scores_is_reported_out_of_the_rubric_total(dashboard, tmp_path, monkeypatch):
+    # repo-c: an autograding run with no score lines and no logs
+    commits = [{'sha': 'abc123', 'commit': {'committer': {'date': '2025-09-01T17:40:00Z'}}}]
+    monkeypatch.setitem(LOGS, '/repos/your-github-classroom-org/repo-c/commits',
+                        ('application/json', json.dumps(commits).encode()))
+    monkeypatch.setitem(LOGS, '/repos/your-github-classroom-org/repo-c/commits/abc123/check-runs',
+                        ('application/json', json.dumps(check_runs(503, 9003)).encode()))
+    result = dashboard.fetch_repo_result({'name': 'repo-c'})
+    assert (result['total_score'], result['max_score']) == (0, dashboard.max_score)
+
+    monkeypatch.chdir(tmp_path)
+    dashboard.write_feedback_report(dict(result, max_score=0))
+    with open(tmp_path / 'feedback_reports' / 'repo-c_feedback.txt') as f:
+        assert "Total Score: 0/0 (0.0%)" in f.read()
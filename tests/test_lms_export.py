@@ -0,0 +1,68 @@
+"""LMS export sinks: the instructor dashboard's csv/excel keep their original files and columns"""
+
+import csv
+
+import pytest
+
+from instructor_dashboard import EXPORT_FORMAT_ALIASES
+from lms_export import export_rows
+
+REPORT_HEADER = ['Student Name', 'Student ID', 'Submission Time', 'Total Score', 'Max Score', 'Percentage',
+                 'Turnitin Submitted', 'Q1 Score', 'Q2 Score']
+
+ROWS = [
+    {'student_name': 'Alice Adams', 'student_id': 'alice', 'submitted_at': '2025-09-01T10:00:00Z',
+     'total_earned': 30, 'total_possible': 40, 'turnitin_submitted': True,
+     'questions': [{'points': 20, 'max_points': 20}, {'points': 10, 'max_points': 20}]},
+    {'student_name': 'Bob Brown', 'student_id': None, 'submitted_at': None,
+     'total_earned': 5, 'total_possible': 40, 'turnitin_submitted': False,
+     'questions': [{'points': 5, 'max_points': 20}]},
+]
+
+def instructor_export(tmp_path, *formats):
+    basename = str(tmp_path / 'grades_export_20250901_100000')
+    formats = [EXPORT_FORMAT_ALIASES.get(export_format, export_format) for export_format in formats]
+    return basename, export_rows(iter(ROWS), formats, basename, 2, 40, include_turnitin=True)
+
+def test_csv_is_the_original_report(tmp_path):
+    basename, files = instructor_export(tmp_path, 'csv')
+    assert files == [f"{basename}.csv"]
+    with open(files[0], newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == REPORT_HEADER
+    assert rows[1] == ['Alice Adams', 'alice', '2025-09-01T10:00:00Z', '30', '40', '75.0%', '✅', '20/20', '10/20']
+    assert rows[2] == ['Bob Brown', 'N/A', '', '5', '40', '12.5%', '❌', '5/20', '']
+
+def test_excel_is_the_original_report_as_xlsx(tmp_path):
+    load_workbook = pytest.importorskip('openpyxl').load_workbook
+    basename, files = instructor_export(tmp_path, 'excel')
+    assert files == [f"{basename}.xlsx"]
+    rows = list(load_workbook(files[0]).active.values)
+    assert list(rows[0]) == REPORT_HEADER
+    assert list(rows[1]) == ['Alice Adams', 'alice', '2025-09-01T10:00:00Z', 30, 40, '75.0%', '✅', '20/20', '10/20']
+    assert list(rows[2]) == ['Bob Brown', 'N/A', None, 5, 40, '12.5%', '❌', '5/20', None]
+
+def test_canvas_has_one_assignment_column(tmp_path):
+    basename, files = instructor_export(tmp_path, 'canvas')
+    assert files == [f"{basename}_canvas.csv"]
+    with open(files[0], newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows == [
+        ['Student', 'ID', 'SIS User ID', 'SIS Login ID', 'Section', 'CSCI 1436 Assignment #1'],
+        ['Points Possible', '', '', '', '', '40'],
+        ['Alice Adams', '', 'alice', '', '', '30'],
+        ['Bob Brown', '', '', '', '', '5'],
+    ]
+
+def test_layouts_sharing_an_extension_get_distinct_names(tmp_path):
+    basename, files = instructor_export(tmp_path, 'csv', 'blackboard')
+    assert files == [f"{basename}.csv", f"{basename}_blackboard.csv"]
+    with open(files[1], newline='') as f:
+        assert next(csv.reader(f))[:4] == ['Student Name', 'Student ID', 'Submission Date', 'Q1 Score']
+
+def test_workbook_layouts_sharing_an_extension_get_distinct_names(tmp_path):
+    pytest.importorskip('openpyxl')
+    basename, files = instructor_export(tmp_path, 'csv', 'blackboard', 'excel', 'xlsx')
+    assert files == [f"{basename}.csv", f"{basename}_blackboard.csv", f"{basename}.xlsx", f"{basename}_xlsx.xlsx"]
+    with open(files[1], newline='') as f:
+        assert next(csv.reader(f))[:4] == ['Student Name', 'Student ID', 'Submission Date', 'Q1 Score']
@@ -0,0 +1,24 @@
+"""Rubric names resolve to rubrics/<name>.json; only an existing .json file is taken as a literal path"""
+
+import os
+
+from rubric import RUBRIC_DIR, load_rubric, rubric_path
+
+def test_names_resolve_against_the_rubric_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # A directory and a stray file named like rubrics do not shadow them
+    (tmp_path / 'autograder').mkdir()
+    (tmp_path / 'simple_autograder').write_text("not a rubric")
+    assert rubric_path('autograder') == os.path.join(RUBRIC_DIR, 'autograder.json')
+    assert rubric_path('simple_autograder') == os.path.join(RUBRIC_DIR, 'simple_autograder.json')
+    assert load_rubric('autograder').questions
+
+def test_json_files_are_used_as_given(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'practice.json').write_text('{"questions": {"q1": {"max_points": 4, "per_hit": 1, '
+                                            '"groups": [{"name": "loop", "keywords": ["for", "while"]}]}}}')
+    assert rubric_path('practice.json') == 'practice.json'
+    assert load_rubric('practice.json').grade('q1', "a for loop and a while loop")['points'] == 2
+
+    (tmp_path / 'folder.json').mkdir()
+    assert rubric_path('folder.json') == os.path.join(RUBRIC_DIR, 'folder.json.json')
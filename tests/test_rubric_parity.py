@@ -0,0 +1,161 @@
+"""Rubric grading (one KeywordMatcher scan per answer) scores like the original substring checks
+
+The baseline_* functions are the keyword questions of autograder.py and
+simple_autograder.py as they were before rubrics: `keyword in answer.lower()`
+in nested loops.
+"""
+
+import pytest
+
+import autograder
+import simple_autograder
+from conftest import ANSWERS
+from keyword_matcher import KeywordMatcher
+
+AUTOGRADER_TERMS = {
+    'repl': ['read', 'eval', 'print', 'loop', 'interactive'],
+    'java api': ['application', 'programming', 'interface', 'library', 'classes'],
+    'jdk': ['development', 'kit', 'tools', 'compiler', 'runtime'],
+    'variable': ['storage', 'container', 'value', 'memory', 'data'],
+    'data type': ['type', 'kind', 'category', 'int', 'string', 'boolean'],
+    'variable declaration': ['create', 'define', 'specify', 'type', 'name'],
+    'assignment statement': ['assign', 'value', 'variable', '=', 'store'],
+    'expression': ['combination', 'evaluate', 'value', 'operation', 'calculate'],
+    'constant': ['unchanging', 'fixed', 'final', 'immutable', 'same'],
+    'literal': ['value', 'directly', 'written', 'code', 'constant']
+}
+
+AUTOGRADER_CONCEPTS = {
+    'abstraction': ['abstract', 'hide', 'complexity', 'simple'],
+    'portability': ['portable', 'platform', 'independent', 'cross'],
+    'readability': ['readable', 'understand', 'clear', 'human'],
+    'productivity': ['faster', 'efficient', 'quick', 'productive'],
+    'maintenance': ['maintain', 'modify', 'update', 'change'],
+    'syntax': ['syntax', 'english', 'natural', 'easier']
+}
+
+AUTOGRADER_ISSUES = {
+    'division by zero': ['division', 'zero', 'divide', '/'],
+    'integer overflow': ['overflow', 'exceed', 'limit', 'max'],
+    'type mismatch': ['type', 'mismatch', 'long', 'int', 'conversion']
+}
+
+SIMPLE_TERMS = {
+    'repl': ['read', 'eval', 'print', 'loop', 'interactive', 'command'],
+    'java api': ['application', 'programming', 'interface', 'library', 'classes', 'methods'],
+    'jdk': ['development', 'kit', 'tools', 'compiler', 'runtime', 'java'],
+    'variable': ['storage', 'container', 'value', 'memory', 'data', 'holds'],
+    'data type': ['type', 'kind', 'category', 'int', 'string', 'boolean', 'specifies'],
+    'variable declaration': ['create', 'define', 'specify', 'type', 'name', 'declares'],
+    'assignment statement': ['assign', 'value', 'variable', '=', 'store', 'gives'],
+    'expression': ['combination', 'evaluate', 'value', 'operation', 'calculate', 'produces'],
+    'constant': ['unchanging', 'fixed', 'final', 'immutable', 'same', 'cannot change'],
+    'literal': ['value', 'directly', 'written', 'code', 'constant', 'actual']
+}
+
+SIMPLE_CONCEPTS = [
+    'abstract', 'abstraction', 'portable', 'portability', 'readable', 'readability',
+    'easier', 'simple', 'understand', 'maintain', 'productive', 'faster',
+    'english', 'natural', 'human', 'complex', 'hardware'
+]
+
+SIMPLE_ISSUES = [
+    ['division by zero', 'divide by zero', '/0', 'zero division'],
+    ['overflow', 'integer overflow', 'exceed', 'too large', 'maximum'],
+    ['type mismatch', 'long to int', 'conversion', 'cast', 'incompatible']
+]
+
+def baseline_q1_definitions(response):
+    response = response.lower()
+    points, feedback = 0, []
+    for term, keywords in AUTOGRADER_TERMS.items():
+        if term.replace(' ', '') in response.replace(' ', ''):
+            keyword_count = sum(1 for keyword in keywords if keyword in response)
+            if keyword_count >= 2:
+                points += 4
+                feedback.append(f"✅ {term.upper()}: Well defined")
+            elif keyword_count >= 1:
+                points += 2
+                feedback.append(f"⚠️ {term.upper()}: Partially defined")
+            else:
+                points += 1
+                feedback.append(f"❌ {term.upper()}: Needs better definition")
+        else:
+            feedback.append(f"❌ {term.upper()}: Not found or poorly defined")
+    return min(points, 40), "\n".join(feedback)
+
+def baseline_q2_high_level(response):
+    response = response.lower()
+    points, found = 0, []
+    for concept, keywords in AUTOGRADER_CONCEPTS.items():
+        if any(keyword in response for keyword in keywords):
+            found.append(concept)
+            points += 2
+    if len(response.split()) >= 20:
+        points += 2
+    return min(points, 12), f"Found concepts: {', '.join(found)}"
+
+def baseline_q6_debugging(response):
+    response = response.lower()
+    points, found = 0, []
+    for issue, keywords in AUTOGRADER_ISSUES.items():
+        if sum(1 for keyword in keywords if keyword in response) >= 2:
+            found.append(issue)
+            points += 4
+    return min(points, 12), f"Issues identified: {', '.join(found)}"
+
+def baseline_simple_definitions(answer):
+    answer = answer.lower()
+    score = 0
+    for term, keywords in SIMPLE_TERMS.items():
+        if any(word in answer for word in term.split()):
+            matches = sum(1 for keyword in keywords if keyword in answer)
+            score += 4 if matches >= 3 else 3 if matches >= 2 else 2 if matches >= 1 else 1
+    return min(score, 40)
+
+def baseline_simple_languages(answer):
+    answer = answer.lower()
+    score = sum(1 for concept in SIMPLE_CONCEPTS if concept in answer)
+    if len(answer.split()) >= 15:
+        score += 2
+    return min(score, 12)
+
+def baseline_simple_debugging(answer):
+    answer = answer.lower()
+    return min(sum(4 for issue_group in SIMPLE_ISSUES if any(issue in answer for issue in issue_group)), 12)
+
+@pytest.mark.parametrize('answer', ANSWERS)
+def test_autograder_questions_match_baseline(answer):
+    rubric = autograder.RUBRIC
+    graded = rubric.grade('q1_definitions', answer)
+    assert (graded['points'], graded['feedback']) == baseline_q1_definitions(answer)
+    graded = rubric.grade('q2_high_level', answer)
+    assert (graded['points'], graded['feedback']) == baseline_q2_high_level(answer)
+    graded = rubric.grade('q6_debugging', answer)
+    assert (graded['points'], graded['feedback']) == baseline_q6_debugging(answer)
+
+@pytest.mark.parametrize('answer', ANSWERS)
+def test_simple_autograder_questions_match_baseline(answer):
+    rubric = simple_autograder.RUBRIC
+    assert rubric.grade('q1_definitions', answer)['points'] == baseline_simple_definitions(answer)
+    assert rubric.grade('q2_languages', answer)['points'] == baseline_simple_languages(answer)
+    assert rubric.grade('q6_debugging', answer)['points'] == baseline_simple_debugging(answer)
+
+# Intended differences from the baseline: answers are NFKC-normalized and whitespace runs
+# collapsed before matching, so split and full-width keywords now get credit
+NORMALIZATION_CHANGES = [
+    ("Java\nAPI: application programming interface", 0, 4),
+    ("ＲＥＰＬ: read eval print loop", 0, 4),
+]
+
+@pytest.mark.parametrize('answer, baseline_points, points', NORMALIZATION_CHANGES)
+def test_normalization_changes_these_scores(answer, baseline_points, points):
+    assert baseline_q1_definitions(answer)[0] == baseline_points
+    assert autograder.RUBRIC.grade('q1_definitions', answer)['points'] == points
+
+def test_matcher_finds_exactly_the_substring_hits():
+    keywords = ['he', 'she', 'his', 'hers', 'data', 'data type', 'type', 'a', '/0', '=', 'évalue', '变量', '🚀']
+    matcher = KeywordMatcher(keywords)
+    for text in ANSWERS + ["ushers", "hishe", "aaa", "x=/0=", "datatype data type"]:
+        text = text.lower()
+        assert matcher.find(text) == {keyword for keyword in keywords if keyword in text}
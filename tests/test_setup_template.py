@@ -0,0 +1,32 @@
+"""The student template setup_template.py builds is enough to run the student script"""
+
+import os
+import subprocess
+import sys
+
+import setup_template
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run inside the student repo: import the script and render its Word proof from the copied templates
+STUDENT_RUN = """
+import os, simple_submission, docx_render
+assert os.path.dirname(os.path.abspath(simple_submission.__file__)) == os.getcwd()
+assert os.path.dirname(os.path.abspath(docx_render.__file__)) == os.getcwd()
+print(docx_render.render_document('submission_proof', {
+    'student_name': 'Ann Lee', 'student_id': 'annlee', 'submitted': 'September 01, 2025 at 10:00 AM',
+    'question_count': 6, 'total_points': 100
+}, 'Assignment1_Ann_Lee.docx'))
+"""
+
+def test_student_script_runs_from_the_generated_template(tmp_path, monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    copied = setup_template.copy_student_template(str(tmp_path))
+    assert os.path.join(str(tmp_path), 'templates', 'submission_proof.json') in copied
+
+    env = dict(os.environ)
+    env.pop('PYTHONPATH', None)
+    run = subprocess.run([sys.executable, '-c', STUDENT_RUN], cwd=tmp_path, env=env,
+                         capture_output=True, text=True)
+    assert run.returncode == 0, run.stderr
+    assert os.path.isfile(tmp_path / 'Assignment1_Ann_Lee.docx')
@@ -0,0 +1,101 @@
+"""Near-duplicate detection: LSH candidates, exact confirmation, and cohorts with malformed submissions"""
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from conftest import DEFINITIONS, write_submission
+from simple_dashboard import check_similarity, grade_pending, load_all_submissions
+from similarity import (BANDS, CODE_KGRAM, CODE_TOKEN, NUM_PERMUTATIONS, MinHasher, code_fingerprints, jaccard,
+                        similar_groups, text_fingerprints)
+
+# DEFINITIONS with one word changed, with its clauses swapped, and an unrelated answer
+EDITED = DEFINITIONS.replace("whole program", "entire program")
+REORDERED = ("While an interpreter reads and executes the source one statement at a time, a compiler translates "
+             "the whole program into machine code before it runs, and the JVM runs bytecode")
+UNRELATED = ("High-level languages are portable and readable because they hide hardware details, so programmers "
+             "write code faster and maintain it more easily than assembly")
+
+SPHERE = """Scanner input = new Scanner(System.in);
+System.out.print("Enter the radius: ");
+double radius = input.nextDouble();
+double volume = (4.0 / 3.0) * Math.PI * Math.pow(radius, 3);
+System.out.println("The volume is " + volume);"""
+
+# Same program with comments and line breaks added, then one extra statement
+SPHERE_EDITED = """// volume of a sphere
+Scanner input = new Scanner(System.in);
+System.out.print("Enter the radius: ");
+double radius = input.nextDouble();   /* read it */
+double volume = (4.0 / 3.0) * Math.PI
+                * Math.pow(radius, 3);
+System.out.println("The volume is " + volume);
+input.close();"""
+
+MODULO = """int a = 10; int b = 3;
+System.out.println(a % b);
+System.out.println(b % a);
+System.out.println(-a % b);"""
+
+def shared_buckets(first, second):
+    """LSH bands in which two answers' MinHash signatures agree (any one makes them a candidate pair)"""
+    hasher, rows = MinHasher(), NUM_PERMUTATIONS // BANDS
+    first, second = hasher.signature(first), hasher.signature(second)
+    return sum((first[band * rows:(band + 1) * rows] == second[band * rows:(band + 1) * rows]).all()
+               for band in range(BANDS))
+
+def test_edited_prose_is_flagged_and_unrelated_prose_is_not():
+    assert shared_buckets(text_fingerprints(DEFINITIONS), text_fingerprints(EDITED)) > 0
+    assert shared_buckets(text_fingerprints(DEFINITIONS), text_fingerprints(UNRELATED)) == 0
+
+    groups = similar_groups([('ann', DEFINITIONS), ('bo', EDITED), ('cy', UNRELATED)])
+    assert [group['students'] for group in groups] == [['ann', 'bo']]
+    assert groups[0]['similarity'] == round(jaccard(text_fingerprints(DEFINITIONS), text_fingerprints(EDITED)), 3)
+
+def test_candidates_are_confirmed_by_exact_similarity():
+    # Swapping clauses keeps 75% of the shingles: close enough to share a bucket, not to be reported
+    original, reordered = text_fingerprints(DEFINITIONS), text_fingerprints(REORDERED)
+    assert shared_buckets(original, reordered) > 0
+    assert jaccard(original, reordered) == 0.75
+
+    answers = [('ann', DEFINITIONS), ('bo', REORDERED)]
+    assert similar_groups(answers) == []
+    assert [group['students'] for group in similar_groups(answers, threshold=0.7)] == [['ann', 'bo']]
+
+def test_code_fingerprints_ignore_comments_and_layout():
+    reformatted = "/* sphere */ " + SPHERE.replace("\n", "\n\n    ").replace(" * ", " *\n ") + " // done"
+    assert code_fingerprints(reformatted) == code_fingerprints(SPHERE)
+
+def test_winnowing_keeps_a_fingerprint_of_every_long_shared_run():
+    # Code pasted into another answer still shares fingerprints, though far fewer are kept than k-grams
+    fingerprints = code_fingerprints(SPHERE)
+    assert fingerprints & code_fingerprints(MODULO + "\n" + SPHERE + "\n" + MODULO)
+    assert len(fingerprints) < len(CODE_TOKEN.findall(SPHERE)) - CODE_KGRAM + 1
+
+def test_edited_code_is_flagged_and_different_code_is_not():
+    assert shared_buckets(code_fingerprints(SPHERE), code_fingerprints(MODULO)) == 0
+
+    groups = similar_groups([('ann', SPHERE), ('bo', SPHERE_EDITED), ('cy', MODULO)], 'code')
+    assert [group['students'] for group in groups] == [['ann', 'bo']]
+    assert groups[0]['similarity'] >= 0.9
+
+def test_non_string_answers_are_not_fingerprinted():
+    groups = similar_groups([('a', DEFINITIONS), ('b', 3), ('c', ['x']), ('d', DEFINITIONS + ' too')])
+    assert [group['students'] for group in groups] == [['a', 'd']]
+
+def test_malformed_submission_does_not_stop_the_check(tmp_path, monkeypatch):
+    write_submission(tmp_path, "Ann Lee", {'q1_definitions': DEFINITIONS})
+    write_submission(tmp_path, "Bo Chen", {'q1_definitions': DEFINITIONS + ' as well'})
+    write_submission(tmp_path, "Cy Bad", {'q1_definitions': 3, 'q2_languages': ['a', 'list']})
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('GRADE_CACHE', 'off')
+
+    submissions = load_all_submissions()
+    report = check_similarity(submissions)
+    assert [group['students'] for group in report] == [['assignment1_Ann_Lee.json', 'assignment1_Bo_Chen.json']]
+
+    # Grading drops the malformed file instead of failing the run
+    grade_pending(submissions, workers=1)
+    assert sorted(submission['file'] for submission in submissions) == [
+        'assignment1_Ann_Lee.json', 'assignment1_Bo_Chen.json'
+    ]
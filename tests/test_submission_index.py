@@ -0,0 +1,95 @@
+"""SubmissionIndex: built from a Word directory or an upload manifest, roster lookups and the upload report"""
+
+import hashlib
+import json
+
+from docx_render import render_document
+from submission_index import SubmissionIndex, load_roster
+
+def render_upload(path, name):
+    render_document('submission', {
+        'student_name': name, 'student_id': "A0042", 'submitted': "September 01, 2025 at 10:30 AM",
+        'questions': [{'number': 1, 'question': "1. (40 points) Definitions", 'answer': "REPL: read-eval-print loop"}]
+    }, str(path))
+    return path.read_bytes()
+
+def upload(student_name, member, sha256, problems=(), kind='answers', attempt=None):
+    return {'member': member, 'filename': member, 'student_name': student_name,
+            'username': None, 'attempt': attempt, 'size': 100, 'sha256': sha256, 'kind': kind,
+            'problems': list(problems)}
+
+def test_directory_scan_hashes_and_verifies_each_upload(tmp_path):
+    ann = render_upload(tmp_path / 'Assignment1_Ann_Lee.docx', "Ann Lee")
+    # Bo's document names someone else; Cy's is not a Word file
+    render_upload(tmp_path / 'Assignment1_Bo_Chen.docx', "Dee Park")
+    (tmp_path / 'Assignment1_Cy_Diaz.docx').write_bytes(b'not a zip')
+    (tmp_path / 'notes.txt').write_text("ignored")
+    (tmp_path / 'Assignment1_Old_Dir.docx').mkdir()
+
+    index = SubmissionIndex.from_directory(str(tmp_path))
+    assert index.source == str(tmp_path) and index.archive is None
+    assert sorted(index.by_student) == ['ann lee', 'bo chen', 'cy diaz']
+
+    [ann_upload] = index.uploads("ANN  lee")
+    assert ann_upload['sha256'] == hashlib.sha256(ann).hexdigest()
+    assert (ann_upload['kind'], ann_upload['problems'], ann_upload['document_id']) == ('answers', [], "A0042")
+    assert index.uploads("Bo Chen")[0]['problems'] == ["document names 'Dee Park', file names 'Bo Chen'"]
+    assert index.uploads("Cy Diaz")[0]['kind'] == 'unreadable'
+
+    assert index.submitted("Ann Lee")
+    assert not index.submitted("Bo Chen") and not index.submitted("Cy Diaz") and not index.submitted("Dee Park")
+    assert [(upload['student_name'], answers['q1_definitions']) for upload, answers in index.answers()] == [
+        ("Ann Lee", "REPL: read-eval-print loop")
+    ]
+
+def test_manifest_is_indexed_without_reading_documents(tmp_path):
+    manifest = tmp_path / 'blackboard_uploads.json'
+    manifest.write_text(json.dumps({
+        'archive': str(tmp_path / 'download.zip'),
+        'uploads': [upload("Ann Lee", 'a1.docx', 'aaa'), upload("Ann Lee", 'a2.docx', 'bbb', attempt='2025-09-02'),
+                    upload("Bo Chen", 'b.docx', 'ccc', problems=["no 'Student:' line in the document"])],
+        'unmatched': []
+    }))
+
+    index = SubmissionIndex.load(str(manifest))
+    assert index.source == str(manifest)
+    assert index.archive == str(tmp_path / 'download.zip')
+    assert [upload['member'] for upload in index.uploads("ann lee")] == ['a1.docx', 'a2.docx']
+    assert index.submitted("Ann Lee") and not index.submitted("Bo Chen")
+    assert index.by_hash['ccc'][0]['student_name'] == "Bo Chen"
+
+def test_report_lists_missing_duplicate_mismatched_unexpected_and_shared_uploads():
+    index = SubmissionIndex([
+        upload("Ann Lee", 'a1.docx', 'aaa'), upload("Ann Lee", 'a2.docx', 'bbb'),
+        upload("Bo Chen", 'b.docx', 'ccc', problems=["document names 'Ann Lee', file names 'Bo Chen'"]),
+        upload("Eve Stone", 'e.docx', 'aaa'),
+        upload("Dee Park", 'd.docx', 'ddd'),
+    ])
+    assert index.report(["Ann Lee", "Bo Chen", "Cy Diaz", "Dee  Park"]) == {
+        'missing': ["Cy Diaz"],
+        'duplicates': [("Ann Lee", 2)],
+        'mismatched': [("Bo Chen", ["document names 'Ann Lee', file names 'Bo Chen'"])],
+        'unexpected': ["Eve Stone"],
+        'shared': [["Ann Lee", "Eve Stone"]]
+    }
+    assert index.report(["Dee Park"])['missing'] == []
+
+def test_roster_resolves_github_logins_to_upload_names(tmp_path):
+    roster_file = tmp_path / 'classroom_roster.csv'
+    roster_file.write_text('"identifier","github_username","github_id","name"\n'
+                           '"A0042","ann-gh","101","Ann Lee"\n'
+                           '"Bo Chen","bo-gh","102",""\n'
+                           '"Cy Diaz","","",""\n', encoding='utf-8')
+    roster = load_roster(str(roster_file))
+    assert roster == {'a0042': "Ann Lee", 'ann-gh': "Ann Lee", 'bo chen': "Bo Chen", 'bo-gh': "Bo Chen",
+                      'cy diaz': "Cy Diaz"}
+
+    uploads = [upload("Ann Lee", 'a.docx', 'aaa'), upload("Bo Chen", 'b.docx', 'bbb')]
+    assert not SubmissionIndex(uploads).submitted('ann-gh')
+
+    index = SubmissionIndex(uploads, roster=roster)
+    assert index.submitted('ann-gh') and index.submitted('A0042') and index.submitted('BO-GH')
+    assert index.submitted("Ann Lee") and not index.submitted('cy-gh')
+    assert index.report(['ann-gh', 'bo-gh', 'Cy Diaz']) == {
+        'missing': ["Cy Diaz"], 'duplicates': [], 'mismatched': [], 'unexpected': [], 'shared': []
+    }